@@ -0,0 +1,39 @@
+"""Measure the memory held by a parsed song's AST, and by its token stream.
+
+Run with: python -m benchmarks.bench_ast_memory
+"""
+import tracemalloc
+
+from src.parser import parse_tab, tokenize
+
+from .corpus import make_tab
+
+
+def count_nodes(node):
+    return 1 + sum(count_nodes(child) for child in node.children)
+
+
+def main():
+    for lines in (100, 1000, 8000):
+        tab = make_tab(lines)
+        tracemalloc.start()
+        ast = parse_tab(tab)
+        size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        nodes = count_nodes(ast)
+        print(
+            f"{lines:>6} lines: {nodes:>7} nodes, {size / 1024:9.1f} KiB held, "
+            f"{peak / 1024:9.1f} KiB peak ({size / nodes:5.1f} B/node)"
+        )
+        tracemalloc.start()
+        tokens = tokenize(tab)
+        size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{'':>6}        {len(tokens[1]) // 3:>7} tokens, {size / 1024:8.1f} KiB held, "
+            f"{peak / 1024:9.1f} KiB peak"
+        )
+
+
+if __name__ == "__main__":
+    main()
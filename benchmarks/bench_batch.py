@@ -0,0 +1,37 @@
+"""Throughput of ug_tabs against a local stand-in server with latency.
+
+Run with: python -m benchmarks.bench_batch
+"""
+import contextlib
+import io
+import tempfile
+import time
+
+from src import ug
+from src.cache import DiskCache
+from tests.server import StandInServer
+
+from .corpus import make_tab
+
+SONGS = 40
+LATENCY = 0.05
+
+
+def main():
+    with StandInServer() as server, tempfile.TemporaryDirectory() as cache_dir:
+        server.delay = LATENCY
+        ug.SEARCH_URL = f"{server.url}/search.php"
+        ug.TABS_URL = f"{server.url}/"
+        urls = [server.add_tab("Artist", f"Song {i}", make_tab(200, i)) for i in range(SONGS)]
+        for workers in (1, 2, 4, 8, 16):
+            ug.store_cache = DiskCache(f"{cache_dir}/{workers}")
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                songs = list(ug.ug_tabs(urls, max_workers=workers))
+            seconds = time.perf_counter() - started
+            assert len(songs) == SONGS
+            print(f"{workers:>3} workers: {SONGS / seconds:6.1f} songs/s")
+
+
+if __name__ == "__main__":
+    main()
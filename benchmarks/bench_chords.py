@@ -0,0 +1,38 @@
+"""Time get_chords on songs with rich applicature data.
+
+"first song" is a cold shape cache; "across songs" re-uses the shapes
+computed for the previous songs, as when opening many songs in a session.
+
+Run with: python -m benchmarks.bench_chords
+"""
+import timeit
+
+from src import ug
+
+from .corpus import make_applicature
+
+
+class _ApplicatureOnly:
+    def __init__(self, applicature):
+        self.applicature = applicature
+
+
+def main():
+    for chords, variants in ((10, 4), (40, 8), (200, 16)):
+        song = _ApplicatureOnly(make_applicature(chords, variants))
+
+        def cold():
+            ug._chord_shape.cache_clear()
+            ug.get_chords(song)
+
+        runs = 20
+        first = min(timeit.repeat(cold, number=runs, repeat=5)) / runs
+        shared = min(timeit.repeat(lambda: ug.get_chords(song), number=runs, repeat=5)) / runs
+        print(
+            f"{chords * variants:>5} variants: first song {first * 1000:7.3f} ms, "
+            f"across songs {shared * 1000:7.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Extracting the js-store JSON from a page: fast path vs BeautifulSoup.
+
+Run with: python -m benchmarks.bench_extract
+"""
+import json
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from src.ug import extract_store
+
+from .corpus import make_page, make_tab_store
+
+
+def extract_with_beautifulsoup(html):
+    bs = BeautifulSoup(html, "html.parser")
+    return json.loads(bs.find("div", {"class": "js-store"}).attrs["data-content"])
+
+
+def measure(func, page, runs=5):
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        func(page)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    func(page)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    for lines, filler_kb in ((50, 50), (400, 300), (3000, 1000)):
+        page = make_page(make_tab_store(lines), filler_kb)
+        assert extract_store(page) == extract_with_beautifulsoup(page)
+        print(f"page of {len(page) / 1024:,.0f} KiB ({lines} tab lines)")
+        for name, func in (
+            ("beautifulsoup", extract_with_beautifulsoup),
+            ("extract_store", extract_store),
+        ):
+            seconds, peak = measure(func, page)
+            print(f"  {name:<14} {seconds * 1000:8.2f} ms {peak / 1024:10,.0f} KiB peak")
+
+
+if __name__ == "__main__":
+    main()
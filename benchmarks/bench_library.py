@@ -0,0 +1,70 @@
+"""Query latency of the local song library as it grows.
+
+Run with: python -m benchmarks.bench_library [songs]
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.library import SongLibrary
+from src.ug import SongDetail
+
+from .corpus import CHORDS, make_tab_store, make_vocabulary, zipf_words
+
+VOCABULARY = make_vocabulary()
+QUERIES = ["road", "city lig", "the", "Em7", "chorus", "hansome", "verse 2", "kalo"]
+
+
+def make_song(i, rnd):
+    store = make_tab_store(lines=1, seed=i)
+    tab = store["store"]["page"]["data"]["tab"]
+    tab["artist_name"] = " ".join(zipf_words(rnd, VOCABULARY, 2)).title()
+    tab["song_name"] = " ".join(zipf_words(rnd, VOCABULARY, 3)).title()
+    tab["tab_url"] = f"https://tabs.ultimate-guitar.com/tab/song-{i}"
+    lines = []
+    for verse in range(4):
+        lines.append(f"[Verse {verse + 1}]")
+        for _ in range(4):
+            lines.append("   ".join(f"[ch]{rnd.choice(CHORDS)}[/ch]" for _ in range(4)))
+            lines.append(" ".join(zipf_words(rnd, VOCABULARY, 8)))
+    store["store"]["page"]["data"]["tab_view"]["wiki_tab"]["content"] = "\n".join(lines)
+    return SongDetail(store)
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rnd = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        library = SongLibrary(Path(directory) / "library.sqlite3")
+        size = 0
+        for checkpoint in (1000, 10000, total):
+            if checkpoint > total:
+                continue
+            started = time.perf_counter()
+            library.add_many(make_song(i, rnd) for i in range(size, checkpoint))
+            added = checkpoint - size
+            insert_rate = added / (time.perf_counter() - started)
+            size = checkpoint
+
+            latencies = []
+            for _ in range(20):
+                for query in QUERIES:
+                    started = time.perf_counter()
+                    library.search(query)
+                    latencies.append(time.perf_counter() - started)
+            latencies.sort()
+            p50 = latencies[len(latencies) // 2] * 1000
+            p95 = latencies[int(len(latencies) * 0.95)] * 1000
+            # The write-ahead log included
+            db_size = sum(p.stat().st_size for p in Path(directory).glob("library.sqlite3*"))
+            print(
+                f"{size:>6} songs: {insert_rate:6.0f} inserts/s, query p50 {p50:5.2f} ms, "
+                f"p95 {p95:5.2f} ms, {db_size / 1024 / 1024:6.1f} MiB on disk"
+            )
+        library.close()
+
+
+if __name__ == "__main__":
+    main()
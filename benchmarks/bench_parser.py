@@ -0,0 +1,39 @@
+"""Time parse_tab and tokenize on multi-thousand-line tabs, and how
+soon the streaming parser has the first screenful of lines.
+
+Run with: python -m benchmarks.bench_parser
+"""
+import io
+import time
+import timeit
+from itertools import islice
+
+from src.parser import iter_parse, parse_tab, tokenize
+from src.render import FIRST_CHUNK_LINES
+
+from .corpus import make_tab
+
+
+def main():
+    for lines in (500, 2000, 8000):
+        tab = make_tab(lines)
+        runs = max(1, 20000 // lines)
+        for name, parse in (("parse_tab", parse_tab), ("tokenize", tokenize)):
+            seconds = min(timeit.repeat(lambda: parse(tab), number=runs, repeat=5))
+            per_parse = seconds / runs
+            print(
+                f"{lines:>6} lines, {name:<9}: {per_parse * 1000:8.2f} ms/parse "
+                f"({lines / per_parse:,.0f} lines/s)"
+            )
+
+    tab = make_tab(8000)
+    start = time.perf_counter()
+    reader = io.StringIO(tab)
+    lines = iter_parse(iter(lambda: reader.read(4096), ""))
+    first = list(islice(lines, FIRST_CHUNK_LINES))
+    elapsed = time.perf_counter() - start
+    print(f"first {len(first)} of 8000 lines streamed in {elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Throughput of the batch parsing pipeline per number of worker processes.
+
+Run with: python -m benchmarks.bench_pipeline [pages]
+"""
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.pipeline import iter_pages, run_pipeline
+
+from .corpus import make_tab_store
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    cores = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "pages.jsonl"
+        with open(source, "w", encoding="utf-8") as f:
+            for i in range(total):
+                f.write(json.dumps(make_tab_store(lines=200, seed=i)) + "\n")
+        print(f"{total} pages, {source.stat().st_size / 1024 / 1024:.1f} MiB, {cores} cores")
+
+        single = None
+        workers = 1
+        while workers <= max(cores, 2):
+            started = time.perf_counter()
+            with open(os.devnull, "w") as out:
+                run_pipeline(iter_pages(source), out, workers=workers)
+            seconds = time.perf_counter() - started
+            # Not tracemalloc, which forked workers would inherit and be slowed by
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+            single = single or seconds
+            print(
+                f"{workers:>3} workers: {total / seconds:7.0f} pages/s, "
+                f"{single / seconds:4.1f}x, main process max RSS {peak / 1024 / 1024:5.1f} MiB"
+            )
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
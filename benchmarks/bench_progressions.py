@@ -0,0 +1,83 @@
+"""Latency of chord progression queries as the library grows.
+
+Run with: python -m benchmarks.bench_progressions [songs]
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.chords import SHARP_NAMES, transpose_chord
+from src.library import SongLibrary
+from src.ug import SongDetail
+
+from .corpus import make_tab_store
+
+# Progressions in C, which songs are built from in random keys
+PROGRESSIONS = [
+    ["C", "G", "Am", "F"],
+    ["Am", "F", "C", "G"],
+    ["C", "Am", "F", "G"],
+    ["Dm", "G", "C"],
+    ["C", "F", "G"],
+    ["C", "Bb", "F"],
+    ["Am", "G", "F", "E"],
+    ["Cm", "Ab", "Eb", "Bb"],
+    ["C", "E7", "Am", "F", "Fm"],
+    ["C", "Em", "F", "G"],
+    ["F", "G", "Em", "Am"],
+    ["C", "D", "F", "C"],
+]
+QUERIES = ["I-V-vi-IV", "vi-IV-I-V", "ii-V-I", "I-bVII-IV", "i-bVI-bIII-bVII", "I V", "C G Am F Dm"]
+
+
+def make_song(i, rnd):
+    store = make_tab_store(lines=1, seed=i)
+    tab = store["store"]["page"]["data"]["tab"]
+    tab["tab_url"] = f"https://tabs.ultimate-guitar.com/tab/song-{i}"
+    key = rnd.randrange(12)
+    lines = []
+    for section in range(4):
+        lines.append(f"[Section {section + 1}]")
+        chords = [transpose_chord(c, key) for c in rnd.choice(PROGRESSIONS)]
+        for _ in range(2):
+            lines.append("  ".join(f"[ch]{chord}[/ch]" for chord in chords))
+            lines.append("la la la")
+        # A passing chord now and then
+        lines.append(f"[ch]{rnd.choice(SHARP_NAMES)}[/ch]")
+    store["store"]["page"]["data"]["tab_view"]["wiki_tab"]["content"] = "\n".join(lines)
+    return SongDetail(store)
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rnd = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        library = SongLibrary(Path(directory) / "library.sqlite3")
+        size = 0
+        for checkpoint in (1000, 10000, total):
+            if checkpoint > total:
+                continue
+            library.add_many(make_song(i, rnd) for i in range(size, checkpoint))
+            size = checkpoint
+
+            latencies = []
+            for _ in range(10):
+                for query in QUERIES:
+                    started = time.perf_counter()
+                    library.search_progression(query)
+                    latencies.append(time.perf_counter() - started)
+            latencies.sort()
+            p50 = latencies[len(latencies) // 2] * 1000
+            p95 = latencies[int(len(latencies) * 0.95)] * 1000
+            matches = len(library.search_progression(QUERIES[0], limit=size))
+            print(
+                f"{size:>6} songs: query p50 {p50:6.2f} ms, p95 {p95:6.2f} ms, "
+                f"{matches} songs with {QUERIES[0]}"
+            )
+        library.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Time to first paint and total time to render a song into a text buffer,
+parsing included, from the tree of `parse_tab` and from the tree built
+from the tokens of `tokenize`, as the window does it.
+
+A FakeBuffer stands in for GTK, so this only measures the renderer's own
+work.
+
+Run with: python -m benchmarks.bench_render
+"""
+import time
+
+from src.parser import build_tree, parse_tab, tokenize
+from src.render import append_chunk, iter_chunks
+
+from .corpus import make_tab
+from .fake_buffer import FakeBuffer
+
+
+def render(tab, use_tokens):
+    """Return the time to the first chunk and to the whole song."""
+    started = time.perf_counter()
+    buffer = FakeBuffer()
+    if use_tokens:
+        ast = build_tree(*tokenize(tab))
+    else:
+        ast = parse_tab(tab)
+    chunks = iter_chunks(ast)
+    append_chunk(buffer, *next(chunks))
+    first_paint = time.perf_counter() - started
+    for chunk in chunks:
+        append_chunk(buffer, *chunk)
+    return first_paint, time.perf_counter() - started
+
+
+def main():
+    for lines in (100, 2000, 8000):
+        tab = make_tab(lines)
+        for name, use_tokens in (("tree", False), ("tokens", True)):
+            first_paint, total = min(render(tab, use_tokens) for _ in range(5))
+            print(
+                f"{lines:>6} lines, {name:<6}: first paint {first_paint * 1000:6.2f} ms, "
+                f"total {total * 1000:7.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
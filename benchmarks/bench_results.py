@@ -0,0 +1,68 @@
+"""Time to fill the results list with 5,000 search results.
+
+The results model is filled with one splice, and rows are only created for
+what's on screen. When a display is available, this is compared with
+creating a Gtk.ListBoxRow per result, as the window used to.
+
+Needs PyGObject with GTK 4. Run with: python -m benchmarks.bench_results
+"""
+import sys
+import time
+
+RESULTS = 5000
+ROUNDS = 5
+
+
+def make_search_result(i):
+    return {
+        "artist_name": f"Artist {i % 300}",
+        "song_name": f"Song {i % 1000}",
+        "tab_url": f"https://tabs.ultimate-guitar.com/tab/song-{i}",
+        "artist_url": f"https://www.ultimate-guitar.com/artist/{i % 300}",
+        "type": "Chords",
+        "version": 1,
+        "votes": i,
+        "rating": 4.5,
+    }
+
+
+def main():
+    try:
+        import gi
+
+        gi.require_version("Gtk", "4.0")
+        from gi.repository import Gtk
+    except (ImportError, ValueError) as error:
+        print(f"PyGObject with GTK 4 is required: {error}")
+        sys.exit(1)
+
+    from src.results import make_results_store, result_label, set_results
+    from src.ug import SearchResult
+
+    results = [SearchResult(make_search_result(i)) for i in range(RESULTS)]
+    store = make_results_store()
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        set_results(store, results)
+        timings.append(time.perf_counter() - start)
+    print(f"Gio.ListStore: {min(timings) * 1000:8.2f} ms for {RESULTS} results")
+
+    if not Gtk.init_check():
+        print("No display, skipping the Gtk.ListBox comparison")
+        return
+    listbox = Gtk.ListBox()
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        listbox.remove_all()
+        for result in results:
+            row = Gtk.ListBoxRow()
+            row.set_child(Gtk.Label(label=result_label(result)))
+            listbox.append(row)
+        timings.append(time.perf_counter() - start)
+    print(f"Gtk.ListBox:   {min(timings) * 1000:8.2f} ms for {RESULTS} results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Re-opening a song: loading its tokens and chord shapes from their
+serialized form, against tokenizing the tab and working out the shapes again.
+
+Run with: python -m benchmarks.bench_serialize
+"""
+import timeit
+
+from src import serialize, ug
+from src.parser import tokenize
+
+from .corpus import make_applicature, make_tab
+
+
+class _Song:
+    def __init__(self, tab, applicature):
+        self.tab = tab
+        self.applicature = applicature
+
+
+def main():
+    for lines in (200, 2000, 8000):
+        song = _Song(make_tab(lines), make_applicature())
+
+        def parse():
+            ug._chord_shape.cache_clear()
+            return tokenize(song.tab)[1], *ug.get_chords(song)
+
+        data = serialize.dumps(*parse())
+        runs = max(1, 4000 // lines)
+        parsed = min(timeit.repeat(parse, number=runs, repeat=5)) / runs
+        loaded = min(
+            timeit.repeat(lambda: serialize.loads(data), number=runs, repeat=5)
+        ) / runs
+        print(
+            f"{lines:>6} lines: parse {parsed * 1000:7.2f} ms, "
+            f"load {loaded * 1000:7.2f} ms ({parsed / loaded:.1f}x), "
+            f"{len(data) / 1024:6.1f} KiB serialized, {len(song.tab) / 1024:6.1f} KiB tab"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Latency of back-to-back page fetches against a local stand-in server.
+
+Compares a new connection per request (plain requests.get) with the
+pooled keep-alive session, and a full download with a 304 revalidation.
+
+Run with: python -m benchmarks.bench_session
+"""
+import time
+
+import requests
+
+from src import ug
+from tests.server import StandInServer
+
+from .corpus import make_tab
+
+FETCHES = 200
+
+
+def time_fetches(get, url, **kwargs):
+    started = time.perf_counter()
+    for _ in range(FETCHES):
+        get(url, timeout=ug.TIMEOUT, **kwargs).content
+    return (time.perf_counter() - started) / FETCHES
+
+
+def main():
+    with StandInServer() as server:
+        server.etags = True
+        url = server.url + server.add_tab("Queen", "Bohemian Rhapsody", make_tab(400))
+        session = ug.get_session()
+
+        fresh = time_fetches(requests.get, url)
+        pooled = time_fetches(session.get, url)
+        etag = session.get(url).headers["ETag"]
+        revalidated = time_fetches(session.get, url, headers={"If-None-Match": etag})
+
+    print(f"new connection per fetch: {fresh * 1000:6.2f} ms")
+    print(f"pooled session:           {pooled * 1000:6.2f} ms")
+    print(f"pooled session, 304:      {revalidated * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Construction time and memory kept per SongDetail over a corpus of pages.
+
+Each page is decoded from JSON, turned into a SongDetail and dropped, as
+when opening songs. "kept" is what the SongDetails still hold once their
+pages are gone, not counting the tab text itself: as constructed, and
+once the chord diagrams and versions have been used.
+
+Run with: python -m benchmarks.bench_song_detail
+"""
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from src.ug import SongDetail
+
+from .corpus import make_tab_store
+
+SONGS = 500
+
+
+def kept_per_song(pages, use=None):
+    gc.collect()
+    tracemalloc.start()
+    songs = []
+    for page in pages:
+        song = SongDetail(json.loads(page))
+        if use is not None:
+            use(song)
+        songs.append(song)
+    gc.collect()
+    kept = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    tabs = sum(sys.getsizeof(song.tab) for song in songs)
+    return (kept - tabs) / len(songs)
+
+
+def main():
+    pages = [json.dumps(make_tab_store(lines=40 + i % 200, seed=i)) for i in range(SONGS)]
+    stores = [json.loads(page) for page in pages]
+    started = time.perf_counter()
+    for store in stores:
+        SongDetail(store)
+    construct = (time.perf_counter() - started) / SONGS
+    del stores
+
+    constructed = kept_per_song(pages)
+    used = kept_per_song(pages, lambda song: (song.applicature, song.versions))
+    print(
+        f"{SONGS} songs: {construct * 1e6:6.1f} us to construct, kept per song "
+        f"besides the tab: {constructed / 1024:6.2f} KiB as constructed, "
+        f"{used / 1024:6.2f} KiB once used"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Startup cost: import time of the app's modules and time to first window.
+
+Import times come from `python -X importtime`, in a fresh interpreter per
+run. Without PyGObject only the modules that don't need it are imported.
+
+Time to first window needs an installed app (`cancionero` on the PATH, or
+`--command`) and a display, e.g. under `xvfb-run`. The app is started with
+CANCIONERO_STARTUP_EXIT=1, so it prints its own startup timestamps, in
+seconds since main.py started importing, and quits after the first frame.
+
+Run with: python -m benchmarks.bench_startup [--runs 5] [--command cancionero]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules the window imports, directly or not, that don't need PyGObject
+HEADLESS_MODULES = [
+    "src.ug",
+    "src.library",
+    "src.live_search",
+    "src.songbook",
+    "src.fetcher",
+    "src.render",
+    "src.autoscroll",
+    "src.tracing",
+]
+# Imported on first use, after the window is up
+DEFERRED = ("requests", "bs4", "urllib3")
+
+
+def import_times(modules):
+    """
+    Import `modules` in a fresh interpreter and return the cumulative import
+    time of each top-level import, in seconds, and the deferred modules
+    that were loaded anyway.
+    """
+    code = (
+        f"import sys; import {', '.join(modules)}; "
+        f"print([m for m in {DEFERRED!r} if m in sys.modules])"
+    )
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented under the import that caused them
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            times[name.strip()] = int(cumulative) / 1e6
+    return times, json.loads(process.stdout.strip().replace("'", '"'))
+
+
+def first_window(command):
+    """Start the app and return its startup timestamps."""
+    env = dict(os.environ, CANCIONERO_STARTUP_EXIT="1")
+    process = subprocess.run(
+        command, env=env, capture_output=True, text=True, timeout=60, check=True
+    )
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--command", nargs="+", help="command starting the app")
+    args = parser.parse_args()
+
+    if importlib.util.find_spec("gi") is not None:
+        modules = ["src.main"]
+    else:
+        print("PyGObject isn't installed, importing the modules that don't need it")
+        modules = HEADLESS_MODULES
+    runs = [import_times(modules) for _ in range(args.runs)]
+    totals = [sum(times.values()) for times, _ in runs]
+    print(f"import time: median {statistics.median(totals) * 1000:.1f} ms over {args.runs} runs")
+    slowest = sorted(runs[-1][0].items(), key=lambda item: item[1], reverse=True)[:8]
+    for name, seconds in slowest:
+        print(f"  {name:<32}{seconds * 1000:8.1f} ms")
+    deferred = runs[-1][1]
+    print(f"deferred modules imported at startup: {', '.join(deferred) or 'none'}")
+
+    command = args.command or ([shutil.which("cancionero")] if shutil.which("cancionero") else None)
+    if command is None:
+        print("time to first window: skipped, cancionero isn't installed (see --command)")
+        return
+    timings = [first_window(command) for _ in range(args.runs)]
+    for step in timings[0]:
+        median = statistics.median(t[step] for t in timings)
+        print(f"{step + ':':<16}{median * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
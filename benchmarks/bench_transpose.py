@@ -0,0 +1,33 @@
+"""Re-transposing a 2,000-chord song as the key is changed repeatedly.
+
+Run with: python -m benchmarks.bench_transpose
+"""
+import time
+
+from src.ast import chord_nodes
+from src.chords import transpose_chord, transpose_song
+from src.parser import parse_tab
+
+from .corpus import make_tab
+
+
+def main():
+    names = [node.name for node in chord_nodes(parse_tab(make_tab(3000)))]
+    transpose_chord.cache_clear()
+    amounts = list(range(-5, 6)) * 10
+
+    started = time.perf_counter()
+    transpose_song(names, amounts[0])
+    cold = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for amount in amounts:
+        transpose_song(names, amount)
+    warm = (time.perf_counter() - started) / len(amounts)
+
+    print(f"{len(names)} chords: first key change {cold * 1000:.2f} ms, "
+          f"later key changes {warm * 1000:.2f} ms each")
+
+
+if __name__ == "__main__":
+    main()
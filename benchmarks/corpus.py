@@ -0,0 +1,162 @@
+"""Synthetic, deterministic song data for the benchmarks.
+
+Real Ultimate Guitar pages can't be redistributed, so the benchmarks run
+against generated tabs that follow the same markup: [ch] chord lines with
+wide spacers, lyric lines, [Section headers] and (comments).
+"""
+import random
+
+CHORDS = ["C", "G", "Am", "F", "Em7", "D/F#", "G#m", "Bbmaj7", "Csus4", "E7"]
+WORDS = (
+    "life could be so handsome and the road goes on forever "
+    "in the night we sing along under city lights"
+).split()
+
+SYLLABLES = "ka lo mi ra ne so tu va le ri an el on ber dor fin gal sen tor mar".split()
+
+
+def make_vocabulary(size: int = 5000, seed: int = 0) -> list:
+    """Distinct made-up words, most frequent first."""
+    rnd = random.Random(seed)
+    words = dict.fromkeys(WORDS)
+    while len(words) < size:
+        words["".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(1, 4)))] = None
+    return list(words)
+
+
+def zipf_words(rnd: random.Random, vocabulary: list, count: int) -> list:
+    """Pick words with the long-tailed frequencies of natural language."""
+    last = len(vocabulary) - 1
+    return [vocabulary[min(int(rnd.paretovariate(1.0)) - 1, last)] for _ in range(count)]
+
+
+def make_tab(lines: int = 4000, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    out = []
+    for i in range(lines):
+        kind = i % 6
+        if kind == 0:
+            out.append(f"[Verse {i // 6 + 1}]")
+        elif kind in (1, 3):
+            out.append(
+                "".join(
+                    f"[ch]{rnd.choice(CHORDS)}[/ch]" + " " * rnd.randint(2, 12)
+                    for _ in range(4)
+                )
+            )
+        elif kind == 5:
+            out.append("(repeat x2)  [ch]C[/ch] - [ch]G[/ch]")
+        else:
+            out.append(" ".join(rnd.choice(WORDS) for _ in range(8)))
+    return "\r\n".join(out)
+
+
+def make_applicature(chords: int = 10, variants: int = 4, seed: int = 0) -> dict:
+    """Chord diagrams in Ultimate Guitar's `applicature` format."""
+    rnd = random.Random(seed)
+    names = [f"{CHORDS[i % len(CHORDS)]}{'/' * (i // len(CHORDS))}" for i in range(chords)]
+    return {
+        name: [
+            {
+                "id": f"{name}_{v}",
+                "listCapos": [],
+                "noteIndex": rnd.randint(0, 11),
+                "notes": [rnd.randint(0, 11) for _ in range(6)],
+                "frets": [rnd.randint(-1, 5) + 2 * v for _ in range(6)],
+                "fingers": [rnd.randint(0, 4) for _ in range(6)],
+                "fret": 1 + 2 * v,
+                "capos": [],
+                "vartype": "chords",
+                "instrument": "guitar",
+            }
+            for v in range(variants)
+        ]
+        for name in names
+    }
+
+
+def make_tab_store(lines: int = 200, seed: int = 0) -> dict:
+    """A tab page's decoded js-store payload with a generated tab."""
+    rnd = random.Random(seed)
+    applicature = make_applicature(seed=seed)
+    versions = [
+        {
+            "artist_name": "Artist",
+            "song_name": f"Song {seed}",
+            "tab_url": f"https://tabs.ultimate-guitar.com/tab/artist/song-{seed}-{v}",
+            "artist_url": "https://www.ultimate-guitar.com/artist/artist",
+            "type": "Chords",
+            "version": v,
+            "votes": rnd.randint(0, 500),
+            "rating": rnd.uniform(3, 5),
+        }
+        for v in range(1, 6)
+    ]
+    return {
+        "store": {
+            "page": {
+                "data": {
+                    "tab": {
+                        "artist_name": "Artist",
+                        "song_name": f"Song {seed}",
+                        "version": 1,
+                        "type": "Chords",
+                        "rating": 4,
+                        "tab_url": f"https://tabs.ultimate-guitar.com/tab/artist/song-{seed}",
+                    },
+                    "tab_view": {
+                        "wiki_tab": {"content": make_tab(lines, seed)},
+                        "ug_difficulty": "intermediate",
+                        "applicature": applicature,
+                        "meta": {"capo": 2, "tuning": {"name": "Standard", "value": "E A D G B E"}},
+                        "versions": versions,
+                    },
+                }
+            }
+        }
+    }
+
+
+def make_search_store(results: int = 50, seed: int = 0) -> dict:
+    """A search page's decoded js-store payload."""
+    rnd = random.Random(seed)
+    return {
+        "store": {
+            "page": {
+                "data": {
+                    "results": [
+                        {
+                            "artist_name": f"Artist {rnd.randint(1, 20)}",
+                            "song_name": " ".join(rnd.sample(WORDS, 3)).title(),
+                            "tab_url": f"https://tabs.ultimate-guitar.com/tab/artist/song-{i}",
+                            "artist_url": "https://www.ultimate-guitar.com/artist/artist",
+                            "type": rnd.choice(("Chords", "Tabs", "Pro")),
+                            "version": rnd.randint(1, 5),
+                            "votes": rnd.randint(0, 500),
+                            "rating": rnd.uniform(3, 5),
+                        }
+                        for i in range(results)
+                    ]
+                }
+            }
+        }
+    }
+
+
+def make_page(store: dict, filler_kb: int = 300) -> str:
+    """An HTML page shaped like Ultimate Guitar's: scripts, markup, js-store."""
+    import html
+    import json
+
+    script = "window.UGAPP = {};" + "var x = a < b && c > d;" * (filler_kb * 20)
+    nav = "".join(
+        f'<li class="nav-item"><a href="/link/{i}">Link {i}</a></li>'
+        for i in range(filler_kb * 10)
+    )
+    content = html.escape(json.dumps(store))
+    return (
+        "<!DOCTYPE html><html><head><title>Chords</title>"
+        f"<script>{script}</script></head><body><ul>{nav}</ul>"
+        f'<div class="js-store" data-content="{content}"></div>'
+        f"<footer><ul>{nav}</ul></footer></body></html>"
+    )
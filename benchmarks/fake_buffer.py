@@ -0,0 +1,26 @@
+"""A stand-in for Gtk.TextBuffer, so rendering can be timed without GTK."""
+
+
+class FakeBuffer:
+    """The Gtk.TextBuffer calls used by `src.render.append_chunk`."""
+
+    def __init__(self):
+        self.parts = []
+        self.length = 0
+        self.tags = []
+
+    def get_char_count(self):
+        return self.length
+
+    def get_end_iter(self):
+        return self.length
+
+    def get_iter_at_offset(self, offset):
+        return offset
+
+    def insert(self, iter, text):
+        self.parts.append(text)
+        self.length += len(text)
+
+    def apply_tag_by_name(self, name, start, end):
+        self.tags.append((name, start, end))
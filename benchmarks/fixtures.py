@@ -0,0 +1,90 @@
+"""Saved js-store JSON and HTML pages, from small to huge tabs.
+
+Real Ultimate Guitar pages can't be redistributed, so the fixtures are
+generated from the corpus and saved on first use. Pages saved from the
+site can be benchmarked too: put them in a directory as `<name>.html`,
+optionally with the `<name>.json` store, and pass it with `--fixtures`.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import List, NamedTuple
+
+from src.ug import extract_store
+
+from . import corpus
+from .corpus import make_page, make_search_store, make_tab_store
+
+DEFAULT_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# Tab fixtures by name, as (tab lines, kilobytes of page filler)
+SIZES = {
+    "small": (40, 60),
+    "medium": (200, 300),
+    "large": (2000, 300),
+    "huge": (8000, 600),
+}
+SEARCH_RESULTS = 50
+# Holds the hash of the corpus the generated fixtures were made from
+STAMP = "corpus.sha256"
+
+
+class Fixture(NamedTuple):
+    name: str
+    store: dict
+    html: str
+
+
+def corpus_hash() -> str:
+    """Hash the code and sizes the generated fixtures are made from."""
+    digest = hashlib.sha256(Path(corpus.__file__).read_bytes())
+    digest.update(repr((SIZES, SEARCH_RESULTS)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def save_fixtures(directory: Path = DEFAULT_DIR):
+    """
+    Write the generated fixtures to `directory`, unless they are all there
+    already and were made from the current corpus. Stale fixtures would
+    silently compare different pages with the baseline.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = [
+        directory / f"{name}.{ext}" for name in [*SIZES, "search"] for ext in ("json", "html")
+    ]
+    stamp = directory / STAMP
+    version = corpus_hash()
+    if (
+        stamp.exists()
+        and stamp.read_text(encoding="utf-8") == version
+        and all(path.exists() for path in paths)
+    ):
+        return
+    stores = {
+        name: make_tab_store(lines, seed=i)
+        for i, (name, (lines, _)) in enumerate(SIZES.items())
+    }
+    stores["search"] = make_search_store(SEARCH_RESULTS)
+    for name, store in stores.items():
+        filler_kb = SIZES.get(name, (0, 300))[1]
+        (directory / f"{name}.json").write_text(json.dumps(store), encoding="utf-8")
+        page = make_page(store, filler_kb)
+        (directory / f"{name}.html").write_text(page, encoding="utf-8")
+    # Written last, so that fixtures written in part are made again
+    stamp.write_text(version, encoding="utf-8")
+
+
+def load_fixtures(directory: Path = DEFAULT_DIR) -> List[Fixture]:
+    """Load every page in `directory`, smallest first."""
+    if directory == DEFAULT_DIR:
+        save_fixtures(directory)
+    fixtures = []
+    for page in sorted(directory.glob("*.html"), key=lambda path: path.stat().st_size):
+        html = page.read_text(encoding="utf-8")
+        saved = page.with_suffix(".json")
+        if saved.exists():
+            store = json.loads(saved.read_text(encoding="utf-8"))
+        else:
+            store = extract_store(html)
+        fixtures.append(Fixture(page.stem, store, html))
+    return fixtures
@@ -0,0 +1,218 @@
+"""Benchmark suite for the hot paths, runnable offline without a display.
+
+For every fixture page it times extracting the js-store, building the
+SearchResults or SongDetail, parsing the tab, tokenizing it, building its
+tree from the tokens, working out the chord shapes and rendering the tab
+into a FakeBuffer. Each case reports latency percentiles, throughput and
+peak memory.
+
+Results can be saved as a baseline, and later runs are compared with it:
+a case whose best time or peak memory grows by more than `--threshold`
+is flagged, and the run exits with status 1. On a busy machine, raise
+`--threshold` or `--min-time` to avoid false alarms.
+
+Run with: python -m benchmarks.run [--save] [--filter parse]
+"""
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, NamedTuple
+
+from src import ug
+from src.parser import build_tree, parse_tab, tokenize
+from src.render import append_chunk, iter_chunks
+
+from .fake_buffer import FakeBuffer
+from .fixtures import DEFAULT_DIR, load_fixtures
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent.parent / ".benchmarks" / "baseline.json"
+
+
+class Case(NamedTuple):
+    name: str
+    func: Callable[[], object]
+    # Work done per call, for the throughput, e.g. (2000, "lines")
+    units: float
+    unit: str
+
+
+class Result(NamedTuple):
+    samples: int
+    best: float
+    p50: float
+    p95: float
+    p99: float
+    throughput: float
+    unit: str
+    peak_memory: int
+
+
+def _render(chunks):
+    buffer = FakeBuffer()
+    for chunk in chunks:
+        append_chunk(buffer, *chunk)
+    return buffer
+
+
+def make_cases(fixtures) -> List[Case]:
+    cases = []
+    for fixture in fixtures:
+        name = fixture.name
+        data = fixture.store["store"]["page"]["data"]
+        html = fixture.html
+        cases.append(
+            Case(
+                f"extract_store[{name}]",
+                lambda html=html: ug.extract_store(html),
+                len(html) / 1024,
+                "KiB",
+            )
+        )
+        if "results" in data:
+            results = data["results"]
+            cases.append(
+                Case(
+                    f"SearchResult[{name}]",
+                    lambda results=results: [ug.SearchResult(r) for r in results],
+                    len(results),
+                    "results",
+                )
+            )
+        if "tab_view" not in data:
+            continue
+
+        store = fixture.store
+        song = ug.SongDetail(store)
+        lines = song.tab.count("\n") + 1
+        variants = sum(map(len, (song.applicature or {}).values()))
+        ast = parse_tab(song.tab)
+        tab, tokens = tokenize(song.tab)
+
+        def get_chords(song=song):
+            ug._chord_shape.cache_clear()
+            return ug.get_chords(song)
+
+        cases += [
+            Case(
+                f"SongDetail[{name}]",
+                lambda store=store: ug.SongDetail(store),
+                1,
+                "songs",
+            ),
+            Case(
+                f"parse_tab_to_ast[{name}]",
+                lambda tab=song.tab: parse_tab(tab),
+                lines,
+                "lines",
+            ),
+            Case(f"tokenize[{name}]", lambda tab=song.tab: tokenize(tab), lines, "lines"),
+            Case(
+                f"build_tree[{name}]",
+                lambda tab=tab, tokens=tokens: build_tree(tab, tokens),
+                lines,
+                "lines",
+            ),
+            Case(f"get_chords[{name}]", get_chords, variants, "variants"),
+            Case(f"render[{name}]", lambda ast=ast: _render(iter_chunks(ast)), lines, "lines"),
+        ]
+    return cases
+
+
+def measure(case: Case, min_time: float, min_samples: int = 10) -> Result:
+    case.func()  # warm up
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < min_samples or (
+        time.perf_counter() - started < min_time and len(samples) < 1000
+    ):
+        start = time.perf_counter()
+        case.func()
+        samples.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        case.func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return Result(
+        samples=len(samples),
+        best=min(samples),
+        p50=cuts[49],
+        p95=cuts[94],
+        p99=cuts[98],
+        throughput=case.units / statistics.fmean(samples),
+        unit=case.unit,
+        peak_memory=peak,
+    )
+
+
+def compare(result: Result, baseline: dict, threshold: float) -> str:
+    """
+    Describe `result` against its baseline, flagging regressions. Times are
+    compared by their best run, which is the least affected by whatever
+    else the machine is doing.
+    """
+    if baseline is None:
+        return "new"
+    time_ratio = result.best / baseline["best"]
+    memory_ratio = result.peak_memory / max(baseline["peak_memory"], 1)
+    note = f"{time_ratio:5.2f}x time, {memory_ratio:5.2f}x memory"
+    if time_ratio > 1 + threshold or memory_ratio > 1 + threshold:
+        return note + "  REGRESSION"
+    return note
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="", help="only run cases containing this")
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_DIR)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="save results as baseline")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds per case")
+    args = parser.parse_args(argv)
+
+    baselines = {}
+    if args.baseline.exists():
+        baselines = json.loads(args.baseline.read_text())
+
+    cases = [c for c in make_cases(load_fixtures(args.fixtures)) if args.filter in c.name]
+    print(
+        f"{'case':<28}{'runs':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        f"{'throughput':>26}{'peak KiB':>10}  baseline"
+    )
+    results = {}
+    regressions = 0
+    for case in cases:
+        result = measure(case, args.min_time)
+        results[case.name] = result._asdict()
+        note = compare(result, baselines.get(case.name), args.threshold)
+        regressions += note.endswith("REGRESSION")
+        print(
+            f"{case.name:<28}{result.samples:>6}"
+            f"{result.p50 * 1000:>10.3f}{result.p95 * 1000:>10.3f}{result.p99 * 1000:>10.3f}"
+            f"{result.throughput:>14,.0f} {result.unit + '/s':<11}"
+            f"{result.peak_memory / 1024:>10,.0f}  {note}"
+        )
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({**baselines, **results}, indent=2))
+        print(f"Saved baseline to {args.baseline}")
+    if regressions:
+        print(f"{regressions} case(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
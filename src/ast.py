@@ -1,4 +1,16 @@
-class ASTNode:
+from .chords import transpose_chord, transpose_song
+
+
+class Node:
+    """Base class of every node. Leaf nodes share an empty `children`."""
+
+    __slots__ = ()
+    children = ()
+
+
+class ASTNode(Node):
+    __slots__ = ("children",)
+
     def __init__(self):
         self.children = []
 
@@ -7,41 +19,59 @@ class ASTNode:
 
 
 class LineNode(ASTNode):
-    def __init__(self):
-        super().__init__()
+    __slots__ = ()
 
 
-class ChordNode(ASTNode):
+class ChordNode(Node):
+    __slots__ = ("name",)
+
     def __init__(self, name):
-        super().__init__()
         self.name = name
 
     def transpose(self, amount):
         self.name = transpose_chord(self.name, amount)
 
 
-class TextNode(ASTNode):
+class TextNode(Node):
+    __slots__ = ("text",)
+
     def __init__(self, text):
-        super().__init__()
         self.text = text
 
 
-class SpacerNode(ASTNode):
+class SpacerNode(Node):
+    __slots__ = ("length",)
+
     def __init__(self, length):
-        super().__init__()
         self.length = length
 
 
-class SectionHeaderNode(ASTNode):
+class SectionHeaderNode(Node):
+    __slots__ = ("name",)
+
     def __init__(self, name):
-        super().__init__()
         self.name = name
 
 
-class CommentNode(ASTNode):
+class CommentNode(Node):
+    __slots__ = ("comment",)
+
     def __init__(self, comment):
-        super().__init__()
         self.comment = comment
 
 
-def transpose_chord(chord, amount): ...
+def chord_nodes(root):
+    """Return the ChordNodes of a tree, in reading order."""
+    return [
+        node
+        for line in root.children
+        for node in line.children
+        if type(node) is ChordNode
+    ]
+
+
+def transpose_ast(root, amount):
+    """Transpose every chord of the tree in place, in the song's new key."""
+    nodes = chord_nodes(root)
+    for node, name in zip(nodes, transpose_song([n.name for n in nodes], amount)):
+        node.name = name
@@ -0,0 +1,106 @@
+from array import array
+from bisect import bisect_right
+
+# Time a frame may take at 60 frames per second
+FRAME_BUDGET = 1 / 60
+# Frame times kept for statistics
+FRAME_SAMPLES = 1024
+
+
+def seconds_per_line_from_bpm(bpm: float, beats_per_line: float = 4) -> float:
+    """Scroll rate for a song played at `bpm`, with a bar of chords per line."""
+    return beats_per_line * 60 / bpm
+
+
+class AutoScroll:
+    """
+    Works out the scroll position of a song moving at a steady number of
+    seconds per line, from the top pixel offset of every line.
+
+    The offsets are computed once from the text layout, so each frame only
+    interpolates between two of them. `advance` is called once per frame
+    and allocates nothing but the float it returns.
+    """
+
+    def __init__(self, line_offsets, seconds_per_line: float = 3.0):
+        """
+        Args:
+            line_offsets: the y coordinate of the top of every line, in
+                pixels, followed by the bottom of the last line
+            seconds_per_line: time each line takes to scroll by
+        """
+        self.offsets = array("d", line_offsets)
+        self.seconds_per_line = seconds_per_line
+        # Position in lines, e.g. 2.5 is halfway through the third line
+        self.position = 0.0
+        self.last_frame = None
+        # Time each frame took to compute, as a ring buffer
+        self.frame_times = array("d", bytes(8 * FRAME_SAMPLES))
+        self.frames = 0
+
+    @property
+    def lines(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def finished(self) -> bool:
+        return self.position >= self.lines
+
+    def set_rate(self, seconds_per_line: float):
+        """Change the speed; takes effect from the next frame on."""
+        self.seconds_per_line = seconds_per_line
+
+    def start(self, y: float):
+        """Start scrolling from pixel offset `y`, e.g. the current scroll value."""
+        self.position = self.position_at(y)
+        self.last_frame = None
+
+    def position_at(self, y: float) -> float:
+        """Return the position in lines of pixel offset `y`."""
+        offsets = self.offsets
+        if self.lines <= 0 or y <= offsets[0]:
+            return 0.0
+        if y >= offsets[-1]:
+            return float(self.lines)
+        line = bisect_right(offsets, y) - 1
+        top = offsets[line]
+        height = offsets[line + 1] - top
+        return line + ((y - top) / height if height > 0 else 0.0)
+
+    def y_at(self, position: float) -> float:
+        """Return the pixel offset of a position in lines."""
+        offsets = self.offsets
+        if position >= self.lines:
+            return offsets[-1]
+        line = int(position)
+        top = offsets[line]
+        return top + (position - line) * (offsets[line + 1] - top)
+
+    def advance(self, frame_time: int) -> float:
+        """
+        Move on to the frame shown at `frame_time`, in microseconds as given
+        by Gdk.FrameClock, and return its pixel offset.
+        """
+        if self.last_frame is not None and self.seconds_per_line > 0:
+            elapsed = (frame_time - self.last_frame) / 1e6
+            self.position = min(
+                self.position + elapsed / self.seconds_per_line, self.lines
+            )
+        self.last_frame = frame_time
+        return self.y_at(self.position)
+
+    def record_frame(self, seconds: float):
+        """Record how long a frame took to compute."""
+        self.frame_times[self.frames % FRAME_SAMPLES] = seconds
+        self.frames += 1
+
+    def frame_stats(self):
+        """
+        Return the median and worst of the recorded frame times, in seconds,
+        and how many went over FRAME_BUDGET.
+        """
+        times = sorted(self.frame_times[: min(self.frames, FRAME_SAMPLES)])
+        if not times:
+            return 0.0, 0.0, 0
+        over = len(times) - bisect_right(times, FRAME_BUDGET)
+        return times[len(times) // 2], times[-1], over
@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+
+def default_cache_dir() -> Path:
+    """Return the per-user cache directory for Cancionero."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "cancionero"
+
+
+class FileCache:
+    """
+    Base of the persistent caches: one file per entry, named after a hash of
+    the key and written atomically, with LRU eviction. When the total size
+    of the cache goes over `max_size` bytes the least recently used entries
+    are removed.
+    """
+
+    # Extension of the entry files, set by each cache
+    suffix = ""
+
+    def __init__(self, directory, max_size: int = 64 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # file name -> size in bytes, least recently used first
+        self._index = None
+        self._size = 0
+
+    def _write(self, path: Path, payload: bytes):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            index = self._load_index()
+            self._size -= index.pop(path.name, 0)
+            index[path.name] = len(payload)
+            self._size += len(payload)
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            for name in self._load_index():
+                try:
+                    os.unlink(self.directory / name)
+                except OSError:
+                    pass
+            self._index = OrderedDict()
+            self._size = 0
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}{self.suffix}"
+
+    def _load_index(self):
+        """Build the LRU index from the files on disk on first use."""
+        if self._index is None:
+            entries = []
+            try:
+                with os.scandir(self.directory) as it:
+                    for entry in it:
+                        if entry.name.endswith(self.suffix):
+                            stat = entry.stat()
+                            entries.append((stat.st_mtime, entry.name, stat.st_size))
+            except FileNotFoundError:
+                pass
+            entries.sort()
+            self._index = OrderedDict((name, size) for _, name, size in entries)
+            self._size = sum(self._index.values())
+        return self._index
+
+    def _touch(self, path: Path):
+        """Mark an entry as recently used, on disk and in the index."""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            index = self._load_index()
+            if path.name in index:
+                index.move_to_end(path.name)
+
+    def _remove(self, name: str):
+        try:
+            os.unlink(self.directory / name)
+        except OSError:
+            pass
+        with self._lock:
+            self._size -= self._load_index().pop(name, 0)
+
+    def _evict(self):
+        while self._size > self.max_size and len(self._index) > 1:
+            name, size = self._index.popitem(last=False)
+            self._size -= size
+            try:
+                os.unlink(self.directory / name)
+            except OSError:
+                pass
+
+
+class DiskCache(FileCache):
+    """
+    Persistent JSON cache with a time-to-live and LRU eviction.
+
+    Entries are kept with metadata, such as HTTP validators, and the time
+    they were stored, after which they are fresh for `ttl` seconds.
+    """
+
+    suffix = ".json"
+
+    def __init__(
+        self,
+        directory,
+        ttl: float = 7 * 24 * 60 * 60,
+        max_size: int = 64 * 1024 * 1024,
+        clock=time.time,
+    ):
+        super().__init__(directory, max_size)
+        self.ttl = ttl
+        self.clock = clock
+
+    def get(self, key: str):
+        """Return the value stored for `key`, or None if missing or expired."""
+        entry = self.get_entry(key)
+        if entry is None:
+            return None
+        if not self.is_fresh(entry):
+            # Expired entries with validators are kept for revalidation
+            if not entry["meta"]:
+                self._remove(self._path(key).name)
+            return None
+        return entry["data"]
+
+    def get_entry(self, key: str):
+        """
+        Return the entry stored for `key`, fresh or not, as a dict with the
+        `data`, the `meta` passed to `set` and the `stored_at` timestamp.
+        """
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key:
+            return None
+        entry.setdefault("meta", {})
+        self._touch(path)
+        return entry
+
+    def is_fresh(self, entry) -> bool:
+        return self.clock() - entry["stored_at"] <= self.ttl
+
+    def set(self, key: str, value, **meta):
+        """Store `value` for `key`, along with optional JSON metadata."""
+        entry = {"key": key, "stored_at": self.clock(), "meta": meta, "data": value}
+        payload = json.dumps(entry, separators=(",", ":")).encode("utf-8")
+        self._write(self._path(key), payload)
+
+
+class BlobCache(FileCache):
+    """
+    Persistent cache of binary values with LRU eviction, for keys that
+    identify their content, such as hashes, and so never go stale.
+    """
+
+    suffix = ".bin"
+
+    def get(self, key: str):
+        """Return the bytes stored for `key`, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        self._touch(path)
+        return data
+
+    def set(self, key: str, value: bytes):
+        self._write(self._path(key), value)
@@ -0,0 +1,174 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+SHARP_NAMES = ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B")
+FLAT_NAMES = ("C", "Db", "D", "Eb", "E", "F", "Gb", "G", "Ab", "A", "Bb", "B")
+
+# Semitones above C of every spelling of a note
+PITCH_CLASSES = {name: i for i, name in enumerate(SHARP_NAMES)}
+PITCH_CLASSES.update({name: i for i, name in enumerate(FLAT_NAMES)})
+PITCH_CLASSES.update({"B#": 0, "Cb": 11, "E#": 5, "Fb": 4})
+
+# Keys written with flats, as pitch classes of their tonic
+FLAT_MAJOR_KEYS = frozenset((5, 10, 3, 8, 1))  # F Bb Eb Ab Db
+FLAT_MINOR_KEYS = frozenset((2, 7, 0, 5, 10, 3))  # Dm Gm Cm Fm Bbm Ebm
+
+# (?P<root>[A-Ga-g](#|b)?) : Chord root is any letter A - G with an optional sharp or flat at the end
+# (?P<quality>.*?) : Chord quality is anything after the root, but before the `/` for the bass note.
+#                    Other slashes are part of the quality, e.g. C6/9 or Am7/11
+# (?P<bass>[A-Ga-g](#|b)?) : Bass note after the last `/`, e.g. D/F#
+_CHORD_RE = re.compile(
+    r"(?P<root>[A-Ga-g][#b]?)(?P<quality>.*?)(?:/(?P<bass>[A-Ga-g][#b]?))?"
+)
+
+
+class Chord(NamedTuple):
+    root: str
+    quality: str
+    bass: Optional[str]
+
+    @property
+    def is_minor(self) -> bool:
+        return self.quality.startswith("m") and not self.quality.startswith("maj")
+
+    def __str__(self):
+        return self.root + self.quality + (f"/{self.bass}" if self.bass else "")
+
+
+def parse_chord(name: str) -> Optional[Chord]:
+    """Split a chord name into root, quality and bass, or None if it isn't one."""
+    match = _CHORD_RE.fullmatch(name)
+    if match is None:
+        return None
+    root = match.group("root")
+    bass = match.group("bass")
+    return Chord(
+        root[0].upper() + root[1:],
+        match.group("quality"),
+        bass[0].upper() + bass[1:] if bass else None,
+    )
+
+
+def transpose_note(note: str, amount: int, flats: bool) -> str:
+    names = FLAT_NAMES if flats else SHARP_NAMES
+    return names[(PITCH_CLASSES[note] + amount) % 12]
+
+
+@lru_cache(maxsize=4096)
+def transpose_chord(chord: str, amount: int, flats: Optional[bool] = None) -> str:
+    """
+    Transpose a chord name by `amount` semitones.
+
+    Notes are spelled with flats or sharps according to `flats`; when it is
+    None the spelling of the original root is kept. Names that aren't
+    chords are returned unchanged.
+    """
+    parsed = parse_chord(chord)
+    if parsed is None or amount % 12 == 0:
+        return chord
+    if flats is None:
+        flats = parsed.root.endswith("b")
+    root = transpose_note(parsed.root, amount, flats)
+    bass = transpose_note(parsed.bass, amount, flats) if parsed.bass else None
+    return str(Chord(root, parsed.quality, bass))
+
+
+def key_uses_flats(chord: Chord) -> bool:
+    """Whether the key named after `chord` is conventionally written with flats."""
+    tonic = PITCH_CLASSES[chord.root]
+    return tonic in (FLAT_MINOR_KEYS if chord.is_minor else FLAT_MAJOR_KEYS)
+
+
+def transpose_song(names, amount: int):
+    """
+    Transpose a song's chord names by `amount` semitones.
+
+    The song's key is taken from its first chord, and every chord is spelled
+    with the sharps or flats of the new key.
+    """
+    if amount % 12 == 0:
+        return list(names)
+    for name in names:
+        key = parse_chord(name)
+        if key is not None:
+            target = Chord(transpose_note(key.root, amount, False), key.quality, None)
+            flats = key_uses_flats(target)
+            break
+    else:
+        return list(names)
+    return [transpose_chord(name, amount, flats) for name in names]
+
+
+# Semitones above the tonic of the degrees of the major scale
+_DEGREES = {"I": 0, "II": 2, "III": 4, "IV": 5, "V": 7, "VI": 9, "VII": 11}
+
+_NUMERAL_RE = re.compile(
+    r"(?P<accidental>[b#♭♯]?)(?P<numeral>VII|VI|V|IV|III|II|I|vii|vi|v|iv|iii|ii|i)"
+    r"(?P<quality>°|o|dim|\+|aug)?(?:\d.*|maj.*|sus.*|add.*)?"
+)
+_PROGRESSION_SEPARATORS_RE = re.compile(r"[\s,\-–—|]+")
+
+
+def chord_class(chord: Chord) -> str:
+    """Classify a chord as "maj", "min", "dim" or "aug", by its triad."""
+    quality = chord.quality
+    if quality.startswith(("dim", "°", "o")) or quality.startswith("m7b5"):
+        return "dim"
+    if quality.startswith(("aug", "+")):
+        return "aug"
+    return "min" if chord.is_minor else "maj"
+
+
+def progression(names):
+    """
+    Return the chords of a song as `(pitch class, chord class)` pairs,
+    dropping the names that aren't chords and repeats of the same chord.
+    """
+    steps = []
+    for name in names:
+        chord = parse_chord(name)
+        if chord is None or chord.root not in PITCH_CLASSES:
+            continue
+        step = (PITCH_CLASSES[chord.root], chord_class(chord))
+        if not steps or steps[-1] != step:
+            steps.append(step)
+    return steps
+
+
+def _parse_numeral(token: str):
+    match = _NUMERAL_RE.fullmatch(token)
+    if match is None:
+        return None
+    numeral = match.group("numeral")
+    interval = _DEGREES[numeral.upper()]
+    interval += {"b": -1, "♭": -1, "#": 1, "♯": 1}.get(match.group("accidental"), 0)
+    quality = match.group("quality")
+    if quality in ("°", "o", "dim"):
+        kind = "dim"
+    elif quality in ("+", "aug"):
+        kind = "aug"
+    else:
+        kind = "maj" if numeral.isupper() else "min"
+    return interval % 12, kind
+
+
+def parse_progression(text: str):
+    """
+    Parse a progression written with Roman numerals, e.g. "I–V–vi–IV", or
+    with chord names, e.g. "C G Am F", into `progression` steps. Returns
+    None if a part is neither.
+    """
+    steps = []
+    for token in _PROGRESSION_SEPARATORS_RE.split(text.strip()):
+        if not token:
+            continue
+        step = _parse_numeral(token)
+        if step is None:
+            chord = parse_chord(token)
+            if chord is None or chord.root not in PITCH_CLASSES:
+                return None
+            step = PITCH_CLASSES[chord.root], chord_class(chord)
+        if not steps or steps[-1] != step:
+            steps.append(step)
+    return steps
@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _idle_add(callback, *args):
+    from gi.repository import GLib
+
+    def run():
+        callback(*args)
+        return GLib.SOURCE_REMOVE
+
+    GLib.idle_add(run)
+
+
+class Fetcher:
+    """
+    Run blocking calls such as `ug_search` and `ug_tab` on a worker pool and
+    deliver their results back on the GTK main loop.
+
+    Requests are grouped in channels (e.g. "search" or "song"). Submitting a
+    new request on a channel supersedes the previous one: if it hasn't
+    started yet it is cancelled, otherwise its result is dropped.
+
+    `submit` and `cancel` must be called from the main loop. After
+    `shutdown`, results still waiting to be delivered are dropped and
+    `on_progress` is no longer called.
+    """
+
+    def __init__(self, max_workers=4, dispatch=_idle_add, on_progress=None):
+        """
+        Args:
+            max_workers: size of the worker thread pool
+            dispatch: schedules `callback(*args)` on the main loop, from any
+              thread
+            on_progress: called on the main loop as `on_progress(pending)`
+              whenever the number of unfinished requests changes
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="cancionero-fetch"
+        )
+        self._dispatch = dispatch
+        self._on_progress = on_progress
+        self._generations = {}
+        self._futures = {}
+        self._closed = False
+        self.pending = 0
+
+    def submit(self, channel, func, *args, on_done, on_error=None):
+        """
+        Call `func(*args)` on a worker thread, then `on_done(result)` or
+        `on_error(exception)` on the main loop, unless the request was
+        superseded or cancelled in the meantime.
+        """
+        self.cancel(channel)
+        generation = self._generations[channel]
+
+        def run():
+            try:
+                result = func(*args)
+            except Exception as e:
+                self._dispatch(self._deliver, channel, generation, on_error, e)
+            else:
+                self._dispatch(self._deliver, channel, generation, on_done, result)
+
+        future = self._executor.submit(run)
+        self._futures[channel] = future
+        self._set_pending(self.pending + 1)
+        return future
+
+    def cancel(self, channel):
+        """Drop the result of any request in flight on `channel`."""
+        self._generations[channel] = self._generations.get(channel, 0) + 1
+        future = self._futures.pop(channel, None)
+        if future is not None and future.cancel():
+            # Cancelled before it started, so it will never be delivered
+            self._set_pending(self.pending - 1)
+
+    def shutdown(self):
+        self._closed = True
+        for channel in list(self._futures):
+            self.cancel(channel)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _deliver(self, channel, generation, callback, value):
+        if self._closed:
+            return
+        self._set_pending(self.pending - 1)
+        if self._generations.get(channel) != generation:
+            return
+        del self._futures[channel]
+        if callback is not None:
+            callback(value)
+
+    def _set_pending(self, pending):
+        self.pending = pending
+        if self._on_progress is not None and not self._closed:
+            self._on_progress(pending)
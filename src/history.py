@@ -0,0 +1,126 @@
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional
+
+# Rough memory taken by each character of a tab, once in SongDetail.tab and
+# about four times over in the rendered text buffer
+CHAR_BYTES = 5
+
+
+def estimate_size(song) -> int:
+    """Estimate the bytes held by a song, its tokens and its rendering."""
+    _, tokens = song.tokens
+    return tokens.itemsize * len(tokens) + CHAR_BYTES * len(song.tab)
+
+
+class Page(NamedTuple):
+    """A page in the history: a song, or the results of a search."""
+
+    # The song's URL path, or None for search results
+    url: Optional[str]
+    # The song's label, or the search query
+    label: str
+    results: tuple = ()
+
+
+class History:
+    """
+    Back and forward history of the pages shown, as in a web browser:
+    visiting a page drops the pages ahead of the current one.
+    """
+
+    def __init__(self, max_length: int = 100):
+        self.max_length = max_length
+        self.pages: List[Page] = []
+        self.index = -1
+
+    @property
+    def current(self) -> Optional[Page]:
+        return self.pages[self.index] if self.index >= 0 else None
+
+    @property
+    def can_go_back(self) -> bool:
+        return self.index > 0
+
+    @property
+    def can_go_forward(self) -> bool:
+        return self.index < len(self.pages) - 1
+
+    def visit(self, page: Page):
+        del self.pages[self.index + 1 :]
+        self.pages.append(page)
+        if len(self.pages) > self.max_length:
+            del self.pages[0]
+        self.index = len(self.pages) - 1
+
+    def replace(self, page: Page):
+        """Replace the current page, e.g. as a search is refined."""
+        if self.index < 0:
+            self.visit(page)
+        else:
+            self.pages[self.index] = page
+
+    def back(self) -> Optional[Page]:
+        if not self.can_go_back:
+            return None
+        self.index -= 1
+        return self.current
+
+    def forward(self) -> Optional[Page]:
+        if not self.can_go_forward:
+            return None
+        self.index += 1
+        return self.current
+
+
+class SongCache:
+    """
+    The songs shown most recently, kept with whatever the window needs to
+    show them again without fetching, parsing or rendering, such as their
+    text buffer.
+
+    Bounded by a number of songs and by their estimated size in bytes; the
+    least recently shown songs are dropped first, but never the last one
+    added.
+    """
+
+    def __init__(self, max_entries: int = 20, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # URL path -> (entry, size)
+        self._entries = OrderedDict()
+        self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, url):
+        return url in self._entries
+
+    def get(self, url: str):
+        """Return the entry stored for `url`, or None, marking it recently used."""
+        item = self._entries.get(url)
+        if item is None:
+            return None
+        self._entries.move_to_end(url)
+        return item[0]
+
+    def put(self, url: str, entry, size: int):
+        self.pop(url)
+        self._entries[url] = (entry, size)
+        self.size += size
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self.size > self.max_bytes
+        ):
+            _, (_, dropped) = self._entries.popitem(last=False)
+            self.size -= dropped
+
+    def pop(self, url: str):
+        item = self._entries.pop(url, None)
+        if item is None:
+            return None
+        self.size -= item[1]
+        return item[0]
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
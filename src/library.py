@@ -0,0 +1,394 @@
+import difflib
+import os
+import re
+import sqlite3
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+from urllib.parse import urlparse
+
+from .chords import parse_progression, progression
+from .parser import CHORD, NEWLINE, SECTION_HEADER, TEXT
+from .ug import SearchResult, SongDetail
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS songs (
+    id INTEGER PRIMARY KEY,
+    tab_url TEXT NOT NULL UNIQUE,
+    artist_name TEXT NOT NULL,
+    song_name TEXT NOT NULL,
+    type TEXT,
+    version INTEGER,
+    rating REAL,
+    tab BLOB NOT NULL,
+    lyrics TEXT NOT NULL,
+    headers TEXT NOT NULL,
+    chords TEXT NOT NULL
+);
+-- Full-text indexes over the songs table, which holds the indexed text.
+-- Artists and titles are kept apart from the much larger lyrics so that
+-- ranking the matches of a common word stays cheap.
+CREATE VIRTUAL TABLE IF NOT EXISTS titles_fts USING fts5(
+    artist_name, song_name,
+    content='songs', content_rowid='id', prefix='2 3',
+    tokenize="unicode61 remove_diacritics 2"
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS lyrics_fts USING fts5(
+    lyrics, headers, chords,
+    content='songs', content_rowid='id', prefix='2 3',
+    tokenize="unicode61 remove_diacritics 2 tokenchars '#'"
+);
+-- Words of artist names and titles, with their trigrams for fuzzy matching
+CREATE TABLE IF NOT EXISTS terms (id INTEGER PRIMARY KEY, term TEXT UNIQUE);
+CREATE VIRTUAL TABLE IF NOT EXISTS terms_fts USING fts5(
+    term, content='', tokenize='trigram'
+);
+-- Chord progressions of the songs, keyed by song id, as one n-gram of
+-- key-relative chords per chord change (see _progression_grams). Queries
+-- of two or three chords are prefixes of an n-gram, 7 or 8 and 11 to 13
+-- characters long, which get prefix indexes of their own.
+CREATE TABLE IF NOT EXISTS progressions (id INTEGER PRIMARY KEY, grams TEXT NOT NULL);
+CREATE VIRTUAL TABLE IF NOT EXISTS progressions_fts USING fts5(
+    grams, content='progressions', content_rowid='id', prefix='7 8 11 12 13'
+);
+"""
+
+# Artist and title matches scored per query, the most recently added first
+RANKED_TITLES = 1000
+
+# Chords per n-gram of the progression index
+PROGRESSION_GRAM = 4
+
+_WORD_RE = re.compile(r"\w[\w#']*")
+
+
+def default_library_path() -> Path:
+    """Return the location of the user's song library."""
+    base = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(base) / "cancionero" / "library.sqlite3"
+
+
+def _index_text(tab: str, tokens):
+    """
+    Return the lyrics, section headers and distinct chord names of a tab,
+    from the tokens of `tokenize`, and every chord name in order.
+    """
+    lyrics = []
+    headers = []
+    sequence = []
+    triples = iter(tokens)
+    for kind, start, end in zip(triples, triples, triples):
+        if kind == TEXT:
+            lyrics.append(tab[start:end])
+        elif kind == NEWLINE:
+            lyrics.append("\n")
+        elif kind == CHORD:
+            sequence.append(tab[start:end])
+        elif kind == SECTION_HEADER:
+            headers.append(tab[start:end].strip("[]"))
+    chords = dict.fromkeys(sequence)
+    return " ".join(lyrics), "\n".join(headers), " ".join(chords), sequence
+
+
+def _gram(steps) -> str:
+    """
+    Name the chords of `steps` by their class and their interval from the
+    chord before, e.g. C G Am F is "maj7maj2min8maj", the same in any key.
+    """
+    parts = [steps[0][1]]
+    for (previous, _), (root, kind) in zip(steps, steps[1:]):
+        parts.append(f"{(root - previous) % 12}{kind}")
+    return "".join(parts)
+
+
+def _progression_grams(steps) -> str:
+    """
+    Return the n-gram starting at every chord change of a progression, the
+    last ones cut short by the end of the song. A longer progression is
+    then a phrase of consecutive n-grams, and a shorter one the prefix of a
+    single n-gram.
+    """
+    return " ".join(
+        _gram(steps[i : i + PROGRESSION_GRAM]) for i in range(len(steps) - 1)
+    )
+
+
+class SongLibrary:
+    """
+    Local store of every song opened or imported, searchable offline.
+
+    Songs are indexed by artist, title, lyrics, section headers and chord
+    names in SQLite FTS5 indexes, which are updated on every insert.
+    Queries match words by prefix, and fall back to the closest known
+    artist and title words when nothing matches. Artist and title matches
+    are ranked, but for words in thousands of titles only the most
+    recently added RANKED_TITLES matches are.
+
+    A library must be used from the thread that opened it. To add songs
+    from other threads, see LibraryWriter.
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = default_library_path()
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        if path != ":memory:":
+            # Readers on other connections aren't held up by a write
+            self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __len__(self):
+        return self.db.execute("SELECT count(*) FROM songs").fetchone()[0]
+
+    def __contains__(self, tab_url):
+        """Whether the song at `tab_url`, a URL path as in SearchResult, is stored."""
+        row = self.db.execute("SELECT 1 FROM songs WHERE tab_url = ?", (tab_url,))
+        return row.fetchone() is not None
+
+    def get_tab(self, tab_url):
+        """Return the stored tab of the song at `tab_url`, or None."""
+        row = self.db.execute(
+            "SELECT tab FROM songs WHERE tab_url = ?", (tab_url,)
+        ).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    def add(self, song: SongDetail):
+        """Add or update a song, indexing the tokens it was parsed to."""
+        self.add_many([song])
+
+    def add_many(self, songs):
+        """Add or update many songs in one transaction."""
+        with self.db:
+            for song in songs:
+                self._add(song)
+
+    def _add(self, song: SongDetail):
+        lyrics, headers, chords, sequence = _index_text(*song.tokens)
+        tab_url = urlparse(song.tab_url).path
+        old = self.db.execute(
+            "SELECT id, artist_name, song_name, lyrics, headers, chords"
+            " FROM songs WHERE tab_url = ?",
+            (tab_url,),
+        ).fetchone()
+        if old is not None:
+            self.db.execute(
+                "INSERT INTO titles_fts(titles_fts, rowid, artist_name, song_name)"
+                " VALUES ('delete', ?, ?, ?)",
+                old[:3],
+            )
+            self.db.execute(
+                "INSERT INTO lyrics_fts(lyrics_fts, rowid, lyrics, headers, chords)"
+                " VALUES ('delete', ?, ?, ?, ?)",
+                (old[0], *old[3:]),
+            )
+            self._remove_progression(old[0])
+            self.db.execute("DELETE FROM songs WHERE id = ?", (old[0],))
+        row = (
+            tab_url,
+            song.artist_name,
+            song.song_name,
+            getattr(song, "_type", None),
+            song.version,
+            getattr(song, "rating", None),
+            zlib.compress(song.tab.encode("utf-8")),
+            lyrics,
+            headers,
+            chords,
+        )
+        cursor = self.db.execute(
+            "INSERT INTO songs (tab_url, artist_name, song_name, type, version,"
+            " rating, tab, lyrics, headers, chords)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            row,
+        )
+        self.db.execute(
+            "INSERT INTO titles_fts(rowid, artist_name, song_name) VALUES (?, ?, ?)",
+            (cursor.lastrowid, *row[1:3]),
+        )
+        self.db.execute(
+            "INSERT INTO lyrics_fts(rowid, lyrics, headers, chords) VALUES (?, ?, ?, ?)",
+            (cursor.lastrowid, *row[7:]),
+        )
+        self._add_progression(cursor.lastrowid, sequence)
+        for term in set(_WORD_RE.findall(f"{song.artist_name} {song.song_name}".lower())):
+            cursor = self.db.execute(
+                "INSERT OR IGNORE INTO terms (term) VALUES (?)", (term,)
+            )
+            if cursor.rowcount:
+                self.db.execute(
+                    "INSERT INTO terms_fts(rowid, term) VALUES (?, ?)",
+                    (cursor.lastrowid, term),
+                )
+
+    def _add_progression(self, song_id, names):
+        grams = _progression_grams(progression(names))
+        self.db.execute(
+            "INSERT INTO progressions (id, grams) VALUES (?, ?)", (song_id, grams)
+        )
+        self.db.execute(
+            "INSERT INTO progressions_fts(rowid, grams) VALUES (?, ?)", (song_id, grams)
+        )
+
+    def _remove_progression(self, song_id):
+        row = self.db.execute(
+            "SELECT grams FROM progressions WHERE id = ?", (song_id,)
+        ).fetchone()
+        if row is None:
+            return
+        self.db.execute(
+            "INSERT INTO progressions_fts(progressions_fts, rowid, grams)"
+            " VALUES ('delete', ?, ?)",
+            (song_id, row[0]),
+        )
+        self.db.execute("DELETE FROM progressions WHERE id = ?", (song_id,))
+
+    def search(self, query: str, limit: int = 50) -> List[SearchResult]:
+        """Return the best matching songs, best first."""
+        words = _WORD_RE.findall(query.lower())
+        if not words:
+            return []
+        results = self._match(words, limit)
+        if not results:
+            corrected = [self._closest_term(word) for word in words]
+            if corrected != words:
+                results = self._match(corrected, limit)
+        return results
+
+    def search_progression(self, query: str, limit: int = 50) -> List[SearchResult]:
+        """
+        Return songs containing a chord progression in any key, e.g.
+        "I-V-vi-IV" or "C G Am F", most recently added first.
+
+        Common progressions are in thousands of songs, and ranking them
+        all would take as long as reading every match, so like the lyrics
+        matches of `search` they aren't scored.
+        """
+        steps = parse_progression(query)
+        if steps is None or len(steps) < 2:
+            return []
+        if len(steps) < PROGRESSION_GRAM:
+            match = '"%s"*' % _gram(steps)
+        else:
+            grams = [
+                _gram(steps[i : i + PROGRESSION_GRAM])
+                for i in range(len(steps) - PROGRESSION_GRAM + 1)
+            ]
+            match = '"%s"' % " ".join(grams)
+        rows = self.db.execute(
+            "SELECT s.id, s.artist_name, s.song_name, s.tab_url, s.type,"
+            " s.version, s.rating FROM songs s JOIN ("
+            "  SELECT rowid FROM progressions_fts WHERE progressions_fts MATCH ?"
+            "  ORDER BY rowid DESC LIMIT ?"
+            ") f ON s.id = f.rowid ORDER BY s.id DESC",
+            (match, limit),
+        ).fetchall()
+        return self._results(rows)
+
+    def _match(self, words, limit):
+        terms = " ".join('"%s"*' % word.replace('"', '""') for word in words)
+        # Artist and title matches come first, best first. Matches in the
+        # lyrics, section headers or chords follow, most recently added
+        # first, which doesn't require scoring every match of common words.
+        # Scoring is most of the cost of a common word, so only the most
+        # recently added RANKED_TITLES matches are scored
+        oldest = self.db.execute(
+            "SELECT rowid FROM titles_fts WHERE titles_fts MATCH ?"
+            " ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+            (terms, RANKED_TITLES - 1),
+        ).fetchone()
+        rows = self.db.execute(
+            "SELECT s.id, s.artist_name, s.song_name, s.tab_url, s.type,"
+            " s.version, s.rating FROM songs s JOIN ("
+            "  SELECT rowid, rank FROM titles_fts WHERE titles_fts MATCH ?"
+            "  AND rowid >= ? ORDER BY rank LIMIT ?"
+            ") f ON s.id = f.rowid ORDER BY f.rank",
+            (terms, oldest[0] if oldest else 0, limit),
+        ).fetchall()
+        if len(rows) < limit:
+            found = [row[0] for row in rows]
+            rows += self.db.execute(
+                "SELECT s.id, s.artist_name, s.song_name, s.tab_url, s.type,"
+                " s.version, s.rating FROM songs s JOIN ("
+                "  SELECT rowid FROM lyrics_fts WHERE lyrics_fts MATCH ?"
+                f"  AND rowid NOT IN ({','.join('?' * len(found))})"
+                "  ORDER BY rowid DESC LIMIT ?"
+                ") f ON s.id = f.rowid ORDER BY s.id DESC",
+                (terms, *found, limit - len(rows)),
+            ).fetchall()
+        return self._results(rows)
+
+    def _results(self, rows) -> List[SearchResult]:
+        return [
+            SearchResult(
+                {
+                    "artist_name": artist_name,
+                    "song_name": song_name,
+                    "tab_url": tab_url,
+                    "artist_url": "",
+                    "type": _type,
+                    "version": version,
+                    "votes": 0,
+                    "rating": rating or 0.0,
+                }
+            )
+            for _, artist_name, song_name, tab_url, _type, version, rating in rows
+        ]
+
+    def _closest_term(self, word: str) -> str:
+        """Return the artist or title word most similar to `word`."""
+        if len(word) < 3:
+            return word
+        trigrams = {word[i : i + 3] for i in range(len(word) - 2)}
+        match = " OR ".join('"%s"' % t.replace('"', '""') for t in trigrams)
+        candidates = [
+            row[0]
+            for row in self.db.execute(
+                "SELECT t.term FROM terms_fts JOIN terms t ON t.id = terms_fts.rowid"
+                " WHERE terms_fts MATCH ? LIMIT 200",
+                (match,),
+            )
+        ]
+        closest = difflib.get_close_matches(word, candidates, n=1, cutoff=0.7)
+        return closest[0] if closest else word
+
+
+class LibraryWriter:
+    """
+    Adds songs to the library at `path` from a thread of its own, with its
+    own connection, so that fetch workers can store the songs they fetch
+    and the main loop never waits on a write. The main loop's SongLibrary
+    sees each song once its transaction is committed, so `path` must be a
+    file rather than ":memory:".
+    """
+
+    def __init__(self, path=None):
+        self._library = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="cancionero-library",
+            initializer=self._open,
+            initargs=(path,),
+        )
+
+    def _open(self, path):
+        self._library = SongLibrary(path)
+
+    def add(self, song: SongDetail) -> Future:
+        """Add or update a song; wait on the returned Future to know it is stored."""
+        return self._executor.submit(lambda: self._library.add(song))
+
+    def _close(self):
+        if self._library is not None:
+            self._library.close()
+
+    def close(self):
+        """Finish the songs already submitted, and close the connection."""
+        self._executor.submit(self._close)
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,194 @@
+import re
+from collections import OrderedDict
+from typing import Callable, List
+
+from .ug import SearchResult, ug_search
+
+# Time to wait after the last keystroke before searching
+DEBOUNCE_MS = 300
+# Shorter queries match too much to be worth searching
+MIN_QUERY_LENGTH = 2
+# Ultimate Guitar returns at most this many results per search, Pro tabs
+# included. A shorter page is complete, so longer queries can be answered
+# from it.
+PAGE_SIZE = 50
+# Result sets kept for reuse
+CACHED_QUERIES = 64
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _timeout_add(ms, callback, *args):
+    from gi.repository import GLib
+
+    return GLib.timeout_add(ms, callback, *args)
+
+
+def _source_remove(source):
+    from gi.repository import GLib
+
+    GLib.source_remove(source)
+
+
+def normalize_query(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def matches(result: SearchResult, query: str) -> bool:
+    """Whether every word of `query` starts a word of the result's artist or title."""
+    words = _WORD_RE.findall(f"{result.artist_name} {result.song_name}".lower())
+    return all(
+        any(word.startswith(term) for word in words) for term in _WORD_RE.findall(query)
+    )
+
+
+class LiveSearch:
+    """
+    Search as the user types, while keeping network requests to a minimum:
+
+    - typing is debounced, so a search only starts once typing pauses
+    - a query already in flight isn't sent again, and a new query
+      supersedes the one in flight (through the Fetcher's "search" channel)
+    - results are kept per query, and a longer query is first answered by
+      filtering the results of a shorter one, e.g. "beatle" from "beatl".
+      The network is skipped when those results were complete.
+
+    Must be used from the main loop.
+    """
+
+    def __init__(
+        self,
+        fetcher,
+        on_results: Callable[[List[SearchResult], bool], None],
+        on_error=None,
+        on_query=None,
+        search=ug_search,
+        delay_ms: int = DEBOUNCE_MS,
+        timeout_add=_timeout_add,
+        source_remove=_source_remove,
+    ):
+        """
+        Args:
+            fetcher: the Fetcher that runs `search` off the main loop
+            on_results: called as `on_results(results, final)`, where
+              `final` is False for results filtered from an earlier search
+              while the network is asked
+            on_error: called with the exception of a failed search
+            on_query: called with each query as it is searched
+        """
+        self.fetcher = fetcher
+        self.on_results = on_results
+        self.on_error = on_error
+        self.on_query = on_query
+        self.search = search
+        self.delay_ms = delay_ms
+        self._timeout_add = timeout_add
+        self._source_remove = source_remove
+        self._timer = None
+        self._cache = OrderedDict()
+        self.query = None
+        self.in_flight = None
+
+    def changed(self, text: str):
+        """The search text changed: search once typing pauses."""
+        self._cancel_timer()
+        self._timer = self._timeout_add(self.delay_ms, self._on_timeout, text)
+
+    def activate(self, text: str):
+        """Search for `text` right away, e.g. when Enter is pressed."""
+        self._cancel_timer()
+        self.run(text)
+
+    def shown(self, text: str):
+        """The results of `text` are shown, e.g. from the history: don't search it again."""
+        self.query = normalize_query(text)
+
+    def reset(self):
+        """
+        The results are no longer shown, e.g. a song was opened: searching
+        the last query again shows them again.
+        """
+        self.query = None
+
+    def cancel(self):
+        self._cancel_timer()
+        self.fetcher.cancel("search")
+        self.in_flight = None
+
+    def run(self, text: str):
+        query = normalize_query(text)
+        if len(query) < MIN_QUERY_LENGTH or query == self.query:
+            return
+        self.query = query
+        if self.on_query is not None:
+            self.on_query(query)
+
+        cached = self._cached(query)
+        if cached is not None:
+            self.on_results(cached[0], True)
+            return
+        base = self._cached_prefix(query)
+        if base is not None:
+            base_results, complete = self._cache[base]
+            results = [result for result in base_results if matches(result, query)]
+            if complete:
+                self._store(query, results, True)
+                self.on_results(results, True)
+                return
+            self.on_results(results, False)
+
+        if query == self.in_flight:
+            return
+        self.in_flight = query
+        self.fetcher.submit(
+            "search",
+            self.search,
+            query,
+            on_done=lambda results: self._on_done(query, results),
+            on_error=self._on_error,
+        )
+
+    def _on_timeout(self, text):
+        self._timer = None
+        self.run(text)
+        return False
+
+    def _on_done(self, query, results):
+        self.in_flight = None
+        # Counted before the Pro tabs were left out
+        page_size = getattr(results, "page_size", len(results))
+        self._store(query, results, page_size < PAGE_SIZE)
+        if query == self.query:
+            self.on_results(results, True)
+
+    def _on_error(self, error):
+        self.in_flight = None
+        # Searching the same query again should retry
+        self.query = None
+        if self.on_error is not None:
+            self.on_error(error)
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._source_remove(self._timer)
+            self._timer = None
+
+    def _cached(self, query):
+        """Return the `(results, complete)` cached for `query`, or None."""
+        cached = self._cache.get(query)
+        if cached is not None:
+            self._cache.move_to_end(query)
+        return cached
+
+    def _cached_prefix(self, query):
+        """Return the longest cached query that `query` extends, if any."""
+        for length in range(len(query) - 1, MIN_QUERY_LENGTH - 1, -1):
+            if query[:length] in self._cache:
+                return query[:length]
+        return None
+
+    def _store(self, query, results, complete: bool):
+        self._cache[query] = (results, complete)
+        self._cache.move_to_end(query)
+        while len(self._cache) > CACHED_QUERIES:
+            self._cache.popitem(last=False)
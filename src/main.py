@@ -17,15 +17,29 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import time
+
+# When startup began, for the startup timings
+STARTED = time.perf_counter()
+
+import json
+import os
 import sys
+import threading
 import gi
 
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
 
 from gi.repository import Gtk, Gio, Adw
+from . import ug
+from .tracing import tracer
 from .window import CancioneroWindow
 
+# Set to 1 to print the startup timings as JSON and quit once the first
+# window is drawn, e.g. to measure startup in a headless session
+STARTUP_EXIT_ENV = 'CANCIONERO_STARTUP_EXIT'
+
 
 class CancioneroApplication(Adw.Application):
     """The main application singleton class."""
@@ -36,6 +50,8 @@ class CancioneroApplication(Adw.Application):
         self.create_action('quit', lambda *_: self.quit(), ['<primary>q'])
         self.create_action('about', self.on_about_action)
         self.create_action('preferences', self.on_preferences_action)
+        # Seconds since STARTED at each step of startup
+        self.startup_timings = {'imported': time.perf_counter() - STARTED}
 
     def do_activate(self):
         """Called when the application is activated.
@@ -45,9 +61,40 @@ class CancioneroApplication(Adw.Application):
         """
         win = self.props.active_window
         if not win:
+            self.startup_timings['activated'] = time.perf_counter() - STARTED
             win = CancioneroWindow(application=self)
+            self.startup_timings['window_created'] = time.perf_counter() - STARTED
+            win.connect('map', self.on_first_map)
         win.present()
 
+    def on_first_map(self, win):
+        """Wait for the first frame of the window to be drawn."""
+        win.disconnect_by_func(self.on_first_map)
+        clock = win.get_frame_clock()
+
+        def on_after_paint(clock):
+            clock.disconnect_by_func(on_after_paint)
+            self.on_first_frame()
+
+        clock.connect('after-paint', on_after_paint)
+
+    def on_first_frame(self):
+        """Called once the first window is on screen.
+
+        The network stack, which nothing needed so far, is loaded in the
+        background so the first search doesn't wait for it.
+        """
+        timings = self.startup_timings
+        timings['first_frame'] = time.perf_counter() - STARTED
+        for name, end in timings.items():
+            tracer.add(f'startup.{name}', STARTED, end)
+        if os.environ.get(STARTUP_EXIT_ENV):
+            print(json.dumps(timings))
+            self.quit()
+            return
+        threading.Thread(target=ug.warm_up, name='cancionero-warm-up',
+                         daemon=True).start()
+
     def on_about_action(self, widget, _):
         """Callback for the app.about action."""
         about = Adw.AboutWindow(transient_for=self.props.active_window,
@@ -0,0 +1,234 @@
+import re
+from array import array
+from typing import Iterable, Iterator, List, Optional
+
+from .ast import (
+    ASTNode,
+    LineNode,
+    ChordNode,
+    SpacerNode,
+    SectionHeaderNode,
+    CommentNode,
+    TextNode,
+)
+
+# Bump whenever the tokens produced for the same tab change, so that tokens
+# saved by an older parser are made again
+PARSER_VERSION = 1
+
+# A single pass over the tab string recognises, in order of priority:
+# - newline: starts a new line
+# - chord: [ch]C[/ch], where the chord is a root A - G, an optional sharp or
+#   flat, a quality and an optional `/bass`
+# - spacer: 2 or more whitespace characters
+# - text: anything else, up to the next chord, spacer or newline. A single
+#   space between words (or around a chord) stays part of the text.
+_TOKEN_RE = re.compile(
+    r"(?P<newline>\n)"
+    r"|\[ch\](?P<chord>[A-Ga-g](?:#|b)?[^[/\n]*(?:/[^[/\n]+)?)\[/ch\]"
+    r"|(?P<spacer>[^\S\n]{2,})"
+    r"|(?P<text>[^\n][^\s\[]*(?:(?:\[(?!ch\])|[^\S\n](?![^\S\n]))[^\s\[]*)*)"
+)
+
+# A text run made up only of [Section headers] and (comments), e.g.
+# `[Verse](all verses follow same progression)`
+_MARKUP_SEQUENCE_RE = re.compile(r"(?:\[[^\]\n]*\]|\([^)\n]*\))+")
+_MARKUP_RE = re.compile(r"\[[^\]\n]*\]|\([^)\n]*\)")
+
+
+def parse_tab(tab: str) -> ASTNode:
+    """
+    Parse a tab string into an abstract syntax tree of LineNodes.
+
+    Whitespace at the end of a line is dropped, all other whitespace is kept
+    either inside a TextNode or as a SpacerNode, so rendering the tree
+    reproduces the original column alignment of chords over lyrics.
+    """
+    tab = tab.replace("\r", "")
+    root = ASTNode()
+    _scan(tab, root.children)
+    return root
+
+
+def iter_parse(chunks: Iterable[str]) -> Iterator[LineNode]:
+    """
+    Parse a tab arriving in pieces, e.g. read from a large file, yielding
+    each LineNode as soon as its line is complete.
+
+    The lines are the same as those of `parse_tab("".join(chunks))`, but
+    the tab and its tree never need to be held in memory at once.
+    """
+    pending = ""
+    for chunk in chunks:
+        chunk = chunk.replace("\r", "")
+        cut = chunk.rfind("\n")
+        if cut < 0:
+            pending += chunk
+            continue
+        yield from _iter_lines(pending + chunk[:cut])
+        pending = chunk[cut + 1 :]
+    yield from _iter_lines(pending)
+
+
+def parse_line(line: str) -> LineNode:
+    """Parse a single line of a tab."""
+    if "\n" in line:
+        raise ValueError("parse_line() takes a single line")
+    return next(_iter_lines(line.replace("\r", "")))
+
+
+def reparse_lines(root: ASTNode, start: int, stop: int, text: str) -> List[LineNode]:
+    """
+    Replace lines `start` to `stop` (exclusive) of a parsed tab with the
+    lines of `text`, after an edit, without parsing the rest of the tab
+    again. `text` may hold more or fewer lines than it replaces.
+
+    Returns the new LineNodes.
+    """
+    lines = list(_iter_lines(text.replace("\r", "")))
+    root.children[start:stop] = lines
+    return lines
+
+
+def _iter_lines(tab: str) -> Iterator[LineNode]:
+    """Yield a LineNode for every line of `tab`, which has no carriage returns."""
+    return iter(_scan(tab, []))
+
+
+# Kinds of the tokens of `tokenize`
+NEWLINE, SPACER, TEXT, CHORD, SECTION_HEADER, COMMENT = range(6)
+
+# Node types by token kind, but for NEWLINE and SPACER
+_NODE_TYPES = (None, None, TextNode, ChordNode, SectionHeaderNode, CommentNode)
+
+
+def tokenize(tab: str):
+    """
+    Split a tab into a flat stream of tokens, without building a tree.
+
+    Returns the tab without carriage returns and an `array("I")` of
+    `kind, start, end` triples of offsets into it, e.g. `CHORD, 4, 5` for
+    the `C` of `[ch]C[/ch]`. Lines end with a NEWLINE token, and there is a
+    token for every node of the tree `build_tree` makes of them: a SPACER
+    stands for `end - start` spaces, whatever whitespace it covers.
+    """
+    tab = tab.replace("\r", "")
+    return tab, _scan(tab)
+
+
+def _scan(tab: str, lines: Optional[List[LineNode]] = None):
+    """
+    Return the tokens of `tab`, which has no carriage returns, or given
+    `lines`, append a LineNode for every line of `tab` to it and return it.
+
+    The nodes are made as the tab is scanned: building them from the tokens
+    afterwards would take a second pass, about half as long as the scan.
+    """
+    tokens = array("I")
+    add = tokens.extend
+    if lines is not None:
+        line = LineNode()
+        add_node = line.children.append
+    end = len(tab)
+    for match in _TOKEN_RE.finditer(tab):
+        # Groups by number: newline, chord, spacer, text
+        group = match.lastindex
+        if group == 1:
+            if lines is None:
+                start = match.start()
+                add((NEWLINE, start, start + 1))
+            else:
+                lines.append(line)
+                line = LineNode()
+                add_node = line.children.append
+        elif group == 2:
+            if lines is None:
+                add((CHORD, *match.span(2)))
+            else:
+                add_node(ChordNode(match.group(2)))
+        else:
+            start, stop = match.span()
+            at_line_end = stop == end or tab[stop] == "\n"
+            if group == 3:
+                if at_line_end:
+                    continue
+                if lines is None:
+                    add((SPACER, start, stop))
+                else:
+                    add_node(SpacerNode(stop - start))
+                continue
+            if at_line_end:
+                while stop > start and tab[stop - 1].isspace():
+                    stop -= 1
+                if stop == start:
+                    continue
+            first = tab[start]
+            if first == "[" or first == "(" or first.isspace():
+                for kind, start, stop in _text_run(tab, start, stop):
+                    if lines is None:
+                        add((kind, start, stop))
+                    elif kind == SPACER:
+                        add_node(SpacerNode(stop - start))
+                    else:
+                        add_node(_NODE_TYPES[kind](tab[start:stop]))
+            elif lines is None:
+                add((TEXT, start, stop))
+            else:
+                add_node(TextNode(tab[start:stop]))
+    if lines is None:
+        add((NEWLINE, end, end))
+        return tokens
+    lines.append(line)
+    return lines
+
+
+def _text_run(tab: str, start: int, stop: int):
+    """Return the tokens of a text run, splitting out section headers and comments."""
+    text = tab[start:stop]
+    stripped = text.strip()
+    if (
+        not stripped
+        or stripped[0] not in "[("
+        or not _MARKUP_SEQUENCE_RE.fullmatch(stripped)
+    ):
+        return [(TEXT, start, stop)]
+    leading = len(text) - len(text.lstrip())
+    trailing = len(text) - leading - len(stripped)
+    tokens = []
+    if leading:
+        tokens.append((SPACER, start, start + leading))
+    offset = start + leading
+    for markup in _MARKUP_RE.finditer(stripped):
+        kind = SECTION_HEADER if markup.group()[0] == "[" else COMMENT
+        tokens.append((kind, offset + markup.start(), offset + markup.end()))
+    if trailing:
+        tokens.append((SPACER, stop - trailing, stop))
+    return tokens
+
+
+def build_tree(tab: str, tokens) -> ASTNode:
+    """Build the syntax tree of a tab from the tokens of `tokenize`."""
+    root = ASTNode()
+    lines = root.children
+    line = LineNode()
+    add = line.children.append
+    triples = iter(tokens)
+    for kind, start, end in zip(triples, triples, triples):
+        if kind == SPACER:
+            add(SpacerNode(end - start))
+        elif kind != NEWLINE:
+            add(_NODE_TYPES[kind](tab[start:end]))
+        else:
+            lines.append(line)
+            line = LineNode()
+            add = line.children.append
+    return root
+
+
+def token_texts(tab: str, tokens, kind: int) -> List[str]:
+    """Return the text of every token of `kind`, e.g. the chords of a tab."""
+    return [
+        tab[tokens[i + 1] : tokens[i + 2]]
+        for i in range(0, len(tokens), 3)
+        if tokens[i] == kind
+    ]
@@ -0,0 +1,167 @@
+"""Batch parsing of saved js-store pages over every core.
+
+Reads js-store JSON, from a directory of `.json` files or a JSONL file with
+one page per line, and writes one JSON line per page: the parsed tab as
+tokens, its chords and the number of shapes of each, or the error that
+stopped it.
+
+Run with: python -m src.pipeline INPUT OUTPUT [--workers N] [--chunk-size N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from .parser import CHORD, COMMENT, NEWLINE, SECTION_HEADER, SPACER, TEXT, token_texts
+from .ug import SongDetail, get_chords
+
+# Pages sent to a worker at once
+CHUNK_SIZE = 64
+# Chunks queued per worker, which bounds the memory used by pages and
+# results in flight however large the corpus is
+CHUNKS_PER_WORKER = 2
+
+
+def iter_pages(source) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Yield `(name, text)` for every page of `source`, lazily. Pages in a
+    directory are yielded as `(path, None)`, and read by the worker that
+    parses them.
+    """
+    source = Path(source)
+    if source.is_dir():
+        with os.scandir(source) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    yield entry.path, None
+        return
+    with open(source, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                yield f"{source.name}:{number}", line
+
+
+# Names of the token kinds in the output
+_KIND_NAMES = {
+    TEXT: "text",
+    CHORD: "chord",
+    SECTION_HEADER: "header",
+    COMMENT: "comment",
+}
+
+
+def token_lines(tab: str, tokens) -> list:
+    """Return the tokens of `tokenize` as `[kind, value]` lists, per line."""
+    lines = []
+    line = []
+    triples = iter(tokens)
+    for kind, start, end in zip(triples, triples, triples):
+        if kind == NEWLINE:
+            lines.append(line)
+            line = []
+        elif kind == SPACER:
+            line.append(["spacer", end - start])
+        else:
+            line.append([_KIND_NAMES[kind], tab[start:end]])
+    return lines
+
+
+def process_page(name: str, text: Optional[str] = None) -> dict:
+    """Parse one page, read from the file `name` when `text` is None."""
+    try:
+        if text is None:
+            with open(name, encoding="utf-8") as f:
+                text = f.read()
+        song = SongDetail(json.loads(text))
+        tab, tokens = song.tokens
+        shapes, _ = get_chords(song)
+        chords = dict.fromkeys(token_texts(tab, tokens, CHORD))
+        return {
+            "name": name,
+            "tab_url": song.tab_url,
+            "tokens": token_lines(tab, tokens),
+            "chords": list(chords),
+            "shapes": {chord: len(variants) for chord, variants in shapes.items()},
+        }
+    except Exception as error:
+        return {"name": name, "error": f"{type(error).__name__}: {error}"}
+
+
+def _process_chunk(chunk):
+    """Parse a chunk of pages in a worker, and encode the results there too."""
+    lines = []
+    errors = 0
+    for name, text in chunk:
+        result = process_page(name, text)
+        errors += "error" in result
+        lines.append(json.dumps(result, ensure_ascii=False, separators=(",", ":")))
+    return "\n".join(lines) + "\n", len(chunk), errors
+
+
+def run_pipeline(pages, out, workers: int = None, chunk_size: int = CHUNK_SIZE):
+    """
+    Parse `pages`, as yielded by `iter_pages`, across `workers` processes,
+    writing each chunk of results to the text file `out` as soon as it is
+    done, in completion order. Returns the number of pages and of errors.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * CHUNKS_PER_WORKER
+    pages = iter(pages)
+    total = errors = 0
+
+    def write(futures):
+        nonlocal total, errors
+        for future in futures:
+            text, count, failed = future.result()
+            out.write(text)
+            total += count
+            errors += failed
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        while True:
+            chunk = list(islice(pages, chunk_size))
+            if not chunk:
+                break
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                write(done)
+            pending.add(executor.submit(_process_chunk, chunk))
+        write(wait(pending).done)
+    return total, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", type=Path, help="a directory of .json files, or a JSONL file")
+    parser.add_argument("output", type=Path, help="the JSONL file to write, - for stdout")
+    parser.add_argument("--workers", type=int, default=None, help="default: one per core")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if str(args.output) == "-":
+        total, errors = run_pipeline(
+            iter_pages(args.input), sys.stdout, args.workers, args.chunk_size
+        )
+    else:
+        with open(args.output, "w", encoding="utf-8") as out:
+            total, errors = run_pipeline(
+                iter_pages(args.input), out, args.workers, args.chunk_size
+            )
+    seconds = time.perf_counter() - started
+    print(
+        f"Parsed {total} pages, {errors} errors, in {seconds:.1f} s"
+        f" ({total / max(seconds, 1e-9):.0f} pages/s)",
+        file=sys.stderr,
+    )
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+from itertools import islice
+
+from .ast import (
+    ChordNode,
+    CommentNode,
+    SectionHeaderNode,
+    SpacerNode,
+    TextNode,
+)
+
+# Lines rendered before the song is first shown, then per idle callback
+FIRST_CHUNK_LINES = 120
+CHUNK_LINES = 400
+
+
+def render_lines(lines):
+    """
+    Render LineNodes to plain text, one line per node, and a list of
+    `(tag_name, start, end)` character offsets into that text for the
+    chords, section headers and comments.
+    """
+    parts = []
+    spans = []
+    offset = 0
+    for line in lines:
+        for node in line.children:
+            kind = type(node)
+            if kind is TextNode:
+                text = node.text
+            elif kind is SpacerNode:
+                text = " " * node.length
+            elif kind is ChordNode:
+                text = node.name
+                spans.append(("chord", offset, offset + len(text)))
+            elif kind is SectionHeaderNode:
+                text = node.name
+                spans.append(("section_header", offset, offset + len(text)))
+            elif kind is CommentNode:
+                text = node.comment
+                spans.append(("comment", offset, offset + len(text)))
+            else:
+                continue
+            parts.append(text)
+            offset += len(text)
+        parts.append("\n")
+        offset += 1
+    return "".join(parts), spans
+
+
+def iter_chunks(ast, first_chunk=FIRST_CHUNK_LINES, chunk=CHUNK_LINES):
+    """Yield the rendered song in `(text, spans)` chunks of whole lines."""
+    lines = ast.children
+    yield render_lines(lines[:first_chunk])
+    for start in range(first_chunk, len(lines), chunk):
+        yield render_lines(lines[start : start + chunk])
+
+
+def iter_line_chunks(lines, first_chunk=FIRST_CHUNK_LINES, chunk=CHUNK_LINES):
+    """
+    Like `iter_chunks`, for LineNodes that are still being parsed, e.g. from
+    `parser.iter_parse`. Each chunk is rendered as soon as its lines arrive.
+    """
+    lines = iter(lines)
+    yield render_lines(islice(lines, first_chunk))
+    while True:
+        text, spans = render_lines(islice(lines, chunk))
+        if not text:
+            return
+        yield text, spans
+
+
+def append_chunk(buffer, text, spans):
+    """
+    Append a rendered chunk to a Gtk.TextBuffer and tag its spans.
+
+    Returns the buffer offset the chunk starts at.
+    """
+    base = buffer.get_char_count()
+    buffer.insert(buffer.get_end_iter(), text)
+    for tag, start, end in spans:
+        buffer.apply_tag_by_name(
+            tag,
+            buffer.get_iter_at_offset(base + start),
+            buffer.get_iter_at_offset(base + end),
+        )
+    return base
+
+
+def replace_chords(buffer, spans, names):
+    """
+    Replace the chords at `spans`, `(start, end)` offsets into the buffer,
+    with `names`, leaving the rest of the text alone.
+
+    When a chord gets longer or shorter, the spaces after it shrink or grow
+    to keep whatever follows on the line in its column. Returns the spans
+    of the new chord names.
+    """
+    text = buffer.get_text(buffer.get_start_iter(), buffer.get_end_iter(), True)
+    new_spans = []
+    shift = 0
+    for (start, end), name in zip(spans, names):
+        old = text[start:end]
+        if name == old:
+            new_spans.append((start + shift, end + shift))
+            continue
+        gap_end = end
+        while gap_end < len(text) and text[gap_end] == " ":
+            gap_end += 1
+        padding = 0
+        if gap_end < len(text) and text[gap_end] != "\n":
+            growth = len(name) - len(old)
+            # Keep at least one space before the next chord or word
+            padding = -min(growth, max(gap_end - end - 1, 0))
+
+        start += shift
+        buffer.delete(
+            buffer.get_iter_at_offset(start), buffer.get_iter_at_offset(start + len(old))
+        )
+        buffer.insert_with_tags_by_name(buffer.get_iter_at_offset(start), name, "chord")
+        end = start + len(name)
+        if padding > 0:
+            buffer.insert(buffer.get_iter_at_offset(end), " " * padding)
+        elif padding < 0:
+            buffer.delete(
+                buffer.get_iter_at_offset(end), buffer.get_iter_at_offset(end - padding)
+            )
+        new_spans.append((start, end))
+        shift += len(name) - len(old) + padding
+    return new_spans
@@ -0,0 +1,47 @@
+from typing import List
+
+from gi.repository import Gio, GObject, Gtk
+
+from .ug import SearchResult
+
+
+def result_label(result: SearchResult) -> str:
+    return f"{result.artist_name} - {result.song_name} (ver {result.version})"
+
+
+class ResultItem(GObject.Object):
+    """A SearchResult wrapped for use in a Gio.ListModel."""
+
+    __gtype_name__ = "CancioneroResultItem"
+
+    def __init__(self, result: SearchResult):
+        super().__init__()
+        self.result = result
+
+
+def make_results_store() -> Gio.ListStore:
+    return Gio.ListStore(item_type=ResultItem)
+
+
+def set_results(store: Gio.ListStore, results: List[SearchResult]):
+    """Replace the contents of `store` with `results`, in a single update."""
+    store.splice(0, store.get_n_items(), [ResultItem(result) for result in results])
+
+
+def _on_setup(factory, list_item):
+    list_item.set_child(Gtk.Label())
+
+
+def _on_bind(factory, list_item):
+    list_item.get_child().set_label(result_label(list_item.get_item().result))
+
+
+def make_results_factory() -> Gtk.ListItemFactory:
+    """
+    Create the row factory of the results list. Rows are only created for
+    the results on screen and are reused as the list scrolls.
+    """
+    factory = Gtk.SignalListItemFactory()
+    factory.connect("setup", _on_setup)
+    factory.connect("bind", _on_bind)
+    return factory
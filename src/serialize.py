@@ -0,0 +1,77 @@
+import json
+import struct
+import sys
+from array import array
+
+from .parser import PARSER_VERSION
+
+# A parsed song is stored as:
+# - a header: magic, format version, parser version, and the number of
+#   words of tokens
+# - the tokens of `parser.tokenize`, `kind, start, end` triples of offsets
+#   into the tab, which isn't stored again
+# - the chord shapes and fingerings, as JSON
+_HEADER = struct.Struct("<4sHHI")
+_MAGIC = b"CAST"
+FORMAT_VERSION = 1
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(data) -> array:
+    values = array("I")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def dumps(tokens: array, chords=None, fingerings=None) -> bytes:
+    """
+    Serialize the tokens of a tab, and optionally the chord shapes and
+    fingerings of `get_chords`, to a compact binary form.
+    """
+    shapes = [
+        [chord, [list(map(list, variant.items())) for variant in variants]]
+        for chord, variants in (chords or {}).items()
+    ]
+    extra = json.dumps([shapes, fingerings or {}], separators=(",", ":"))
+    header = _HEADER.pack(_MAGIC, FORMAT_VERSION, PARSER_VERSION, len(tokens))
+    return b"".join((header, _little_endian(tokens), extra.encode("utf-8")))
+
+
+def loads(data: bytes):
+    """
+    Rebuild the `(tokens, chords, fingerings)` serialized by `dumps`.
+
+    Raises ValueError if `data` isn't a serialized song, or was written by
+    another version of the parser or of this format.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("truncated parsed song")
+    magic, version, parser_version, n_words = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != FORMAT_VERSION:
+        raise ValueError("not a parsed song")
+    if parser_version != PARSER_VERSION:
+        raise ValueError(f"parsed by parser version {parser_version}")
+
+    view = memoryview(data)
+    start = _HEADER.size
+    end = start + 4 * n_words
+    if n_words % 3 or len(view) < end:
+        raise ValueError("truncated parsed song")
+    tokens = _from_little_endian(view[start:end])
+    try:
+        shapes, fingerings = json.loads(str(view[end:], "utf-8"))
+        chords = {
+            chord: [{fret: rows for fret, rows in variant} for variant in variants]
+            for chord, variants in shapes
+        }
+    except (ValueError, TypeError) as error:
+        raise ValueError(f"corrupt parsed song: {error}") from None
+    return tokens, chords, fingerings
@@ -0,0 +1,332 @@
+"""Songbooks: songs bundled in one file, to play them without network access.
+
+Build one from tab URLs and searches, which are fetched through ug_tabs:
+
+    python -m src.songbook export gig.songbook /tab/queen/... "let it be"
+
+and import it to search and open its songs offline:
+
+    python -m src.songbook import gig.songbook
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Optional
+from urllib.parse import urlparse
+
+from . import serialize
+from .library import SongLibrary
+from .ug import SongDetail, get_chords, ug_search, ug_tabs
+
+# A songbook is laid out as:
+# - a header: magic, format version, the number of songs and of index
+#   slots, and the offset of the index
+# - the songs, each compressed on its own so it can be read alone: the
+#   length of its JSON fields, the fields (see SongDetail.to_dict), and
+#   the tokens of the tab and the chord shapes (see serialize.dumps)
+# - the index, an open-addressing hash table of the URL paths of the songs,
+#   with the offset and compressed length of each song
+_HEADER = struct.Struct("<4sHxxIIQ")
+_MAGIC = b"CSBK"
+FORMAT_VERSION = 1
+_SLOT = struct.Struct("<QQI")
+_FIELDS_LENGTH = struct.Struct("<I")
+
+SUFFIX = ".songbook"
+
+
+def default_songbook_dir() -> Path:
+    """Return the directory the songbooks of the user are imported into."""
+    base = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(base) / "cancionero" / "songbooks"
+
+
+def _url_path(tab_url: str) -> str:
+    return urlparse(tab_url).path
+
+
+def _hash(url_path: str) -> int:
+    digest = hashlib.blake2b(url_path.encode("utf-8"), digest_size=8).digest()
+    # 0 marks an empty slot
+    return int.from_bytes(digest, "little") or 1
+
+
+def _slots_for(count: int) -> int:
+    """Return a power of two that keeps the index at most half full."""
+    slots = 8
+    while slots < 2 * count:
+        slots *= 2
+    return slots
+
+
+def _pack_song(song: SongDetail) -> bytes:
+    # Songs from ug_tab come with their chord shapes already
+    if not song.chords and song.applicature:
+        song.chords, song.fingers_for_strings = get_chords(song)
+    fields = json.dumps(song.to_dict(), separators=(",", ":")).encode("utf-8")
+    _, tokens = song.tokens
+    parsed = serialize.dumps(tokens, song.chords, song.fingers_for_strings)
+    return zlib.compress(
+        b"".join((_FIELDS_LENGTH.pack(len(fields)), fields, parsed)), 9
+    )
+
+
+def _unpack_song(data) -> SongDetail:
+    data = zlib.decompress(data)
+    (length,) = _FIELDS_LENGTH.unpack_from(data)
+    start = _FIELDS_LENGTH.size
+    song = SongDetail.from_dict(json.loads(data[start : start + length]))
+    tokens, song.chords, song.fingers_for_strings = serialize.loads(
+        data[start + length :]
+    )
+    song.set_tokens(tokens)
+    return song
+
+
+def write_songbook(path, songs) -> int:
+    """
+    Write `songs` to a songbook at `path`, replacing it atomically, and
+    return the number of songs written. A song whose URL path comes up
+    again replaces the earlier one.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(bytes(_HEADER.size))
+            # URL path -> (offset, length) of the song
+            entries = {}
+            offset = _HEADER.size
+            for song in songs:
+                record = _pack_song(song)
+                f.write(record)
+                entries[_url_path(song.tab_url)] = (offset, len(record))
+                offset += len(record)
+
+            n_slots = _slots_for(len(entries))
+            index = bytearray(n_slots * _SLOT.size)
+            mask = n_slots - 1
+            for url_path, (start, length) in entries.items():
+                key = _hash(url_path)
+                slot = key & mask
+                while _SLOT.unpack_from(index, slot * _SLOT.size)[0]:
+                    slot = (slot + 1) & mask
+                _SLOT.pack_into(index, slot * _SLOT.size, key, start, length)
+            f.write(index)
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, FORMAT_VERSION, len(entries), n_slots, offset))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return len(entries)
+
+
+class Songbook:
+    """
+    A songbook opened for reading.
+
+    The file is memory-mapped, and a song is found through the hash index
+    and decompressed on its own, so opening a song takes the same time in a
+    songbook of ten songs as in one of ten thousand, and the rest of the
+    file is never read.
+    """
+
+    def __init__(self, path):
+        """Open the songbook at `path`. Raises ValueError if it isn't one."""
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"{self.path} is empty") from None
+        try:
+            if len(self._map) < _HEADER.size:
+                raise ValueError(f"{self.path} is truncated")
+            magic, version, count, n_slots, index_offset = _HEADER.unpack_from(
+                self._map
+            )
+            if magic != _MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{self.path} is not a songbook")
+            if n_slots & (n_slots - 1) or (
+                index_offset + n_slots * _SLOT.size > len(self._map)
+            ):
+                raise ValueError(f"{self.path} has a corrupt index")
+        except ValueError:
+            self._map.close()
+            raise
+        self._count = count
+        self._n_slots = n_slots
+        self._index_offset = index_offset
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, tab_url):
+        return self._find(_url_path(tab_url)) is not None
+
+    def get(self, tab_url: str) -> Optional[SongDetail]:
+        """Return the song at `tab_url`, as a full URL or a path, or None."""
+        return self._find(_url_path(tab_url))
+
+    def __iter__(self) -> Iterator[SongDetail]:
+        """Yield every song, in the order they were written."""
+        for offset, length in sorted(self._slots()):
+            yield _unpack_song(self._map[offset : offset + length])
+
+    def _slots(self):
+        for slot in range(self._n_slots):
+            key, offset, length = _SLOT.unpack_from(
+                self._map, self._index_offset + slot * _SLOT.size
+            )
+            if key:
+                yield offset, length
+
+    def _find(self, url_path):
+        """Return the song at `url_path`, or None."""
+        key = _hash(url_path)
+        mask = self._n_slots - 1
+        slot = key & mask
+        for _ in range(self._n_slots):
+            stored, offset, length = _SLOT.unpack_from(
+                self._map, self._index_offset + slot * _SLOT.size
+            )
+            if not stored:
+                return None
+            if stored == key:
+                song = _unpack_song(self._map[offset : offset + length])
+                # Another song whose URL path has the same hash
+                if _url_path(song.tab_url) == url_path:
+                    return song
+            slot = (slot + 1) & mask
+        return None
+
+
+def open_songbooks(directory=None) -> List[Songbook]:
+    """Open every songbook in `directory`, skipping unreadable ones."""
+    if directory is None:
+        directory = default_songbook_dir()
+    songbooks = []
+    for path in sorted(Path(directory).glob(f"*{SUFFIX}")):
+        try:
+            songbooks.append(Songbook(path))
+        except (OSError, ValueError) as error:
+            print(f"Skipping songbook {path}: {error}", file=sys.stderr)
+    return songbooks
+
+
+def find_song(songbooks, tab_url: str) -> Optional[SongDetail]:
+    """Return the song at `tab_url` from the first songbook holding it."""
+    for songbook in songbooks:
+        song = songbook.get(tab_url)
+        if song is not None:
+            return song
+    return None
+
+
+def resolve(items, per_query: int = 1) -> List[str]:
+    """
+    Return the URL paths of `items`, which are tab URLs, URL paths or
+    searches. A search stands for its first `per_query` results.
+    """
+    url_paths = []
+    for item in items:
+        if item.startswith(("http://", "https://", "/")):
+            url_paths.append(_url_path(item))
+        else:
+            url_paths += [result.tab_url for result in ug_search(item)[:per_query]]
+    # Without duplicates, in order
+    return list(dict.fromkeys(url_paths))
+
+
+def export_songbook(args) -> int:
+    items = list(args.items)
+    if args.file is not None:
+        with open(args.file, encoding="utf-8") as f:
+            items += [line.strip() for line in f if line.strip()]
+    url_paths = resolve(items, args.per_query)
+    batch = ug_tabs(url_paths, max_workers=args.workers)
+    count = write_songbook(args.songbook, batch)
+    for url_path, error in batch.errors.items():
+        print(f"Could not fetch {url_path}: {error}", file=sys.stderr)
+    print(f"Wrote {count} songs to {args.songbook}")
+    return 1 if batch.errors else 0
+
+
+def import_songbook(args) -> int:
+    """Copy a songbook where the app finds it, and add its songs to the library."""
+    with Songbook(args.songbook) as songbook:
+        directory = default_songbook_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / (Path(args.songbook).stem + SUFFIX)
+        shutil.copyfile(args.songbook, target)
+        library = SongLibrary(args.library)
+        try:
+            library.add_many(songbook)
+        finally:
+            library.close()
+        print(f"Imported {len(songbook)} songs to {target}")
+    return 0
+
+
+def list_songbook(args) -> int:
+    with Songbook(args.songbook) as songbook:
+        for song in songbook:
+            print(f"{song.artist_name} - {song.song_name}\t{_url_path(song.tab_url)}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="fetch songs into a songbook")
+    export.add_argument("songbook", type=Path)
+    export.add_argument("items", nargs="*", help="tab URLs or searches")
+    export.add_argument("--file", type=Path, help="read tab URLs or searches, one per line")
+    export.add_argument(
+        "--per-query", type=int, default=1, help="results to take from each search"
+    )
+    export.add_argument("--workers", type=int, default=8)
+    export.set_defaults(run=export_songbook)
+
+    import_ = commands.add_parser("import", help="make a songbook's songs available offline")
+    import_.add_argument("songbook", type=Path)
+    import_.add_argument("--library", type=Path, help="the library to add the songs to")
+    import_.set_defaults(run=import_songbook)
+
+    list_ = commands.add_parser("list", help="list the songs of a songbook")
+    list_.add_argument("songbook", type=Path)
+    list_.set_defaults(run=list_songbook)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.run(args)
+    except (OSError, ValueError) as error:
+        print(error, file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import NamedTuple, Optional
+
+# Set to 1 to record spans, and optionally name a file to save them to on
+# exit: as a Chrome trace (chrome://tracing, Perfetto) if it ends with
+# `.trace` or `.trace.json`, as a list of spans otherwise
+TRACE_ENV = "CANCIONERO_TRACE"
+TRACE_FILE_ENV = "CANCIONERO_TRACE_FILE"
+
+
+class Span(NamedTuple):
+    name: str
+    # Seconds since the tracer was created
+    start: float
+    duration: float
+    thread: int
+    # The song, or other unit of work, the span belongs to
+    group: Optional[str]
+    args: dict
+
+
+class Tracer:
+    """
+    Records how long each stage of loading a song takes, along with
+    counts such as bytes or nodes, from any thread.
+
+    Recording is off by default, and a span then costs about as much as an
+    empty `with` block. Spans are grouped by the song they belong to, set for the
+    current thread with `group`.
+    """
+
+    def __init__(
+        self, enabled: bool = False, max_spans: int = 10000, clock=time.perf_counter
+    ):
+        self.enabled = enabled
+        self.clock = clock
+        self.origin = clock()
+        self.spans = deque(maxlen=max_spans)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def group(self, name: str):
+        """Attribute the spans recorded by this thread to `name`."""
+        previous = getattr(self._local, "group", None)
+        self._local.group = name
+        try:
+            yield
+        finally:
+            self._local.group = previous
+
+    @contextmanager
+    def span(self, name: str, **args):
+        """
+        Time the enclosed block. Yields the span's arguments, to which counts
+        can be added, or None when recording is off.
+        """
+        if not self.enabled:
+            yield None
+            return
+        start = self.clock()
+        try:
+            yield args
+        finally:
+            self.add(name, start, self.clock() - start, **args)
+
+    def add(self, name: str, start: float, duration: float, **args):
+        """Record a span timed by the caller, with `start` from `clock`."""
+        if not self.enabled:
+            return
+        span = Span(
+            name,
+            start - self.origin,
+            duration,
+            threading.get_ident(),
+            getattr(self._local, "group", None),
+            args,
+        )
+        with self._lock:
+            self.spans.append(span)
+
+    def spans_in(self, group: str):
+        with self._lock:
+            return [span for span in self.spans if span.group == group]
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+
+    def to_json(self):
+        with self._lock:
+            return [span._asdict() for span in self.spans]
+
+    def to_chrome_trace(self):
+        """Return the spans in the Chrome trace event format."""
+        pid = os.getpid()
+        with self._lock:
+            events = [
+                {
+                    "name": span.name,
+                    "cat": span.group or "cancionero",
+                    "ph": "X",
+                    "ts": span.start * 1e6,
+                    "dur": span.duration * 1e6,
+                    "pid": pid,
+                    "tid": span.thread,
+                    "args": span.args,
+                }
+                for span in self.spans
+            ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, path):
+        """Save the spans, as a Chrome trace if `path` ends in `.trace(.json)`."""
+        path = str(path)
+        if path.endswith((".trace", ".trace.json")):
+            data = self.to_chrome_trace()
+        else:
+            data = self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, default=str)
+
+
+tracer = Tracer(enabled=os.environ.get(TRACE_ENV, "") not in ("", "0"))
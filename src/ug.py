@@ -1,22 +1,76 @@
-from typing import List
-
-import requests
-from bs4 import BeautifulSoup
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING, List
 from urllib.parse import quote, urlparse
 import json
 import re
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+
+from . import serialize
+from .cache import BlobCache, DiskCache, default_cache_dir
+from .parser import build_tree, tokenize
+from .tracing import tracer
+
+# requests and bs4, with their dependencies, take longer to import than the
+# rest of the app, so they are imported on first use, after the window is up
+if TYPE_CHECKING:
+    import requests
+
+SEARCH_URL = "https://www.ultimate-guitar.com/search.php"
+TABS_URL = "https://tabs.ultimate-guitar.com/"
+
+# Decoded `js-store` payloads of search and tab pages, keyed by URL
+store_cache = DiskCache(default_cache_dir() / "store")
+
+# Parsed tabs and chord shapes, keyed by a hash of the tab and applicature
+parsed_cache = BlobCache(default_cache_dir() / "parsed")
+
+# (connect, read) timeouts in seconds
+TIMEOUT = (5, 20)
+
+_session = None
+_session_lock = threading.Lock()
 
-from .ast import (
-    ASTNode,
-    LineNode,
-    ChordNode,
-    SpacerNode,
-    SectionHeaderNode,
-    CommentNode,
-    TextNode,
-)
+
+def get_session() -> "requests.Session":
+    """
+    Return the HTTP session shared by every request to Ultimate Guitar.
+
+    Connections are kept alive and pooled per host, failed requests are
+    retried with exponential backoff, and responses are compressed with
+    gzip, or brotli when the `brotli` package is installed (requests
+    advertises whatever urllib3 can decode).
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            retries = Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",),
+            )
+            adapter = HTTPAdapter(
+                pool_connections=4, pool_maxsize=16, max_retries=retries
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def warm_up():
+    """Import the network stack and set up the session ahead of a search."""
+    get_session()
 
 
 @dataclass
@@ -44,6 +98,15 @@ class SearchResult:
         return f"{self.artist_name} - {self.song_name} (ver {self.version}) ({self._type} {self.rating}/5 - {self.votes} votes)"
 
 
+class SearchResults(list):
+    """The SearchResults of a search page, which leaves out its Pro tabs."""
+
+    def __init__(self, results=(), page_size: int = None):
+        super().__init__(results)
+        # Results on the page, Pro and untyped ones included
+        self.page_size = len(self) if page_size is None else page_size
+
+
 @dataclass
 class SongDetail:
     tab: str
@@ -54,34 +117,115 @@ class SongDetail:
     capo: str
     tuning: str
     tab_url: str
-    versions: list[SearchResult] = field(default_factory=list)
 
     def __init__(self, data):
-        if __name__ == "__main__":
-            with open("test.json", "w") as f:
-                json.dump(data, f)
-        self.tab = data["store"]["page"]["data"]["tab_view"]["wiki_tab"]["content"]
-        self.artist_name = data["store"]["page"]["data"]["tab"]["artist_name"]
-        self.song_name = data["store"]["page"]["data"]["tab"]["song_name"]
-        self.version = int(data["store"]["page"]["data"]["tab"]["version"])
-        self._type = data["store"]["page"]["data"]["tab"]["type"]
-        self.rating = int(data["store"]["page"]["data"]["tab"]["rating"])
-        self.difficulty = data["store"]["page"]["data"]["tab_view"]["ug_difficulty"]
-        self.applicature = data["store"]["page"]["data"]["tab_view"]["applicature"]
+        """
+        Keep the fields of a tab page's js-store that a song needs, so the
+        rest of the page can be freed. Versions, chord diagrams and the
+        parsed tab are worked out on first use.
+        """
+        page = data["store"]["page"]["data"]
+        tab = page["tab"]
+        view = page["tab_view"]
+        self.tab = view["wiki_tab"]["content"]
+        self.artist_name = tab["artist_name"]
+        self.song_name = tab["song_name"]
+        self.version = int(tab["version"])
+        self._type = tab["type"]
+        self.rating = int(tab["rating"])
+        self.tab_url = tab["tab_url"]
+        self.difficulty = view["ug_difficulty"]
+        self.capo = None
+        self.tuning = None
+        meta = view["meta"]
+        if isinstance(meta, dict):
+            self.capo = meta.get("capo")
+            _tuning = meta.get("tuning")
+            self.tuning = f"{_tuning['value']} ({_tuning['name']})" if _tuning else None
+        self._applicature = view["applicature"]
+        self._versions = view["versions"]
         self.chords = []
         self.fingers_for_strings = []
-        if isinstance(data["store"]["page"]["data"]["tab_view"]["meta"], dict):
-            self.capo = data["store"]["page"]["data"]["tab_view"]["meta"].get("capo")
-            _tuning = data["store"]["page"]["data"]["tab_view"]["meta"].get("tuning")
-            self.tuning = f"{_tuning['value']} ({_tuning['name']})" if _tuning else None
-        self.tab_url = data["store"]["page"]["data"]["tab"]["tab_url"]
-        self.versions = []
-        for version in data["store"]["page"]["data"]["tab_view"]["versions"]:
-            self.versions.append(SearchResult(version))
+
+    @cached_property
+    def applicature(self):
+        """
+        The chord diagrams of the song, with only the frets and fingers of
+        each variant, or None if the tab has none.
+        """
+        applicature, self._applicature = self._applicature, None
+        if applicature is None:
+            return None
+        return {
+            chord: [
+                {
+                    "frets": tuple(variant["frets"]),
+                    "fingers": tuple(variant["fingers"]),
+                }
+                for variant in variants
+            ]
+            for chord, variants in applicature.items()
+        }
+
+    @cached_property
+    def versions(self) -> List[SearchResult]:
+        versions, self._versions = self._versions, None
+        return [SearchResult(version) for version in versions]
+
+    @cached_property
+    def tokens(self):
+        """
+        The tab and its flat token stream, as returned by `tokenize`, unless
+        `parse_song` or `set_tokens` set them already. This is the parsed
+        form of the tab the song keeps: the tree of `parse_tab_to_ast` is
+        built anew on every call, for the caller to own.
+        """
+        return tokenize(self.tab)
+
+    def set_tokens(self, tokens):
+        """Use tokens of the tab made earlier, e.g. loaded with `serialize.loads`."""
+        # The offsets are into the tab without carriage returns, as tokenize makes it
+        self.tokens = self.tab.replace("\r", ""), tokens
 
     def __repr__(self):
         return f"{self.artist_name} - {self.song_name}"
 
+    def to_dict(self) -> dict:
+        """Return the fields of the song as JSON data, for `from_dict`."""
+        return {
+            "tab": self.tab,
+            "artist_name": self.artist_name,
+            "song_name": self.song_name,
+            "version": self.version,
+            "type": self._type,
+            "rating": self.rating,
+            "tab_url": self.tab_url,
+            "difficulty": self.difficulty,
+            "capo": self.capo,
+            "tuning": self.tuning,
+            "applicature": self.applicature,
+        }
+
+    @classmethod
+    def from_dict(cls, fields: dict) -> "SongDetail":
+        """Rebuild a song saved with `to_dict`. Its versions aren't kept."""
+        song = cls.__new__(cls)
+        song.tab = fields["tab"]
+        song.artist_name = fields["artist_name"]
+        song.song_name = fields["song_name"]
+        song.version = fields["version"]
+        song._type = fields["type"]
+        song.rating = fields["rating"]
+        song.tab_url = fields["tab_url"]
+        song.difficulty = fields["difficulty"]
+        song.capo = fields["capo"]
+        song.tuning = fields["tuning"]
+        song._applicature = fields["applicature"]
+        song._versions = []
+        song.chords = []
+        song.fingers_for_strings = []
+        return song
+
     def parse_tab_to_ast(self):
         """
         Parse the tab string into an abstract syntax tree to annotate:
@@ -91,108 +235,7 @@ class SongDetail:
         - Spacers: 2 or more space characters between chords
         - Text: any other text
         """
-        root = ASTNode()
-        lines = self.tab.replace("\r", "").split("\n")
-
-        for line in lines:
-            line_node = LineNode()
-            root.add_child(line_node)
-            chord_pattern = re.compile(
-                r"\[ch\](?P<chord>[A-Ga-g](#|b)?[^[/]*(?:/[^[/]+)?)\[/ch\]"
-            )
-            last_end = 0
-
-            for chord_match in chord_pattern.finditer(line):
-                if chord_match.start() > last_end:
-                    # Parse any text before the chord
-                    leading_text = line[last_end : chord_match.start()]
-                    # Find any non-space characters in the leading text, allowing one space between words
-                    non_space_pattern = re.compile(r"\s?(?:(?!\s{2,})\S+\s*)+")
-                    last_end_lt = 0
-                    for non_space_match in non_space_pattern.finditer(leading_text):
-                        # Check if match is a section header
-                        if non_space_match.group().startswith(
-                            "["
-                        ) and non_space_match.group().endswith("]"):
-                            # Add any spaces before the section header
-                            if non_space_match.start() > last_end_lt:
-                                spacer = SpacerNode(
-                                    non_space_match.start() - last_end_lt
-                                )  # Length of the spacer
-                                line_node.add_child(spacer)
-                            section_header = SectionHeaderNode(non_space_match.group())
-                            line_node.add_child(section_header)
-                            last_end_lt = non_space_match.end()
-                        # Check if match is a comment
-                        elif non_space_match.group().startswith(
-                            "("
-                        ) and non_space_match.group().endswith(")"):
-                            # Add any spaces before the comment
-                            if non_space_match.start() > last_end_lt:
-                                spacer = SpacerNode(
-                                    non_space_match.start() - last_end_lt
-                                )  # Length of the spacer
-                                line_node.add_child(spacer)
-                            comment = CommentNode(non_space_match.group())
-                            line_node.add_child(comment)
-                            last_end_lt = non_space_match.end()
-                        else:
-                            # Add any spaces before the text
-                            if non_space_match.start() > last_end_lt:
-                                spacer = SpacerNode(non_space_match.start() - last_end_lt)
-                                line_node.add_child(spacer)
-                            # Add the text node
-                            text = TextNode(non_space_match.group())
-                            line_node.add_child(text)
-                        last_end_lt = non_space_match.end()
-                    # Add any spaces before the chord
-                    if chord_match.start() > last_end + last_end_lt:
-                        spacer = SpacerNode(chord_match.start() - last_end)
-                        line_node.add_child(spacer)
-                # Add the chord node
-                chord = chord_match.group("chord")
-                chord_node = ChordNode(chord)
-                line_node.add_child(chord_node)
-                last_end = chord_match.end()
-            # Parse any text after the last chord or if there are no chords
-            if last_end < len(line):
-                trailing_text = line[last_end:]
-                # Find any non-space characters in the trailing text, allowing one space between words
-                non_space_pattern = re.compile(r"\s?(?:(?!\s{2,})\S+\s*)+")
-                last_end_tr = 0
-                for non_space_match in non_space_pattern.finditer(trailing_text):
-                    # Check if match is a section header
-                    if non_space_match.group().startswith(
-                        "["
-                    ) and non_space_match.group().endswith("]"):
-                        # Add any spaces before the section header
-                        if non_space_match.start() > last_end_tr:
-                            spacer = SpacerNode(non_space_match.start() - last_end_tr)
-                            line_node.add_child(spacer)
-                        section_header = SectionHeaderNode(non_space_match.group())
-                        line_node.add_child(section_header)
-                        last_end_tr = non_space_match.end()
-                    # Check if match is a comment
-                    elif non_space_match.group().startswith(
-                        "("
-                    ) and non_space_match.group().endswith(")"):
-                        # Add any spaces before the comment
-                        if non_space_match.start() > last_end_tr:
-                            spacer = SpacerNode(non_space_match.start() - last_end_tr)
-                            line_node.add_child(spacer)
-                        comment = CommentNode(non_space_match.group())
-                        line_node.add_child(comment)
-                        last_end_tr = non_space_match.end()
-                    else:
-                        # Add any spaces before the text
-                        if non_space_match.start() > last_end_tr:
-                            spacer = SpacerNode(non_space_match.start() - last_end_tr)
-                            line_node.add_child(spacer)
-                        # Add the text node
-                        text = TextNode(non_space_match.group())
-                        line_node.add_child(text)
-                    last_end = non_space_match.end()
-        return root
+        return build_tree(*self.tokens)
 
     def fix_tab(self):
         tab = self.tab
@@ -218,28 +261,157 @@ class SongDetail:
         self.tab = tab
 
 
-def ug_search(value: str) -> List[SearchResult]:
-    resp = requests.get(
-        f"https://www.ultimate-guitar.com/search.php?search_type=title&value={quote(value)}"
-    )
-    bs = BeautifulSoup(resp.text, "html.parser")
-    # data can be None
-    data = bs.find("div", {"class": "js-store"})
-    # KeyError
-    data = data.attrs["data-content"]
-    data = json.loads(data)
-    results = data["store"]["page"]["data"]["results"]
-    ug_results = []
-    for result in results:
-        _type = result.get("type")
-        if _type and _type != "Pro":
-            s = SearchResult(result)
-            ug_results.append(s)
-            # print(s)
-    # print(json.dumps(data, indent=4))
+def fetch_store(url: str):
+    """
+    Return the decoded `js-store` JSON of an Ultimate Guitar page, served
+    from `store_cache` when a fresh copy is available.
+
+    Expired copies are revalidated with If-None-Match/If-Modified-Since, so
+    an unchanged page only costs a 304 response.
+    """
+    with tracer.span("store_cache.get") as span:
+        entry = store_cache.get_entry(url)
+        if span is not None:
+            span["hit"] = entry is not None
+    if entry is not None and store_cache.is_fresh(entry):
+        return entry["data"]
+
+    headers = {}
+    if entry is not None:
+        if entry["meta"].get("etag"):
+            headers["If-None-Match"] = entry["meta"]["etag"]
+        if entry["meta"].get("last_modified"):
+            headers["If-Modified-Since"] = entry["meta"]["last_modified"]
+    with tracer.span("http", url=url) as span:
+        resp = get_session().get(url, headers=headers, timeout=TIMEOUT)
+        if span is not None:
+            span["status"] = resp.status_code
+            span["bytes"] = len(resp.content)
+    meta = {}
+    if resp.status_code == 304:
+        if entry is None:
+            import requests
+
+            raise requests.HTTPError(
+                f"304 Not Modified without a cached copy of {url}", response=resp
+            )
+        data = entry["data"]
+        # A 304 may leave out validators that still hold for the cached copy
+        meta.update(entry["meta"])
+    else:
+        resp.raise_for_status()
+        with tracer.span("extract_store"):
+            data = extract_store(resp.text)
+    validators = {
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+    }
+    meta.update((k, v) for k, v in validators.items() if v)
+    with tracer.span("store_cache.set"):
+        store_cache.set(url, data, **meta)
+    return data
+
+
+class _StoreTagFound(Exception):
+    pass
+
+
+class _StoreTagParser(HTMLParser):
+    """Parse a single start tag and keep its attributes if it is the js-store."""
+
+    def __init__(self):
+        super().__init__()
+        self.content = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "div" and "js-store" in (attrs.get("class") or "").split():
+            self.content = attrs.get("data-content")
+        raise _StoreTagFound
+
+
+def extract_store(html: str):
+    """
+    Return the decoded JSON in the `data-content` attribute of the page's
+    `<div class="js-store">`.
+
+    Rather than building the whole DOM, jump to each occurrence of
+    `js-store` and parse only the tag around it. BeautifulSoup is used as a
+    fallback when that fails.
+    """
+    pos = html.find("js-store")
+    while pos != -1:
+        start = html.rfind("<", 0, pos)
+        if start != -1:
+            parser = _StoreTagParser()
+            try:
+                # Feed in chunks so we stop reading right after the tag
+                for offset in range(start, len(html), 65536):
+                    parser.feed(html[offset : offset + 65536])
+            except _StoreTagFound:
+                pass
+            if parser.content is not None:
+                try:
+                    with tracer.span("json", bytes=len(parser.content)):
+                        return json.loads(parser.content)
+                except ValueError:
+                    break
+        pos = html.find("js-store", pos + len("js-store"))
+
+    from bs4 import BeautifulSoup
+
+    with tracer.span("BeautifulSoup", bytes=len(html)):
+        bs = BeautifulSoup(html, "html.parser")
+        # data can be None
+        data = bs.find("div", {"class": "js-store"})
+        # KeyError
+        data = data.attrs["data-content"]
+    with tracer.span("json", bytes=len(data)):
+        return json.loads(data)
+
+
+def ug_search(value: str) -> SearchResults:
+    with tracer.group(f"search:{value}"):
+        data = fetch_store(f"{SEARCH_URL}?search_type=title&value={quote(value)}")
+        results = data["store"]["page"]["data"]["results"]
+        ug_results = SearchResults(page_size=len(results))
+        with tracer.span("SearchResult", results=len(results)):
+            for result in results:
+                _type = result.get("type")
+                if _type and _type != "Pro":
+                    s = SearchResult(result)
+                    ug_results.append(s)
     return ug_results
 
 
+@lru_cache(maxsize=8192)
+def _chord_shape(frets: tuple, fingers: tuple):
+    """
+    Work out the fret diagram of one chord variant, shared by every song that
+    uses the same shape.
+
+    Returns the pressed strings per fret, from the lowest pressed fret up and
+    padded to at least 6 frets, and the finger per string ("x" for strings
+    that aren't fretted), both with the strings in reverse order. Returns
+    None if no string is fretted.
+    """
+    frets = frets[::-1]
+    pressed = [fret for fret in frets if fret > 0]
+    if not pressed:
+        return None
+    lowest = min(pressed)
+    highest = max(max(pressed), lowest + 5)
+    rows = [[0] * len(frets) for _ in range(highest - lowest + 1)]
+    for string, fret in enumerate(frets):
+        if fret > 0:
+            rows[fret - lowest][string] = 1
+    variants = tuple((lowest + i, tuple(row)) for i, row in enumerate(rows))
+    fingering = tuple(
+        finger if fret > 0 else "x" for fret, finger in zip(frets, fingers[::-1])
+    )
+    return variants, fingering
+
+
 def get_chords(s: SongDetail):
     if s.applicature is None:
         return dict(), dict()
@@ -249,60 +421,117 @@ def get_chords(s: SongDetail):
 
     for chord in s.applicature:
         for chord_variant in s.applicature[chord]:
-            frets = chord_variant["frets"]
-            min_fret = min(frets)
-            max_fret = max(frets)
-            possible_frets = list(range(min_fret, max_fret + 1))
-            variants_temp = {
-                possible_fret: [1 if b == possible_fret else 0 for b in frets][::-1]
-                for possible_fret in possible_frets
-                if possible_fret > 0
-            }
-
-            variants = dict()
-            found = False
-            for fret, fingers in variants_temp.items():
-                try:
-                    if not found and fingers.index(1) >= 0:
-                        found = True
-                except ValueError:
-                    ...
-
-                if found:
-                    variants[fret] = fingers
-
-            if not len(variants):
+            shape = _chord_shape(
+                tuple(chord_variant["frets"]), tuple(chord_variant["fingers"])
+            )
+            if shape is None:
                 continue
-            while len(variants) < 6:
-                variants[max(variants) + 1] = [0] * 6
-
-            variant_strings_pressed = [*variants.values()]
-            variant_strings_pressed = [sum(x) for x in zip(*variant_strings_pressed)]
-            unstrummed_strings = [int(not bool(y)) for y in variant_strings_pressed]
-
-            fingering_for_variant = []
-            for finger, x in zip(chord_variant["fingers"][::-1], unstrummed_strings):
-                fingering_for_variant.append("x" if x else finger)
-            fingering_for_variant = fingering_for_variant
-
+            variants, fingering = shape
             if chord not in chords:
                 chords[chord] = []
                 fingerings[chord] = []
-            chords[chord].append(variants)
-            fingerings[chord].append(fingering_for_variant)
+            chords[chord].append({fret: list(fingers) for fret, fingers in variants})
+            fingerings[chord].append(list(fingering))
 
     return chords, fingerings
 
 
+def parse_song(s: SongDetail):
+    """
+    Tokenize the tab and work out the chord shapes of a song into
+    `s.tokens`, `s.chords` and `s.fingers_for_strings`, or load them from
+    `parsed_cache` when the same tab and applicature were parsed before.
+    """
+    applicature = json.dumps(s.applicature, sort_keys=True, separators=(",", ":"))
+    key = hashlib.sha256(f"{s.tab}\0{applicature}".encode("utf-8")).hexdigest()
+    with tracer.span("parsed_cache.get") as span:
+        data = parsed_cache.get(key)
+        if span is not None:
+            span["bytes"] = len(data) if data is not None else 0
+        if data is not None:
+            try:
+                tokens, s.chords, s.fingers_for_strings = serialize.loads(data)
+                s.set_tokens(tokens)
+                return
+            except ValueError:
+                # Written by another parser version, or damaged
+                pass
+    with tracer.span("tokenize", bytes=len(s.tab)) as span:
+        s.tokens = tokenize(s.tab)
+        _, tokens = s.tokens
+        if span is not None:
+            span["tokens"] = len(tokens) // 3
+    with tracer.span("get_chords") as span:
+        s.chords, s.fingers_for_strings = get_chords(s)
+        if span is not None:
+            span["chords"] = len(s.chords)
+    with tracer.span("parsed_cache.set") as span:
+        data = serialize.dumps(tokens, s.chords, s.fingers_for_strings)
+        parsed_cache.set(key, data)
+        if span is not None:
+            span["bytes"] = len(data)
+
+
 def ug_tab(url_path: str):
-    resp = requests.get("https://tabs.ultimate-guitar.com/" + url_path)
-    bs = BeautifulSoup(resp.text, "html.parser")
-    # data can be None
-    data = bs.find("div", {"class": "js-store"})
-    data = data.attrs["data-content"]
-    data = json.loads(data)
-    s = SongDetail(data)
-    s.chords, s.fingers_for_strings = get_chords(s)
-    #print(json.dumps(data, indent=4))
-    print(data["store"]["page"]["data"]["tab_view"]["wiki_tab"])
+    with tracer.group(url_path), tracer.span("ug_tab"):
+        data = fetch_store(TABS_URL + url_path)
+        with tracer.span("SongDetail"):
+            s = SongDetail(data)
+        parse_song(s)
     return s
+
+
+class TabBatch:
+    """
+    Songs fetched and parsed concurrently by a bounded worker pool.
+
+    Iterating yields each SongDetail as soon as it is ready, in completion
+    order. A song that fails to load doesn't stop the batch: its exception
+    is recorded in `errors`, keyed by URL path.
+    """
+
+    def __init__(self, url_paths, max_workers: int = 8):
+        self.url_paths = list(url_paths)
+        self.max_workers = max_workers
+        self.errors = {}
+
+    def __iter__(self):
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="cancionero-batch"
+        )
+        try:
+            futures = {executor.submit(ug_tab, url): url for url in self.url_paths}
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    self.errors[futures[future]] = e
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def ug_tabs(url_paths, max_workers: int = 8) -> TabBatch:
+    """Fetch many songs at once, e.g. a whole setlist. See `TabBatch`."""
+    return TabBatch(url_paths, max_workers)
+
+
+_prefetch_executor = None
+_prefetch_lock = threading.Lock()
+
+
+def prefetch_tabs(url_paths) -> list:
+    """
+    Warm `store_cache` with the pages of `url_paths` in the background, so
+    that opening one of them later doesn't wait for the network.
+
+    Returns the futures of the fetches, which can be cancelled.
+    """
+    global _prefetch_executor
+    with _prefetch_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="cancionero-prefetch"
+            )
+    return [
+        _prefetch_executor.submit(fetch_store, TABS_URL + url) for url in url_paths
+    ]
@@ -1,18 +1,57 @@
-import re
+import os
+import time
 from typing import List
 
-from gi.repository import Adw, Gtk, Pango
+from gi.repository import Adw, Gio, GLib, Gtk, Pango
 
-from .ast import (
-    ASTNode,
-    ChordNode,
-    CommentNode,
-    LineNode,
-    SectionHeaderNode,
-    SpacerNode,
-    TextNode,
+from .autoscroll import AutoScroll
+from .chords import transpose_song
+from .fetcher import Fetcher
+from .history import History, Page, SongCache, estimate_size
+from .library import LibraryWriter, SongLibrary
+from .live_search import LiveSearch
+from .parser import CHORD, token_texts
+from .render import append_chunk, iter_chunks, replace_chords
+from .results import (
+    make_results_factory,
+    make_results_store,
+    result_label,
+    set_results,
 )
-from .ug import SearchResult, SongDetail, ug_search, ug_tab
+from .songbook import find_song, open_songbooks
+from .tracing import TRACE_FILE_ENV, tracer
+from .ug import SearchResult, SongDetail, prefetch_tabs, ug_tab
+
+APP_ID = "com.github.ravila4.Cancionero"
+
+# Number of search results whose songs are downloaded ahead of a click
+PREFETCH_COUNT = 5
+
+
+class RenderedSong:
+    """A song as shown in the window, kept to show it again as it was left."""
+
+    def __init__(self, song: SongDetail, buffer, chord_names, capo: int):
+        self.song = song
+        self.buffer = buffer
+        self.chord_names = chord_names
+        self.capo = capo
+        # Buffer offsets of the chords shown
+        self.chord_spans = []
+        self.transpose_amount = 0
+        self.capo_active = False
+        # Chunks of the song still to append, or None once it's all shown
+        self.pending_chunks = None
+        # The first line on screen
+        self.top = buffer.create_mark(None, buffer.get_start_iter(), True)
+
+
+def _load_settings():
+    """Return the app's GSettings, or None when its schema isn't installed."""
+    source = Gio.SettingsSchemaSource.get_default()
+    if source is None or source.lookup(APP_ID, True) is None:
+        return None
+    return Gio.Settings(schema_id=APP_ID)
 
 
 @Gtk.Template(resource_path="/com/github/ravila4/Cancionero/window.ui")
@@ -22,124 +61,499 @@ class CancioneroWindow(Adw.ApplicationWindow):
     back_button = Gtk.Template.Child()
     forward_button = Gtk.Template.Child()
     search_entry = Gtk.Template.Child()
-    results_listbox = Gtk.Template.Child()
+    results_listview = Gtk.Template.Child()
     content_stack = Gtk.Template.Child()
     song_detail_textview = Gtk.Template.Child()
+    fetch_spinner = Gtk.Template.Child()
+    toast_overlay = Gtk.Template.Child()
+    transpose_box = Gtk.Template.Child()
+    capo_button = Gtk.Template.Child()
+    transpose_down_button = Gtk.Template.Child()
+    transpose_label = Gtk.Template.Child()
+    transpose_up_button = Gtk.Template.Child()
+    trace_label = Gtk.Template.Child()
+    autoscroll_button = Gtk.Template.Child()
+    scroll_speed_spin = Gtk.Template.Child()
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        # Network calls run on worker threads so the main loop never blocks
+        self.fetcher = Fetcher(on_progress=self.on_fetch_progress)
+        self.prefetches = []
+        # Whether to prefetch the songs of the next final results
+        self.prefetch_on_results = False
+        self.live_search = LiveSearch(
+            self.fetcher,
+            on_results=self.on_search_results,
+            on_error=self.on_fetch_error,
+            on_query=self.on_search_query,
+        )
+        # Every song opened is kept for offline search. Songs are added
+        # from the fetch workers, through a connection of their own
+        self.library = SongLibrary()
+        self.library_writer = LibraryWriter(self.library.path)
+        # Songs imported for offline use, opened before going to the network
+        self.songbooks = open_songbooks()
+        # Rows hold their SearchResult, and are only created for the
+        # results on screen
+        self.results_store = make_results_store()
+        self.results_listview.set_model(Gtk.NoSelection(model=self.results_store))
+        self.results_listview.set_factory(make_results_factory())
+        self.render_source = None
+        self.pending_chunks = None
+        # Buffer offsets of the chords shown, and their names in the tab
+        self.chord_spans = []
+        self.chord_names = []
+        self.transpose_amount = 0
+        self.capo = 0
+        # The song being shown, as passed to ug_tab, and when it was asked for
+        self.current_url = None
+        # Pages shown, and the songs among them ready to be shown again
+        # without fetching, parsing or rendering them
+        self.history = History()
+        self.song_cache = SongCache()
+        self.requested_at = 0.0
+        self.render_started = 0.0
+        # Timings are recorded when CANCIONERO_TRACE or the setting is on
+        self.trace_from_env = tracer.enabled
+        self.settings = _load_settings()
+        if self.settings is not None:
+            self.settings.connect(
+                "changed::trace-timings", self.on_trace_setting_changed
+            )
+            self.on_trace_setting_changed(self.settings, "trace-timings")
+        self.connect("close-request", self.on_close_request)
         self.search_entry.connect("activate", self.on_search_entry_activate)
-        self.results_listbox.connect("row-activated", self.on_result_clicked)
+        self.search_changed_handler = self.search_entry.connect(
+            "changed", self.on_search_entry_changed
+        )
+        self.results_listview.connect("activate", self.on_result_clicked)
         self.back_button.connect("clicked", self.on_back_button_clicked)
         self.forward_button.connect("clicked", self.on_forward_button_clicked)
+        self.transpose_down_button.connect("clicked", self.on_transpose_clicked, -1)
+        self.transpose_up_button.connect("clicked", self.on_transpose_clicked, 1)
+        self.capo_handler = self.capo_button.connect("toggled", self.on_capo_toggled)
+        self.autoscroll_button.connect("toggled", self.on_autoscroll_toggled)
+        self.scroll_speed_spin.connect("value-changed", self.on_scroll_speed_changed)
+        self.autoscroll = None
+        self.scroll_tick = None
+        # Scroll value set by the last frame, to notice the user scrolling
+        self.autoscroll_y = 0.0
+        self.autoscroll_started = 0.0
 
         self.buffer = self.song_detail_textview.get_buffer()
         # Tags for the text view
         self.chord_tag = self.buffer.create_tag(
             "chord", foreground="blue", weight=Pango.Weight.BOLD
         )
-        self.hidden_tag = self.buffer.create_tag("hidden", invisible=True)
         self.section_header_tag = self.buffer.create_tag(
             "section_header", foreground="gray"
         )
         self.comment_tag = self.buffer.create_tag("comment", foreground="gray")
+        # Every song gets its own buffer, sharing these tags
+        self.tag_table = self.buffer.get_tag_table()
+
+    def on_search_entry_changed(self, entry):
+        self.live_search.changed(entry.get_text())
 
     def on_search_entry_activate(self, widget):
-        search_query = self.search_entry.get_text()
-        self.search_songs(search_query)
+        # Pressing Enter shows intent to pick a result, so download the
+        # top ones ahead of a click
+        self.prefetch_on_results = True
+        self.live_search.activate(self.search_entry.get_text())
+        if self.live_search.in_flight is None:
+            self.prefetch_results()
+
+    def set_search_text(self, text: str):
+        """Show `text` in the search entry without searching for it."""
+        with self.search_entry.handler_block(self.search_changed_handler):
+            self.search_entry.set_text(text)
 
-    def search_songs(self, query):
-        # TODO: Rather than store the results to in the class instance, we could implement a disk cache
+    def on_search_query(self, query: str):
+        self.leave_song()
         self.content_stack.set_visible_child_name("search_results")
-        self.results = ug_search(query)
-        self.display_results(self.results)
+        self.transpose_box.set_visible(False)
+        # Show songs from the library right away, the online results
+        # replace them when they arrive
+        results = self.library.search(query)
+        self.visit_results(Page(None, query, tuple(results)))
+        self.display_results(results)
+        # A new search supersedes any song that was still loading
+        self.fetcher.cancel("song")
+
+    def on_search_results(self, results: List[SearchResult], final: bool):
+        page = self.history.current
+        if page is not None and page.url is None:
+            self.history.replace(page._replace(results=tuple(results)))
+        self.display_results(results)
+        if final and self.prefetch_on_results:
+            self.prefetch_results()
+
+    def prefetch_results(self):
+        self.prefetch_on_results = False
+        for future in self.prefetches:
+            future.cancel()
+        count = min(self.results_store.get_n_items(), PREFETCH_COUNT)
+        self.prefetches = prefetch_tabs(
+            [self.results_store.get_item(i).result.tab_url for i in range(count)]
+        )
 
     def display_results(self, results: List[SearchResult]):
-        self.results_listbox.remove_all()  # Clear the list box
-        for result in results:
-            row = Gtk.ListBoxRow()
-            label = Gtk.Label(
-                label=f"{result.artist_name} - {result.song_name} (ver {result.version})"
-            )
-            row.set_child(label)
-            row.connect("activate", self.on_result_clicked, result)
-            self.results_listbox.append(row)
-            self.back_button.set_sensitive(False)
-            self.forward_button.set_sensitive(False)
-
-    def get_url_from_label(self, label: str):
-        # TODO: We probably want to retrieve the url from a cache
-        for result in self.results:
-            if (
-                label
-                == f"{result.artist_name} - {result.song_name} (ver {result.version})"
-            ):
-                return result.tab_url
-
-    def on_result_clicked(self, listbox, row):
-        self.current_result = row.get_child().get_label()
+        set_results(self.results_store, results)
+        self.update_navigation()
+
+    def visit_results(self, page: Page):
+        """Show search results, refining the results page being shown if any."""
+        current = self.history.current
+        if current is not None and current.url is None:
+            self.history.replace(page)
+        else:
+            self.history.visit(page)
+
+    def update_navigation(self):
+        self.back_button.set_sensitive(self.history.can_go_back)
+        self.forward_button.set_sensitive(self.history.can_go_forward)
+
+    def on_result_clicked(self, listview, position: int):
+        result = self.results_store.get_item(position).result
+        label = result_label(result)
+        self.open_song(result.tab_url, label, visit=True)
+
+    def open_song(self, url: str, label: str, visit: bool = False):
+        """
+        Show a song, from the songs shown recently if it's one of them.
+
+        With `visit`, the song is added to the history once it's shown, so a
+        song that could not be fetched is never in it.
+        """
+        self.leave_song()
+        self.live_search.reset()
+        self.current_url = url
+        self.requested_at = tracer.clock()
         # TODO: Set the text in a title label instead, and hide the search bar.
         # add a search button to switch back and forth.
-        self.search_entry.set_text(self.current_result)
-        song_url = self.get_url_from_label(self.current_result)
-        song_detail = ug_tab(song_url)
-        self.display_song_detail(song_detail)
+        self.set_search_text(label)
+        self.update_navigation()
+        rendered = self.song_cache.get(url)
+        if rendered is not None:
+            self.fetcher.cancel("song")
+            self.visit_song(url, label, visit)
+            self.show_rendered(rendered)
+            return
+        song = find_song(self.songbooks, url)
+        if song is not None:
+            self.fetcher.cancel("song")
+            self.library_writer.add(song)
+            self.visit_song(url, label, visit)
+            self.display_song_detail(song)
+            return
 
-    def display_song_detail(self, song_detail: SongDetail):
-        # clear buffer
-        self.buffer.set_text("")
-        # parse the tab into a syntax tree
-        ast = song_detail.parse_tab_to_ast()
-        self.apply_formatting_from_ast(self.buffer, ast)
+        def on_done(result):
+            song_detail, ast = result
+            self.visit_song(url, label, visit)
+            self.display_song_detail(song_detail, ast)
+
+        self.fetcher.submit(
+            "song",
+            self.fetch_song,
+            url,
+            on_done=on_done,
+            on_error=self.on_fetch_error,
+        )
+
+    def visit_song(self, url: str, label: str, visit: bool):
+        if visit:
+            self.history.visit(Page(url, label))
+
+    def fetch_song(self, url: str):
+        """
+        Fetch and parse a song and store it in the library, on a fetch worker.
+        Returns the song and its syntax tree, for `display_song_detail`.
+        """
+        song = ug_tab(url)
+        with tracer.group(url):
+            with tracer.span("library.add"):
+                self.library_writer.add(song).result()
+            with tracer.span("parse_tab_to_ast"):
+                ast = song.parse_tab_to_ast()
+        return song, ast
+
+    def on_fetch_progress(self, pending: int):
+        self.fetch_spinner.set_visible(pending > 0)
+        self.fetch_spinner.set_spinning(pending > 0)
+
+    def on_fetch_error(self, error: Exception):
+        self.toast_overlay.add_toast(Adw.Toast(title=f"Could not reach Ultimate Guitar: {error}"))
+
+    def on_close_request(self, window):
+        self.live_search.cancel()
+        self.fetcher.shutdown()
+        for future in self.prefetches:
+            future.cancel()
+        self.library_writer.close()
+        self.library.close()
+        for songbook in self.songbooks:
+            songbook.close()
+        if os.environ.get(TRACE_FILE_ENV):
+            tracer.save(os.environ[TRACE_FILE_ENV])
+        return False
 
+    def on_trace_setting_changed(self, settings, key):
+        tracer.enabled = self.trace_from_env or settings.get_boolean(key)
+        self.update_trace_overlay()
+
+    def display_song_detail(self, song_detail: SongDetail, ast=None):
+        # The tab is usually tokenized and parsed, and the song stored in the
+        # library, by fetch_song, on a worker thread
+        if ast is None:
+            ast = song_detail.parse_tab_to_ast()
+        tab, tokens = song_detail.tokens
+        try:
+            capo = int(getattr(song_detail, "capo", None) or 0)
+        except ValueError:
+            capo = 0
+        # Each song starts in its written key
+        rendered = RenderedSong(
+            song_detail,
+            Gtk.TextBuffer(tag_table=self.tag_table),
+            token_texts(tab, tokens, CHORD),
+            capo,
+        )
+        self.song_cache.put(self.current_url, rendered, estimate_size(song_detail))
+        self.show_rendered(rendered)
+        self.render_song(ast)
+
+    def show_rendered(self, rendered: RenderedSong):
+        """
+        Show a song's buffer, in the key and at the line it was left at, and
+        carry on appending its chunks if it was left before they all were.
+        """
+        self.stop_render()
+        self.autoscroll_button.set_active(False)
+        self.buffer = rendered.buffer
+        self.song_detail_textview.set_buffer(rendered.buffer)
+        self.chord_spans = rendered.chord_spans
+        self.chord_names = rendered.chord_names
+        self.transpose_amount = amount = rendered.transpose_amount
+        self.transpose_label.set_label(f"+{amount}" if amount > 0 else str(amount))
+        self.capo = rendered.capo
+        with self.capo_button.handler_block(self.capo_handler):
+            self.capo_button.set_active(rendered.capo_active)
+        self.capo_button.set_sensitive(self.capo > 0)
+        self.song_detail_textview.scroll_to_mark(rendered.top, 0, True, 0, 0)
+        self.pending_chunks = rendered.pending_chunks
+        if self.pending_chunks is not None:
+            self.render_started = tracer.clock()
+            self.render_source = GLib.idle_add(self.on_render_idle)
+        self.update_trace_overlay()
         self.content_stack.set_visible_child_name("song_detail")
-        self.back_button.set_sensitive(
-            True
-        )  # Enable back button when viewing song details
-        self.forward_button.set_sensitive(
-            False
-        )  # Disable forward button when on song details
-
-    def apply_formatting_from_ast(self, buffer, ast):
-        def apply_formatting(node, start_iter):
-            if isinstance(node, TextNode):
-                buffer.insert(start_iter, node.text)
-            elif isinstance(node, ChordNode):
-                buffer.insert_with_tags_by_name(start_iter, "[ch]", "hidden")
-                chord_start_iter = buffer.get_end_iter()
-                buffer.insert_with_tags(chord_start_iter, node.name, self.chord_tag)
-                buffer.insert_with_tags_by_name(
-                    buffer.get_end_iter(), "[/ch]", "hidden"
+        self.transpose_box.set_visible(True)
+        self.update_navigation()
+
+    def leave_song(self):
+        """Keep the state of the song being shown, to show it again as it was."""
+        self.autoscroll_button.set_active(False)
+        rendered = self.song_cache.get(self.current_url) if self.current_url else None
+        if rendered is None or rendered.buffer is not self.buffer:
+            return
+        # The rest of the song is appended when it's shown again
+        self.stop_render()
+        rendered.pending_chunks = self.pending_chunks
+        rendered.chord_spans = self.chord_spans
+        rendered.transpose_amount = self.transpose_amount
+        rendered.capo_active = self.capo_button.get_active()
+        view = self.song_detail_textview
+        found, top = view.get_iter_at_location(0, int(view.get_vadjustment().get_value()))
+        if found:
+            self.buffer.move_mark(rendered.top, top)
+
+    def render_song(self, ast):
+        """
+        Show the first screenful of the song right away and append the rest
+        from an idle callback, so long tabs don't hold up the main loop.
+        """
+        self.stop_render()
+        self.buffer.set_text("")
+        self.chord_spans = []
+        self.render_started = tracer.clock()
+        self.pending_chunks = iter_chunks(ast)
+        self.render_next_chunk()
+        self.render_source = GLib.idle_add(self.on_render_idle)
+
+    def render_next_chunk(self) -> bool:
+        """Append the next chunk of the song, or return False if it's all shown."""
+        if self.pending_chunks is None:
+            return False
+        with tracer.group(self.current_url):
+            start = tracer.clock()
+            chunk = next(self.pending_chunks, None)
+            if chunk is None:
+                self.pending_chunks = None
+                tracer.add(
+                    "render",
+                    self.render_started,
+                    start - self.render_started,
+                    chars=self.buffer.get_char_count(),
+                )
+                return False
+            text, spans = chunk
+            tracer.add(
+                "render_lines",
+                start,
+                tracer.clock() - start,
+                chars=len(text),
+                tags=len(spans),
+            )
+            with tracer.span("append_chunk", chars=len(text)):
+                base = append_chunk(self.buffer, text, spans)
+        self.chord_spans.extend(
+            (base + start, base + end) for tag, start, end in spans if tag == "chord"
+        )
+        return True
+
+    def on_render_idle(self):
+        if self.render_next_chunk():
+            return GLib.SOURCE_CONTINUE
+        self.render_source = None
+        self.update_trace_overlay()
+        return GLib.SOURCE_REMOVE
+
+    def update_trace_overlay(self):
+        """Show the timings of the current song's stages, when recording them."""
+        if not tracer.enabled or self.current_url is None:
+            self.trace_label.set_visible(False)
+            return
+        origin = self.requested_at - tracer.origin
+        spans = [s for s in tracer.spans_in(self.current_url) if s.start >= origin]
+        lines = []
+        for span in sorted(spans, key=lambda span: span.start):
+            counts = " ".join(f"{k}={v}" for k, v in span.args.items() if k != "url")
+            lines.append(f"{span.name:<18}{span.duration * 1000:>9.2f} ms  {counts}")
+        self.trace_label.set_label("\n".join(lines))
+        self.trace_label.set_visible(bool(lines))
+
+    def stop_render(self):
+        """Stop appending chunks from the idle callback, e.g. to leave the song."""
+        if self.render_source is not None:
+            GLib.source_remove(self.render_source)
+            self.render_source = None
+
+    def finish_render(self):
+        """Append the rest of the song now, for code that needs all of it."""
+        self.stop_render()
+        while self.render_next_chunk():
+            pass
+
+    def on_transpose_clicked(self, button, step):
+        self.transpose_amount = max(-11, min(11, self.transpose_amount + step))
+        amount = self.transpose_amount
+        self.transpose_label.set_label(f"+{amount}" if amount > 0 else str(amount))
+        self.update_transposition()
+
+    def on_capo_toggled(self, button):
+        self.update_transposition()
+
+    def update_transposition(self):
+        """Rewrite only the chords in the buffer for the current key."""
+        # Every chord is rewritten, so every chord must be in the buffer
+        self.finish_render()
+        amount = self.transpose_amount
+        if self.capo_button.get_active():
+            amount += self.capo
+        names = transpose_song(self.chord_names, amount)
+        self.chord_spans = replace_chords(self.buffer, self.chord_spans, names)
+
+    def line_offsets(self):
+        """
+        Return the top of every line of the song in buffer coordinates,
+        followed by the bottom of the last line.
+        """
+        offsets = []
+        it = self.buffer.get_start_iter()
+        while True:
+            y, height = self.song_detail_textview.get_line_yrange(it)
+            offsets.append(y)
+            if not it.forward_line():
+                break
+        offsets.append(y + height)
+        return offsets
+
+    def on_autoscroll_toggled(self, button):
+        if not button.get_active():
+            self.stop_autoscroll()
+            return
+        # Scrolling needs the offset of every line
+        self.finish_render()
+        self.autoscroll = AutoScroll(
+            self.line_offsets(), self.scroll_speed_spin.get_value()
+        )
+        self.autoscroll_y = self.song_detail_textview.get_vadjustment().get_value()
+        self.autoscroll.start(self.autoscroll_y)
+        self.autoscroll_started = tracer.clock()
+        self.scroll_tick = self.song_detail_textview.add_tick_callback(
+            self.on_scroll_tick
+        )
+
+    def on_scroll_speed_changed(self, spin):
+        if self.autoscroll is not None:
+            self.autoscroll.set_rate(spin.get_value())
+
+    def on_scroll_tick(self, view, frame_clock):
+        started = time.perf_counter()
+        adjustment = view.get_vadjustment()
+        value = adjustment.get_value()
+        if abs(value - self.autoscroll_y) > 1:
+            # The user scrolled, carry on from there
+            self.autoscroll.start(value)
+        y = self.autoscroll.advance(frame_clock.get_frame_time())
+        adjustment.set_value(y)
+        self.autoscroll_y = adjustment.get_value()
+        self.autoscroll.record_frame(time.perf_counter() - started)
+        if self.autoscroll.finished or self.autoscroll_y < y - 0.5:
+            # Reached the end of the song
+            self.scroll_tick = None
+            self.autoscroll_button.set_active(False)
+            return GLib.SOURCE_REMOVE
+        return GLib.SOURCE_CONTINUE
+
+    def stop_autoscroll(self):
+        if self.scroll_tick is not None:
+            self.song_detail_textview.remove_tick_callback(self.scroll_tick)
+            self.scroll_tick = None
+        if self.autoscroll is not None and self.autoscroll.frames:
+            median, worst, over = self.autoscroll.frame_stats()
+            with tracer.group(self.current_url):
+                tracer.add(
+                    "autoscroll",
+                    self.autoscroll_started,
+                    tracer.clock() - self.autoscroll_started,
+                    frames=self.autoscroll.frames,
+                    median_frame_ms=round(median * 1000, 3),
+                    worst_frame_ms=round(worst * 1000, 3),
+                    over_budget=over,
                 )
-            elif isinstance(node, SectionHeaderNode):
-                buffer.insert_with_tags_by_name(start_iter, node.name, "section_header")
-            elif isinstance(node, CommentNode):
-                buffer.insert_with_tags_by_name(start_iter, node.comment, "comment")
-            elif isinstance(node, SpacerNode):
-                buffer.insert(start_iter, " " * node.length)
-            elif isinstance(node, LineNode) or isinstance(node, ASTNode):
-                for child in node.children:
-                    apply_formatting(child, buffer.get_end_iter())
-                buffer.insert(buffer.get_end_iter(), "\n")
-
-        apply_formatting(ast, buffer.get_start_iter())
+        self.autoscroll = None
 
     def on_back_button_clicked(self, widget):
-        self.content_stack.set_visible_child_name("search_results")
-        self.search_entry.set_text("")  # Clear the search entry
-        self.back_button.set_sensitive(
-            False
-        )  # Disable back button when on search results page
-        self.forward_button.set_sensitive(
-            True
-        )  # Enable forward button when going back to search results
+        page = self.history.back()
+        if page is not None:
+            self.show_page(page)
 
     def on_forward_button_clicked(self, widget):
-        self.content_stack.set_visible_child_name("song_detail")
-        self.search_entry.set_text(self.current_result)
-        self.back_button.set_sensitive(
-            True
-        )  # Enable back button when viewing song details
-        self.forward_button.set_sensitive(
-            False
-        )  # Disable forward button when on song details page
+        page = self.history.forward()
+        if page is not None:
+            self.show_page(page)
+
+    def show_page(self, page: Page):
+        """Show a page of the history again."""
+        if page.url is not None:
+            self.open_song(page.url, page.label)
+            return
+        self.leave_song()
+        self.fetcher.cancel("song")
+        self.live_search.cancel()
+        self.live_search.shown(page.label)
+        self.set_search_text(page.label)
+        self.content_stack.set_visible_child_name("search_results")
+        self.transpose_box.set_visible(False)
+        self.display_results(list(page.results))
@@ -0,0 +1,24 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the parent directory of both src and tests to sys.path
+project_root = Path(__file__).resolve().parent.parent
+if project_root not in sys.path:
+    sys.path.append(str(project_root))
+
+from src import ug  # noqa: E402
+from src.cache import BlobCache, DiskCache  # noqa: E402
+from tests.server import StandInServer  # noqa: E402
+
+
+@pytest.fixture
+def ug_server(monkeypatch, tmp_path):
+    """Point src.ug at a local stand-in server with empty caches."""
+    with StandInServer() as server:
+        monkeypatch.setattr(ug, "SEARCH_URL", f"{server.url}/search.php")
+        monkeypatch.setattr(ug, "TABS_URL", f"{server.url}/")
+        monkeypatch.setattr(ug, "store_cache", DiskCache(tmp_path / "store"))
+        monkeypatch.setattr(ug, "parsed_cache", BlobCache(tmp_path / "parsed"))
+        yield server
@@ -0,0 +1,44 @@
+"""A minimal stand-in for the GLib main loop."""
+import queue
+import threading
+import time
+
+
+class MainLoop:
+    """Runs callbacks queued by `dispatch` or `timeout_add` on the test's thread."""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.ticks = []
+
+    def dispatch(self, callback, *args):
+        self.queue.put((callback, args))
+
+    def timeout_add(self, ms, callback, *args):
+        source = {"callback": callback, "args": args, "removed": False}
+        source["timer"] = threading.Timer(ms / 1000, self.dispatch, (self._fire, source))
+        source["timer"].start()
+        return source
+
+    def source_remove(self, source):
+        source["timer"].cancel()
+        source["removed"] = True
+
+    def _fire(self, source):
+        if not source["removed"]:
+            source["callback"](*source["args"])
+
+    def run_until(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline, "main loop timed out"
+            self.ticks.append(time.monotonic())
+            try:
+                callback, args = self.queue.get(timeout=0.01)
+            except queue.Empty:
+                continue
+            callback(*args)
+
+    def run_for(self, seconds):
+        deadline = time.monotonic() + seconds
+        self.run_until(lambda: time.monotonic() >= deadline, timeout=seconds + 1)
@@ -0,0 +1,160 @@
+"""A local stand-in for the Ultimate Guitar search and tab pages."""
+import hashlib
+import html
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def make_search_result(artist, song, url, version=1, tab_type="Chords"):
+    return {
+        "artist_name": artist,
+        "song_name": song,
+        "tab_url": f"https://tabs.ultimate-guitar.com{url}",
+        "artist_url": f"https://www.ultimate-guitar.com/artist/{artist}",
+        "type": tab_type,
+        "version": version,
+        "votes": 10,
+        "rating": 4.56,
+    }
+
+
+def make_tab_store(artist, song, url, tab, applicature=None):
+    return {
+        "store": {
+            "page": {
+                "data": {
+                    "tab": {
+                        "artist_name": artist,
+                        "song_name": song,
+                        "version": 1,
+                        "type": "Chords",
+                        "rating": 4,
+                        "tab_url": f"https://tabs.ultimate-guitar.com{url}",
+                    },
+                    "tab_view": {
+                        "wiki_tab": {"content": tab},
+                        "ug_difficulty": "novice",
+                        "applicature": applicature,
+                        "meta": {"capo": 2},
+                        "versions": [],
+                    },
+                }
+            }
+        }
+    }
+
+
+def render_page(store):
+    content = html.escape(json.dumps(store))
+    return (
+        "<!DOCTYPE html><html><head><title>Ultimate Guitar</title></head><body>"
+        f'<div class="js-store" data-content="{content}"></div>'
+        "</body></html>"
+    )
+
+
+class StandInServer:
+    """A local HTTP server that serves Ultimate Guitar-like pages."""
+
+    def __init__(self):
+        self.tabs = {}
+        self.tab_types = {}
+        self.requests = []
+        self.delay = 0
+        self.etags = False
+        # Whether 304 responses repeat the ETag, and whether every response
+        # is a 304, as from a misbehaving proxy
+        self.etag_on_304 = True
+        self.always_304 = False
+        self.not_modified = 0
+        # Requests being handled, and the most there have been at once
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server.requests.append(self.path)
+                with server.lock:
+                    server.in_flight += 1
+                    server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+                try:
+                    self.respond()
+                finally:
+                    with server.lock:
+                        server.in_flight -= 1
+
+            def respond(self):
+                if server.delay:
+                    threading.Event().wait(server.delay)
+                body = server.page_for(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                body = body.encode("utf-8")
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                if server.always_304 or (
+                    server.etags and self.headers.get("If-None-Match") == etag
+                ):
+                    server.not_modified += 1
+                    self.send_response(304)
+                    if server.etag_on_304:
+                        self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if server.etags:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def add_tab(
+        self, artist, song, tab="[ch]C[/ch]  [ch]G[/ch]\nla la", tab_type="Chords", **kwargs
+    ):
+        url = f"/tab/{artist}/{song}".replace(" ", "-").lower()
+        self.tabs[url] = (artist, song, tab, kwargs)
+        self.tab_types[url] = tab_type
+        return url
+
+    def page_for(self, path):
+        parsed = urlparse(path)
+        if parsed.path == "/search.php":
+            value = parse_qs(parsed.query).get("value", [""])[0].lower()
+            results = [
+                make_search_result(artist, song, url, tab_type=self.tab_types[url])
+                for url, (artist, song, _, _) in self.tabs.items()
+                if value in f"{artist} {song}".lower()
+            ]
+            return render_page({"store": {"page": {"data": {"results": results}}}})
+        tab_path = "/" + parsed.path.lstrip("/")
+        if tab_path in self.tabs:
+            artist, song, tab, kwargs = self.tabs[tab_path]
+            return render_page(make_tab_store(artist, song, tab_path, tab, **kwargs))
+        return None
+
+    def count(self, prefix):
+        return sum(1 for path in self.requests if path.lstrip("/").startswith(prefix))
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
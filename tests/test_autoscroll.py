@@ -0,0 +1,59 @@
+import time
+import tracemalloc
+
+import pytest
+
+from src.autoscroll import FRAME_BUDGET, AutoScroll, seconds_per_line_from_bpm
+
+# Three 20 pixel lines, then a 40 pixel one
+OFFSETS = [0, 20, 40, 60, 100]
+FRAME = 16_667  # microseconds
+
+
+def test_scrolls_one_line_per_period():
+    scroll = AutoScroll(OFFSETS, seconds_per_line=2)
+    assert scroll.advance(1_000_000) == 0
+    assert scroll.advance(2_000_000) == pytest.approx(10)
+    assert scroll.advance(3_000_000) == pytest.approx(20)
+    # Taller lines scroll faster, so each line takes the same time
+    assert scroll.advance(8_000_000) == pytest.approx(80)
+    assert not scroll.finished
+    assert scroll.advance(10_000_000) == 100
+    assert scroll.finished
+
+
+def test_start_from_scroll_value_and_change_rate():
+    scroll = AutoScroll(OFFSETS, seconds_per_line=1)
+    scroll.start(70)
+    assert scroll.position == pytest.approx(3.25)
+    scroll.advance(0)
+    scroll.set_rate(4)
+    assert scroll.advance(1_000_000) == pytest.approx(80)
+    assert AutoScroll([0, 20]).position_at(-5) == 0
+    assert AutoScroll([0, 20]).position_at(25) == 1
+
+
+def test_bpm():
+    assert seconds_per_line_from_bpm(120) == 2
+    assert seconds_per_line_from_bpm(90, beats_per_line=3) == 2
+
+
+def test_frames_fit_the_budget_without_allocating():
+    offsets = [i * 18.0 for i in range(10_001)]
+    scroll = AutoScroll(offsets, seconds_per_line=0.05)
+    frame_time = 0
+    scroll.advance(frame_time)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(10_000):
+        frame_time += FRAME
+        started = time.perf_counter()
+        scroll.advance(frame_time)
+        scroll.record_frame(time.perf_counter() - started)
+    grown = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    assert grown < 1024
+    median, worst, over = scroll.frame_stats()
+    assert median < FRAME_BUDGET / 100
+    assert scroll.frames == 10_000
+    assert scroll.position == pytest.approx(10_000 * FRAME / 1e6 / 0.05)
@@ -0,0 +1,123 @@
+import pytest
+import requests
+
+from src import ug
+from src.cache import BlobCache, DiskCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_disk_cache_roundtrip(tmp_path):
+    cache = DiskCache(tmp_path)
+    assert cache.get("a") is None
+    cache.set("a", {"value": [1, 2, 3]})
+    assert cache.get("a") == {"value": [1, 2, 3]}
+    # A new instance reads the same directory
+    assert DiskCache(tmp_path).get("a") == {"value": [1, 2, 3]}
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_disk_cache_expiry(tmp_path):
+    clock = FakeClock()
+    cache = DiskCache(tmp_path, ttl=60, clock=clock)
+    cache.set("a", 1)
+    clock.now += 59
+    assert cache.get("a") == 1
+    clock.now += 2
+    assert cache.get("a") is None
+    assert not list(tmp_path.glob("*.json"))
+
+
+def test_disk_cache_lru_eviction(tmp_path):
+    cache = DiskCache(tmp_path, max_size=300)
+    cache.set("a", "x" * 50)
+    cache.set("b", "x" * 50)
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.set("c", "x" * 50)
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_blob_cache_shares_lru_eviction(tmp_path):
+    cache = BlobCache(tmp_path, max_size=250)
+    cache.set("a", b"x" * 100)
+    cache.set("b", b"y" * 100)
+    assert cache.get("a") == b"x" * 100  # "b" is now least recently used
+    cache.set("c", b"z" * 100)
+    assert cache.get("b") is None
+    assert BlobCache(tmp_path).get("c") == b"z" * 100
+    assert not hasattr(cache, "get_entry")
+
+
+def test_ug_search_and_tab_are_cached(ug_server):
+    url = ug_server.add_tab("Queen", "Bohemian Rhapsody", "[Intro]\n[ch]Bb[/ch]")
+
+    results = ug.ug_search("queen")
+    assert [r.song_name for r in results] == ["Bohemian Rhapsody"]
+    assert ug.ug_search("queen") == results
+    assert ug_server.count("search.php") == 1
+
+    song = ug.ug_tab(url)
+    assert song.tab == "[Intro]\n[ch]Bb[/ch]"
+    assert ug.ug_tab(url).tab == song.tab
+    assert ug_server.count("tab/") == 1
+
+
+def test_expired_entries_are_fetched_again(ug_server, monkeypatch, tmp_path):
+    clock = FakeClock()
+    monkeypatch.setattr(ug, "store_cache", DiskCache(tmp_path / "s", ttl=60, clock=clock))
+    ug_server.add_tab("Queen", "Bohemian Rhapsody")
+
+    ug.ug_search("queen")
+    clock.now += 30
+    ug.ug_search("queen")
+    assert ug_server.count("search.php") == 1
+    clock.now += 31
+    ug.ug_search("queen")
+    assert ug_server.count("search.php") == 2
+
+
+def test_expired_entries_are_revalidated(ug_server, monkeypatch, tmp_path):
+    clock = FakeClock()
+    monkeypatch.setattr(ug, "store_cache", DiskCache(tmp_path / "s", ttl=60, clock=clock))
+    ug_server.etags = True
+    url = ug_server.add_tab("Queen", "Bohemian Rhapsody")
+
+    song = ug.ug_tab(url)
+    clock.now += 61
+    assert ug.ug_tab(url).tab == song.tab
+    assert ug_server.count("tab/") == 2
+    assert ug_server.not_modified == 1
+    # The 304 response made the entry fresh again
+    clock.now += 30
+    ug.ug_tab(url)
+    assert ug_server.count("tab/") == 2
+
+
+def test_304_without_validators_keeps_the_cached_ones(ug_server, monkeypatch, tmp_path):
+    clock = FakeClock()
+    monkeypatch.setattr(ug, "store_cache", DiskCache(tmp_path / "s", ttl=60, clock=clock))
+    ug_server.etags = True
+    ug_server.etag_on_304 = False
+    url = ug_server.add_tab("Queen", "Bohemian Rhapsody")
+
+    ug.ug_tab(url)
+    for _ in range(3):
+        clock.now += 61
+        ug.ug_tab(url)
+    # Every later visit is still revalidated rather than downloaded again
+    assert ug_server.not_modified == 3
+
+
+def test_304_without_a_cached_copy_is_an_error(ug_server):
+    ug_server.always_304 = True
+    url = ug_server.add_tab("Queen", "Bohemian Rhapsody")
+    with pytest.raises(requests.HTTPError, match="304"):
+        ug.ug_tab(url)
@@ -0,0 +1,70 @@
+from src.ast import chord_nodes, transpose_ast
+from src.chords import (
+    Chord,
+    parse_chord,
+    parse_progression,
+    progression,
+    transpose_chord,
+    transpose_song,
+)
+from src.parser import parse_tab
+
+
+def test_parse_chord():
+    assert parse_chord("C") == Chord("C", "", None)
+    assert parse_chord("F#m7") == Chord("F#", "m7", None)
+    assert parse_chord("Bbmaj7/D") == Chord("Bb", "maj7", "D")
+    assert parse_chord("am") == Chord("A", "m", None)
+    assert parse_chord("C6/9") == Chord("C", "6/9", None)
+    assert parse_chord("Am7/11/G") == Chord("A", "m7/11", "G")
+    assert parse_chord("N.C.") is None
+
+
+def test_transpose_chord():
+    assert transpose_chord("C", 2) == "D"
+    assert transpose_chord("C", 1) == "C#"
+    assert transpose_chord("C", 1, flats=True) == "Db"
+    assert transpose_chord("Bb", 2) == "C"
+    assert transpose_chord("Bb", 1) == "B"
+    assert transpose_chord("Eb", 1) == "E"
+    assert transpose_chord("D/F#", -2) == "C/E"
+    assert transpose_chord("C6/9", 2) == "D6/9"
+    assert transpose_chord("Am7/11", 3) == "Cm7/11"
+    assert transpose_chord("Am7", -12) == "Am7"
+    assert transpose_chord("N.C.", 3) == "N.C."
+
+
+def test_transpose_song_uses_spelling_of_new_key():
+    # G major up one semitone is Ab major, written with flats
+    assert transpose_song(["G", "D", "Em", "C"], 1) == ["Ab", "Eb", "Fm", "Db"]
+    # F major up one semitone is F# major, written with sharps
+    assert transpose_song(["F", "Bb", "C"], 1) == ["F#", "B", "C#"]
+    assert transpose_song(["Dm", "A7"], 0) == ["Dm", "A7"]
+    assert transpose_song(["C6/9", "G", "Am7/11"], 2) == ["D6/9", "A", "Bm7/11"]
+
+
+def test_transpose_ast():
+    ast = parse_tab("[ch]G[/ch]  [ch]D/F#[/ch]\nla la")
+    transpose_ast(ast, -2)
+    assert [node.name for node in chord_nodes(ast)] == ["F", "C/E"]
+    chord_nodes(ast)[0].transpose(2)
+    assert chord_nodes(ast)[0].name == "G"
+
+
+def test_progression():
+    assert progression(["C", "C", "G/B", "N.C.", "Am7", "F", "Bdim", "Caug"]) == [
+        (0, "maj"),
+        (7, "maj"),
+        (9, "min"),
+        (5, "maj"),
+        (11, "dim"),
+        (0, "aug"),
+    ]
+
+
+def test_parse_progression():
+    assert parse_progression("I–V–vi–IV") == [(0, "maj"), (7, "maj"), (9, "min"), (5, "maj")]
+    assert parse_progression("ii7, V7, Imaj7") == [(2, "min"), (7, "maj"), (0, "maj")]
+    assert parse_progression("i bVII bVI vii°") == [(0, "min"), (10, "maj"), (8, "maj"), (11, "dim")]
+    assert parse_progression("D A Bm G") == progression(["D", "A", "Bm", "G"])
+    assert parse_progression("I V nonsense") is None
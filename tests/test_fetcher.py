@@ -0,0 +1,73 @@
+import time
+
+from src import ug
+from src.fetcher import Fetcher
+
+from .mainloop import MainLoop
+
+
+def test_slow_search_does_not_block_main_loop(ug_server):
+    ug_server.add_tab("Queen", "Bohemian Rhapsody")
+    ug_server.delay = 0.5
+    loop = MainLoop()
+    progress = []
+    results = []
+    fetcher = Fetcher(dispatch=loop.dispatch, on_progress=progress.append)
+
+    started = time.monotonic()
+    fetcher.submit("search", ug.ug_search, "queen", on_done=results.append)
+    assert time.monotonic() - started < 0.1
+
+    loop.run_until(lambda: results)
+    fetcher.shutdown()
+    assert [r.song_name for r in results[0]] == ["Bohemian Rhapsody"]
+    assert progress == [1, 0]
+    # The loop kept turning while the request was in flight
+    gaps = [b - a for a, b in zip(loop.ticks, loop.ticks[1:])]
+    assert len(loop.ticks) > 10
+    assert max(gaps) < 0.1
+
+
+def test_new_query_supersedes_previous_one(ug_server):
+    ug_server.add_tab("Queen", "Bohemian Rhapsody")
+    ug_server.add_tab("The Beatles", "Yesterday")
+    ug_server.delay = 0.2
+    loop = MainLoop()
+    results = []
+    fetcher = Fetcher(dispatch=loop.dispatch)
+
+    fetcher.submit("search", ug.ug_search, "queen", on_done=results.append)
+    fetcher.submit("search", ug.ug_search, "beatles", on_done=results.append)
+    loop.run_until(lambda: fetcher.pending == 0)
+    fetcher.shutdown()
+    assert len(results) == 1
+    assert [r.song_name for r in results[0]] == ["Yesterday"]
+
+
+def test_errors_are_delivered_on_main_loop():
+    loop = MainLoop()
+    errors = []
+    fetcher = Fetcher(dispatch=loop.dispatch)
+
+    def fail():
+        raise ValueError("boom")
+
+    fetcher.submit("song", fail, on_done=None, on_error=errors.append)
+    loop.run_until(lambda: errors)
+    fetcher.shutdown()
+    assert isinstance(errors[0], ValueError)
+
+
+def test_results_queued_before_shutdown_are_dropped():
+    loop = MainLoop()
+    progress = []
+    results = []
+    fetcher = Fetcher(dispatch=loop.dispatch, on_progress=progress.append)
+
+    future = fetcher.submit("song", lambda: "song", on_done=results.append)
+    future.result()
+    # The result is waiting on the main loop as the window closes
+    fetcher.shutdown()
+    loop.run_until(lambda: loop.queue.empty())
+    assert results == []
+    assert progress == [1]
@@ -0,0 +1,60 @@
+from src.history import History, Page, SongCache, estimate_size
+from src.ug import SongDetail
+from tests.server import make_tab_store
+
+
+def test_history_back_and_forward():
+    history = History()
+    assert history.current is None and not history.can_go_back
+    history.visit(Page(None, "beatles"))
+    history.replace(Page(None, "beatles yesterday"))
+    for song in ("a", "b", "c"):
+        history.visit(Page(f"/tab/{song}", song))
+    assert [page.label for page in history.pages] == ["beatles yesterday", "a", "b", "c"]
+
+    assert history.back().url == "/tab/b"
+    assert history.back().url == "/tab/a"
+    assert history.forward().url == "/tab/b"
+    assert history.can_go_forward
+    # Visiting a page drops the ones ahead
+    history.visit(Page("/tab/d", "d"))
+    assert not history.can_go_forward
+    assert [page.label for page in history.pages] == ["beatles yesterday", "a", "b", "d"]
+    assert history.back().url == "/tab/b"
+    assert history.back().url == "/tab/a"
+    assert history.back().label == "beatles yesterday"
+    assert history.back() is None
+
+
+def test_history_length_is_bounded():
+    history = History(max_length=3)
+    for i in range(5):
+        history.visit(Page(f"/tab/{i}", str(i)))
+    assert [page.label for page in history.pages] == ["2", "3", "4"]
+    assert history.current.label == "4"
+
+
+def test_song_cache_limits_entries_and_bytes():
+    cache = SongCache(max_entries=3, max_bytes=100)
+    for song in "abc":
+        cache.put(song, song.upper(), 10)
+    assert cache.get("a") == "A"
+    cache.put("d", "D", 10)
+    # b was used least recently
+    assert "b" not in cache and len(cache) == 3 and cache.size == 30
+    cache.put("e", "E", 85)
+    assert [url for url in "acde" if url in cache] == ["d", "e"]
+    assert cache.size == 95
+    # The last song is kept even when it is larger than the limit
+    cache.put("f", "F", 500)
+    assert cache.get("f") == "F" and len(cache) == 1
+    assert cache.pop("f") == "F" and cache.size == 0
+
+
+def test_estimate_size_grows_with_the_tab():
+    def song(lines):
+        tab = "\n".join(["[ch]C[/ch]  [ch]G[/ch]", "la la la"] * lines)
+        return SongDetail(make_tab_store("Artist", "Song", "/tab/song", tab))
+
+    small, large = estimate_size(song(10)), estimate_size(song(100))
+    assert 9 * small < large < 11 * small
@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+
+from src.library import LibraryWriter, SongLibrary
+from src.ug import SearchResult, SongDetail
+from tests.server import make_tab_store
+
+
+def make_song(artist, song, tab, url=None):
+    url = url or f"/tab/{artist}/{song}".replace(" ", "-").lower()
+    return SongDetail(make_tab_store(artist, song, url, tab))
+
+
+@pytest.fixture
+def library(tmp_path):
+    library = SongLibrary(tmp_path / "library.sqlite3")
+    library.add(make_song("Queen", "Bohemian Rhapsody", "[Intro]\n[ch]Bb[/ch]\nIs this the real life"))
+    library.add(make_song("The Beatles", "Yesterday", "[Verse]\n[ch]F[/ch]  [ch]Em7[/ch]\nAll my troubles"))
+    library.add(make_song("The Beatles", "Let It Be", "[Chorus]\n[ch]C[/ch]  [ch]G[/ch]\nWhisper words of wisdom"))
+    yield library
+    library.close()
+
+
+def titles(results):
+    return [result.song_name for result in results]
+
+
+def test_search_by_artist_title_lyrics_and_chords(library):
+    assert titles(library.search("queen")) == ["Bohemian Rhapsody"]
+    assert sorted(titles(library.search("beatles"))) == ["Let It Be", "Yesterday"]
+    assert titles(library.search("troubles")) == ["Yesterday"]
+    assert titles(library.search("Em7")) == ["Yesterday"]
+    assert titles(library.search("chorus")) == ["Let It Be"]
+    results = library.search("queen")
+    assert isinstance(results[0], SearchResult)
+    assert results[0].tab_url == "/tab/queen/bohemian-rhapsody"
+
+
+def test_search_prefix_and_fuzzy(library):
+    assert sorted(titles(library.search("beatl"))) == ["Let It Be", "Yesterday"]
+    assert titles(library.search("rhapsdy")) == ["Bohemian Rhapsody"]
+    assert titles(library.search("zzzz")) == []
+
+
+def test_title_matches_rank_above_lyrics(library):
+    library.add(make_song("Someone", "Cover", "singing yesterday once more", url="/tab/cover"))
+    assert titles(library.search("yesterday")) == ["Yesterday", "Cover"]
+
+
+def test_updates_are_incremental_and_persistent(library, tmp_path):
+    library.add(make_song("Queen", "Bohemian Rhapsody", "Mama just killed a man"))
+    assert len(library) == 3
+    assert titles(library.search("mama")) == ["Bohemian Rhapsody"]
+    assert titles(library.search("real")) == []
+    library.close()
+
+    reopened = SongLibrary(tmp_path / "library.sqlite3")
+    assert titles(reopened.search("mama")) == ["Bohemian Rhapsody"]
+    assert "/tab/queen/bohemian-rhapsody" in reopened
+    assert "/tab/queen/killer-queen" not in reopened
+    assert reopened.get_tab("/tab/queen/bohemian-rhapsody") == "Mama just killed a man"
+    reopened.close()
+
+
+def test_search_progression_in_any_key(library):
+    library.add(make_song("Journey", "Open Arms", "[ch]D[/ch] [ch]A[/ch] [ch]Bm[/ch] [ch]G[/ch]\nla", url="/tab/a"))
+    library.add(make_song("Band", "Blues", "[ch]E7[/ch] [ch]A7[/ch] [ch]E7[/ch] [ch]B7[/ch]", url="/tab/b"))
+    assert titles(library.search_progression("I-V-vi-IV")) == ["Open Arms"]
+    assert titles(library.search_progression("C G Am F")) == ["Open Arms"]
+    assert titles(library.search_progression("I V vi IV V")) == []
+    # Shorter than an n-gram, and at the end of a song, most recent first
+    assert titles(library.search_progression("I7 V7")) == ["Blues", "Open Arms", "Let It Be"]
+    assert titles(library.search_progression("vi IV")) == ["Open Arms"]
+    # Yesterday is F Em7
+    assert titles(library.search_progression("IV iii")) == ["Yesterday"]
+    assert library.search_progression("I") == []
+    assert library.search_progression("not chords") == []
+
+
+def test_progression_index_is_incremental(library):
+    library.add(make_song("Journey", "Open Arms", "[ch]D[/ch] [ch]A[/ch] [ch]Bm[/ch] [ch]G[/ch]", url="/tab/a"))
+    library.add(make_song("Journey", "Open Arms", "[ch]D[/ch] [ch]G[/ch]", url="/tab/a"))
+    assert titles(library.search_progression("I V vi")) == []
+    assert titles(library.search_progression("V I")) == ["Open Arms"]
+
+
+def test_writer_adds_from_other_threads(library):
+    writer = LibraryWriter(library.path)
+    song = make_song("Journey", "Open Arms", "Lying beside you", url="/tab/a")
+    # As from a fetch worker: the insert happens off the calling thread
+    worker = threading.Thread(target=lambda: writer.add(song).result())
+    worker.start()
+    worker.join()
+    assert titles(library.search("lying")) == ["Open Arms"]
+    writer.add(make_song("Journey", "Faithfully", "Highway run", url="/tab/b"))
+    writer.close()
+    assert titles(library.search("highway")) == ["Faithfully"]
+
@@ -0,0 +1,127 @@
+from src import ug
+from src.fetcher import Fetcher
+from src.live_search import LiveSearch
+
+from .mainloop import MainLoop
+
+KEYSTROKE = 0.02
+DEBOUNCE_MS = 100
+
+
+def make_live_search(loop, shown):
+    fetcher = Fetcher(dispatch=loop.dispatch)
+    live = LiveSearch(
+        fetcher,
+        on_results=lambda results, final: shown.append(
+            (sorted(r.song_name for r in results), final)
+        ),
+        search=ug.ug_search,
+        delay_ms=DEBOUNCE_MS,
+        timeout_add=loop.timeout_add,
+        source_remove=loop.source_remove,
+    )
+    return live, fetcher
+
+
+def type_text(loop, live, text, start=""):
+    """Type `text` after `start`, one keystroke at a time."""
+    for i in range(1, len(text) + 1):
+        live.changed(start + text[:i])
+        loop.run_for(KEYSTROKE)
+
+
+def test_typing_session_makes_few_requests(ug_server):
+    for song in ("Yesterday", "Let It Be", "Hey Jude"):
+        ug_server.add_tab("The Beatles", song)
+    ug_server.add_tab("Beach Boys", "Surfin")
+    ug_server.add_tab("Queen", "Bohemian Rhapsody")
+    loop = MainLoop()
+    shown = []
+    live, fetcher = make_live_search(loop, shown)
+
+    # Typing is debounced: a single search for "bea"
+    type_text(loop, live, "bea")
+    loop.run_until(lambda: shown)
+    assert shown[-1] == (["Hey Jude", "Let It Be", "Surfin", "Yesterday"], True)
+
+    # Answered by filtering the complete results for "bea"
+    type_text(loop, live, "tles", start="bea")
+    loop.run_for(0.2)
+    assert shown[-1] == (["Hey Jude", "Let It Be", "Yesterday"], True)
+
+    # Deleting back to "bea" reuses its results
+    for text in ("beatle", "beatl", "beat", "bea"):
+        live.changed(text)
+        loop.run_for(KEYSTROKE)
+    loop.run_for(0.2)
+    assert shown[-1][0] == ["Hey Jude", "Let It Be", "Surfin", "Yesterday"]
+    assert ug_server.count("search.php") == 1
+
+    # A slow search in flight isn't sent again when the query comes back
+    ug_server.delay = 0.5
+    type_text(loop, live, "queen")
+    loop.run_for(0.2)
+    live.activate("bea")
+    live.activate("queen")
+    loop.run_until(lambda: shown[-1][0] == ["Bohemian Rhapsody"])
+    fetcher.shutdown()
+
+    # Two requests for 18 searches typed or entered
+    assert ug_server.count("search.php") == 2
+
+
+def test_new_query_cancels_stale_one(ug_server):
+    ug_server.add_tab("Queen", "Bohemian Rhapsody")
+    ug_server.add_tab("The Beatles", "Yesterday")
+    ug_server.delay = 0.2
+    loop = MainLoop()
+    shown = []
+    live, fetcher = make_live_search(loop, shown)
+
+    live.activate("queen")
+    live.activate("beatles")
+    loop.run_until(lambda: fetcher.pending == 0)
+    fetcher.shutdown()
+    assert shown == [(["Yesterday"], True)]
+
+
+def test_full_page_with_pro_tabs_isnt_complete(ug_server):
+    # A full page of results for "bea", two of them Pro tabs that are left out
+    for i in range(48):
+        ug_server.add_tab("The Beatles", f"Song {i}")
+    ug_server.add_tab("The Beatles", "Pro Song 1", tab_type="Pro")
+    ug_server.add_tab("The Beatles", "Pro Song 2", tab_type="Pro")
+    loop = MainLoop()
+    shown = []
+    live, fetcher = make_live_search(loop, shown)
+
+    live.activate("bea")
+    loop.run_until(lambda: shown)
+    assert len(shown[-1][0]) == 48
+
+    # Filtered from "bea" while the network is asked, as more may match
+    live.activate("beatles song 7")
+    loop.run_until(lambda: shown[-1][1])
+    fetcher.shutdown()
+    assert shown[-2] == (["Song 7"], False)
+    assert shown[-1] == (["Song 7"], True)
+    assert ug_server.count("search.php") == 2
+
+
+def test_repeated_query_after_opening_a_song(ug_server):
+    ug_server.add_tab("Queen", "Bohemian Rhapsody")
+    loop = MainLoop()
+    shown = []
+    live, fetcher = make_live_search(loop, shown)
+
+    live.activate("queen")
+    loop.run_until(lambda: shown)
+    live.activate("queen")
+    assert len(shown) == 1
+
+    # A song from the results replaces them, so the same query shows them again
+    live.reset()
+    live.activate("queen")
+    fetcher.shutdown()
+    assert shown == [(["Bohemian Rhapsody"], True)] * 2
+    assert ug_server.count("search.php") == 1
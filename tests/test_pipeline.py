@@ -0,0 +1,73 @@
+import io
+import json
+
+from src.pipeline import iter_pages, main, run_pipeline
+from tests.server import make_tab_store
+
+APPLICATURE = {"C": [{"frets": [-1, 3, 2, 0, 1, 0], "fingers": [0, 3, 2, 0, 1, 0]}]}
+
+
+def page(i):
+    tab = f"[Verse]\n[ch]C[/ch]  [ch]G[/ch]\nsong {i}"
+    return json.dumps(make_tab_store("Artist", f"Song {i}", f"/tab/song-{i}", tab, APPLICATURE))
+
+
+def read_results(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_directory(tmp_path):
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    for i in range(5):
+        (pages / f"{i}.json").write_text(page(i))
+    (pages / "broken.json").write_text('{"store": {}}')
+    (pages / "notes.txt").write_text("not a page")
+
+    assert main([str(pages), str(tmp_path / "out.jsonl"), "--workers", "2", "--chunk-size", "2"]) == 1
+    results = {r["name"].rsplit("/", 1)[-1]: r for r in read_results(tmp_path / "out.jsonl")}
+    assert len(results) == 6
+    assert results["broken.json"]["error"].startswith("KeyError")
+    song = results["3.json"]
+    assert song["tab_url"] == "https://tabs.ultimate-guitar.com/tab/song-3"
+    assert song["tokens"] == [
+        [["header", "[Verse]"]],
+        [["chord", "C"], ["spacer", 2], ["chord", "G"]],
+        [["text", "song 3"]],
+    ]
+    assert song["chords"] == ["C", "G"]
+    assert song["shapes"] == {"C": 1}
+
+
+def test_jsonl(tmp_path):
+    source = tmp_path / "pages.jsonl"
+    source.write_text("\n".join(page(i) for i in range(20)) + "\n\n")
+    out = io.StringIO()
+    assert run_pipeline(iter_pages(source), out, workers=2, chunk_size=3) == (20, 0)
+    names = sorted(json.loads(line)["name"] for line in out.getvalue().splitlines())
+    assert names == sorted(f"pages.jsonl:{i}" for i in range(1, 21))
+
+
+def test_memory_is_bounded():
+    """Pages are read ahead of the results written by a bounded amount."""
+    read = 0
+
+    def pages():
+        nonlocal read
+        for i in range(200):
+            read += 1
+            yield f"page-{i}", page(i)
+
+    class Out(io.StringIO):
+        ahead = 0
+
+        def write(self, text):
+            written = len(self.getvalue().splitlines())
+            Out.ahead = max(Out.ahead, read - written)
+            return super().write(text)
+
+    out = Out()
+    assert run_pipeline(pages(), out, workers=2, chunk_size=5) == (200, 0)
+    # At most 2 chunks per worker in flight, and the chunk being read
+    assert Out.ahead <= (2 * 2 + 1) * 5
@@ -0,0 +1,111 @@
+from src.parser import (
+    CHORD,
+    NEWLINE,
+    SPACER,
+    TEXT,
+    build_tree,
+    iter_parse,
+    parse_tab,
+    token_texts,
+    tokenize,
+)
+from src.render import (
+    iter_chunks,
+    iter_line_chunks,
+    render_lines,
+    replace_chords,
+)
+
+
+def test_render_lines():
+    ast = parse_tab("[Verse]  (soft)\n[ch]C[/ch]   [ch]G/B[/ch]\nLife could be")
+    text, spans = render_lines(ast.children)
+    assert text == "[Verse]  (soft)\nC   G/B\nLife could be\n"
+    assert [(tag, text[start:end]) for tag, start, end in spans] == [
+        ("section_header", "[Verse]"),
+        ("comment", "(soft)"),
+        ("chord", "C"),
+        ("chord", "G/B"),
+    ]
+
+
+def test_iter_chunks_splits_on_whole_lines():
+    tab = "\n".join(f"[ch]C[/ch]  line {i}" for i in range(10))
+    ast = parse_tab(tab)
+    chunks = list(iter_chunks(ast, first_chunk=3, chunk=4))
+    assert [text.count("\n") for text, _ in chunks] == [3, 4, 3]
+    assert "".join(text for text, _ in chunks) == render_lines(ast.children)[0]
+    # Span offsets are relative to the chunk
+    text, spans = chunks[1]
+    assert [text[start:end] for _, start, end in spans] == ["C"] * 4
+
+
+def test_iter_line_chunks_renders_a_stream():
+    tab = "\n".join(f"[ch]C[/ch]  line {i}" for i in range(10))
+    expected = list(iter_chunks(parse_tab(tab), first_chunk=3, chunk=4))
+    lines = iter_parse(tab[i : i + 5] for i in range(0, len(tab), 5))
+    assert list(iter_line_chunks(lines, first_chunk=3, chunk=4)) == expected
+
+
+def test_tokenize():
+    tab, tokens = tokenize("[ch]C[/ch]   [ch]G/B[/ch]\r\nLife could be  ")
+    assert tab == "[ch]C[/ch]   [ch]G/B[/ch]\nLife could be  "
+    triples = [tuple(tokens[i : i + 3]) for i in range(0, len(tokens), 3)]
+    assert [(kind, tab[start:end]) for kind, start, end in triples] == [
+        (CHORD, "C"),
+        (SPACER, "   "),
+        (CHORD, "G/B"),
+        (NEWLINE, "\n"),
+        (TEXT, "Life could be"),
+        (NEWLINE, ""),
+    ]
+    assert token_texts(tab, tokens, CHORD) == ["C", "G/B"]
+
+
+def test_tree_of_tokens_renders_like_parse_tab():
+    tab = "\n".join(
+        f"[Verse {i}]  (soft)\n [ch]C[/ch]   [ch]G/B[/ch]\t \nline {i}\r\n\n" for i in range(10)
+    )
+    expected = render_lines(parse_tab(tab).children)
+    assert render_lines(build_tree(*tokenize(tab)).children) == expected
+
+
+class TextBuffer:
+    """The subset of Gtk.TextBuffer used by replace_chords, with offsets as iters."""
+
+    def __init__(self, text):
+        self.text = text
+
+    def get_start_iter(self):
+        return 0
+
+    def get_end_iter(self):
+        return len(self.text)
+
+    def get_iter_at_offset(self, offset):
+        return offset
+
+    def get_text(self, start, end, include_hidden_chars):
+        return self.text[start:end]
+
+    def delete(self, start, end):
+        self.text = self.text[:start] + self.text[end:]
+
+    def insert(self, offset, text):
+        self.text = self.text[:offset] + text + self.text[offset:]
+
+    def insert_with_tags_by_name(self, offset, text, *tags):
+        self.insert(offset, text)
+
+
+def test_replace_chords_keeps_columns():
+    text, spans = render_lines(parse_tab("[ch]C[/ch]   [ch]F#m[/ch] [ch]G[/ch]\nla").children)
+    spans = [(start, end) for _, start, end in spans]
+    buffer = TextBuffer(text)
+
+    spans = replace_chords(buffer, spans, ["C#", "Gm", "Ab"])
+    assert buffer.text == "C#  Gm  Ab\nla\n"
+    assert [buffer.text[start:end] for start, end in spans] == ["C#", "Gm", "Ab"]
+
+    spans = replace_chords(buffer, spans, ["C", "F#m", "G"])
+    assert buffer.text == "C   F#m G\nla\n"
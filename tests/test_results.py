@@ -0,0 +1,25 @@
+import pytest
+
+gi = pytest.importorskip("gi")
+gi.require_version("Gtk", "4.0")
+
+from src.results import make_results_store, result_label, set_results  # noqa: E402
+from src.ug import SearchResult  # noqa: E402
+
+from .server import make_search_result  # noqa: E402
+
+
+def test_rows_keep_their_result_with_duplicate_labels():
+    results = [
+        SearchResult(make_search_result("Queen", "Killer Queen", "/tab/queen/a")),
+        SearchResult(make_search_result("Queen", "Killer Queen", "/tab/queen/b")),
+    ]
+    store = make_results_store()
+    set_results(store, results)
+    assert result_label(results[0]) == result_label(results[1])
+    assert [store.get_item(i).result.tab_url for i in range(2)] == [
+        "/tab/queen/a",
+        "/tab/queen/b",
+    ]
+    set_results(store, results[1:])
+    assert store.get_n_items() == 1
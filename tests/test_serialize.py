@@ -0,0 +1,49 @@
+import pytest
+
+from src import serialize, ug
+from src.cache import BlobCache
+from src.parser import tokenize
+
+TAB = "[Verse 1]  (soft)\n[ch]C[/ch]   [ch]G/B[/ch]\nLife could be ñandú\n\n[ch]C[/ch]"
+CHORDS = {"C": [{1: [0, 1, 0], 2: [0, 0, 1]}]}
+FINGERINGS = {"C": [["x", 3, 2]]}
+
+
+def test_roundtrip():
+    _, tokens = tokenize(TAB)
+    loaded, chords, fingerings = serialize.loads(
+        serialize.dumps(tokens, CHORDS, FINGERINGS)
+    )
+    assert loaded == tokens
+    assert chords == CHORDS
+    assert fingerings == FINGERINGS
+
+
+def test_stale_or_corrupt_data_is_rejected(monkeypatch):
+    data = serialize.dumps(tokenize(TAB)[1])
+    monkeypatch.setattr(serialize, "PARSER_VERSION", serialize.PARSER_VERSION + 1)
+    with pytest.raises(ValueError):
+        serialize.loads(data)
+    with pytest.raises(ValueError):
+        serialize.loads(data[:-4])
+    with pytest.raises(ValueError):
+        serialize.loads(b"nonsense")
+    with pytest.raises(ValueError):
+        serialize.loads(b"\0" * 20)
+
+
+def test_parse_song_reuses_parsed_tabs(monkeypatch, tmp_path):
+    monkeypatch.setattr(ug, "parsed_cache", BlobCache(tmp_path))
+
+    class Song(ug.SongDetail):
+        def __init__(self):
+            self.tab = TAB
+            self.applicature = None
+
+    first = Song()
+    ug.parse_song(first)
+    monkeypatch.setattr(ug, "tokenize", None)
+    second = Song()
+    ug.parse_song(second)
+    assert second.tokens == first.tokens
+    assert (second.chords, second.fingers_for_strings) == ({}, {})
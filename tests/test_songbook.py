@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from src import songbook as songbook_module
+from src.library import SongLibrary
+from src.songbook import Songbook, find_song, write_songbook
+from src.ug import SongDetail, get_chords
+from tests.server import make_tab_store
+
+APPLICATURE = {
+    "C": [{"frets": [-1, 3, 2, 0, 1, 0], "fingers": [0, 3, 2, 0, 1, 0]}],
+    "G": [{"frets": [3, 2, 0, 0, 0, 3], "fingers": [2, 1, 0, 0, 0, 3]}],
+}
+
+
+def make_song(i):
+    tab = f"[Verse]\n[ch]C[/ch]  [ch]G[/ch]\nSong number {i}\n"
+    return SongDetail(
+        make_tab_store(f"Artist {i % 97}", f"Song {i}", f"/tab/song-{i}", tab, APPLICATURE)
+    )
+
+
+def test_round_trip(tmp_path):
+    original = make_song(1)
+    write_songbook(tmp_path / "gig.songbook", [original])
+    with Songbook(tmp_path / "gig.songbook") as songbook:
+        song = songbook.get("https://tabs.ultimate-guitar.com/tab/song-1")
+        assert song is not None
+        assert song.tab == original.tab
+        assert (song.artist_name, song.song_name, song.capo) == ("Artist 1", "Song 1", 2)
+        assert song.applicature == original.applicature
+        assert song.tokens == original.tokens
+        assert (song.chords, song.fingers_for_strings) == get_chords(original)
+
+
+def test_ten_thousand_songs(tmp_path):
+    path = tmp_path / "big.songbook"
+    assert write_songbook(path, (make_song(i) for i in range(10000))) == 10000
+
+    with Songbook(path) as songbook:
+        assert len(songbook) == 10000
+        for i in random.Random(0).sample(range(10000), 200):
+            song = songbook.get(f"/tab/song-{i}")
+            assert song.song_name == f"Song {i}"
+            assert f"Song number {i}\n" in song.tab
+        assert songbook.get("/tab/song-10000") is None
+        assert "/tab/song-9999" in songbook
+        assert "/tab/missing" not in songbook
+
+
+def test_find_song_and_bad_files(tmp_path):
+    write_songbook(tmp_path / "a.songbook", [make_song(1)])
+    write_songbook(tmp_path / "b.songbook", [make_song(2)])
+    (tmp_path / "c.songbook").write_bytes(b"not a songbook at all, but long enough")
+    songbooks = songbook_module.open_songbooks(tmp_path)
+    assert len(songbooks) == 2
+    assert find_song(songbooks, "/tab/song-2").song_name == "Song 2"
+    assert find_song(songbooks, "/tab/song-3") is None
+    for songbook in songbooks:
+        songbook.close()
+
+    with pytest.raises(ValueError):
+        Songbook(tmp_path / "c.songbook")
+
+
+def test_export_and_import(ug_server, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    queen = ug_server.add_tab("Queen", "Bohemian Rhapsody", applicature=APPLICATURE)
+    ug_server.add_tab("The Beatles", "Yesterday")
+    path = tmp_path / "gig.songbook"
+
+    status = songbook_module.main(["export", str(path), queen, "yesterday", "/tab/missing"])
+    assert status == 1  # /tab/missing doesn't exist
+    requests = len(ug_server.requests)
+    with Songbook(path) as songbook:
+        assert len(songbook) == 2
+        assert songbook.get(queen).chords.keys() == {"C", "G"}
+
+    library_path = tmp_path / "library.sqlite3"
+    assert songbook_module.main(["import", str(path), "--library", str(library_path)]) == 0
+    # Everything comes from the songbook, nothing from the network
+    assert len(ug_server.requests) == requests
+    library = SongLibrary(library_path)
+    assert [result.song_name for result in library.search("yesterday")] == ["Yesterday"]
+    library.close()
+    imported = songbook_module.open_songbooks()
+    assert [songbook.path.name for songbook in imported] == ["gig.songbook"]
+    imported[0].close()
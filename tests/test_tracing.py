@@ -0,0 +1,58 @@
+import json
+import threading
+
+from src import ug
+from src.tracing import Tracer
+
+
+def test_spans_are_grouped_per_thread():
+    tracer = Tracer(enabled=True)
+
+    def work(group):
+        with tracer.group(group), tracer.span("stage", size=1) as args:
+            args["nodes"] = 2
+
+    threads = [threading.Thread(target=work, args=(f"song {i}",)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with tracer.span("ungrouped"):
+        pass
+    [span] = tracer.spans_in("song 1")
+    assert span.name == "stage"
+    assert span.args == {"size": 1, "nodes": 2}
+    assert span.duration >= 0
+    assert len(tracer.spans) == 4
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.span("stage") as args:
+        assert args is None
+    tracer.add("stage", tracer.clock(), 0.1)
+    assert not tracer.spans
+
+
+def test_save_chrome_trace_and_json(tmp_path):
+    tracer = Tracer(enabled=True)
+    with tracer.group("/tab/a"), tracer.span("parse_tab_to_ast", lines=3):
+        pass
+    tracer.save(tmp_path / "song.trace.json")
+    tracer.save(tmp_path / "song.json")
+    [event] = json.loads((tmp_path / "song.trace.json").read_text())["traceEvents"]
+    assert event["ph"] == "X" and event["name"] == "parse_tab_to_ast"
+    assert event["args"] == {"lines": 3}
+    [span] = json.loads((tmp_path / "song.json").read_text())
+    assert span["group"] == "/tab/a"
+
+
+def test_ug_tab_records_each_stage(ug_server, monkeypatch):
+    tracer = Tracer(enabled=True)
+    monkeypatch.setattr(ug, "tracer", tracer)
+    url = ug_server.add_tab("Artist", "Song")
+    ug.ug_tab(url)
+    spans = {span.name: span for span in tracer.spans_in(url)}
+    for stage in ("http", "json", "SongDetail", "get_chords", "ug_tab"):
+        assert stage in spans
+    assert spans["tokenize"].args["tokens"] > 0
@@ -1,3 +1,5 @@
+import html
+import json
 import sys
 from pathlib import Path
 
@@ -8,6 +10,8 @@ project_root = Path(__file__).resolve().parent.parent
 if project_root not in sys.path:
     sys.path.append(str(project_root))
 
+from src.parser import iter_parse, parse_line, parse_tab, reparse_lines  # noqa: E402
+from src.render import render_lines  # noqa: E402
 from src.ug import SongDetail  # noqa: E402
 from src.ast import (
     LineNode,
@@ -159,3 +163,112 @@ def test_parse_tab_to_ast_trailing_space(make_song_detail):
     assert len(ast.children[0].children) == 1
     assert isinstance(ast.children[0].children[0], SectionHeaderNode)
     assert ast.children[0].children[0].name == "[Verse 1]"
+
+
+def test_parse_tab_to_ast_header_before_chord(make_song_detail):
+    tab = "[Chorus]    [ch]C[/ch]  (x2)  "
+    song = make_song_detail(tab)
+    ast = song.parse_tab_to_ast()
+    assert len(ast.children) == 1
+    children = ast.children[0].children
+    assert len(children) == 5
+    assert isinstance(children[0], SectionHeaderNode)
+    assert children[0].name == "[Chorus]"
+    assert isinstance(children[1], SpacerNode)
+    assert children[1].length == 4
+    assert isinstance(children[2], ChordNode)
+    assert children[2].name == "C"
+    assert isinstance(children[3], SpacerNode)
+    assert children[3].length == 2
+    assert isinstance(children[4], CommentNode)
+    assert children[4].comment == "(x2)"
+
+
+def test_iter_parse_matches_parse_tab():
+    tab = "[Verse]\r\n[ch]C[/ch]   [ch]G/B[/ch]  \nLife could be\n\n(x2)\n"
+    expected = render_lines(parse_tab(tab).children)
+    for size in (1, 3, 7, len(tab)):
+        chunks = [tab[i : i + size] for i in range(0, len(tab), size)]
+        assert render_lines(iter_parse(chunks)) == expected
+
+
+def test_reparse_lines_only_rebuilds_edited_lines(make_song_detail):
+    song = make_song_detail("[ch]C[/ch]  [ch]G[/ch]\nLife could be\nso handsome")
+    ast = song.parse_tab_to_ast()
+    first, last = ast.children[0], ast.children[2]
+    reparse_lines(ast, 1, 2, "[ch]Am[/ch]\nLife could be")
+    assert ast.children[0] is first and ast.children[3] is last
+    assert render_lines(ast.children)[0] == "C  G\nAm\nLife could be\nso handsome\n"
+    assert isinstance(parse_line("[ch]Am[/ch]").children[0], ChordNode)
+    with pytest.raises(ValueError):
+        parse_line("two\nlines")
+
+
+def test_song_detail_keeps_only_what_it_needs():
+    from tests.server import make_search_result, make_tab_store
+
+    variant = {"id": "C_0", "frets": [-1, 3, 2, 0, 1, 0], "fingers": [0] * 6}
+    store = make_tab_store(
+        "Queen", "Killer Queen", "/tab/queen/a", "[ch]C[/ch]", {"C": [variant]}
+    )
+    view = store["store"]["page"]["data"]["tab_view"]
+    view["versions"] = [make_search_result("Queen", "Killer Queen", "/tab/queen/b", 2)]
+    song = SongDetail(store)
+    assert (song.capo, song.tuning) == (2, None)
+    assert "versions" not in vars(song) and "tokens" not in vars(song)
+    assert [version.version for version in song.versions] == [2]
+    assert song.applicature == {
+        "C": [{"frets": (-1, 3, 2, 0, 1, 0), "fingers": (0,) * 6}]
+    }
+    assert song.parse_tab_to_ast().children[0].children[0].name == "C"
+
+
+def test_extract_store():
+    from src.ug import extract_store
+
+    store = {"store": {"page": {"data": {"text": "<b>\"quoted\" & 'single'</b>"}}}}
+    content = html.escape(json.dumps(store))
+    page = (
+        "<html><head><script>if (a < b) document.querySelector('.js-store')"
+        "</script></head><body><div class='page js-store' "
+        f'data-content="{content}"></div></body></html>'
+    )
+    assert extract_store(page) == store
+
+
+def test_extract_store_falls_back_to_beautifulsoup():
+    from src.ug import extract_store
+
+    # The fast path backs up to the "<" inside the title attribute
+    page = '<div title="a<b" class="js-store" data-content=\'{"a": 1}\'></div>'
+    assert extract_store(page) == {"a": 1}
+
+
+def test_ug_tabs_streams_songs_and_collects_errors(ug_server):
+    from src.ug import ug_tabs
+
+    urls = [ug_server.add_tab("Artist", f"Song {i}") for i in range(6)]
+    batch = ug_tabs(urls + ["/tab/missing"], max_workers=3)
+    songs = list(batch)
+    assert sorted(song.song_name for song in songs) == [f"Song {i}" for i in range(6)]
+    assert list(batch.errors) == ["/tab/missing"]
+
+
+def test_ug_tabs_fetches_concurrently(ug_server):
+    from src.ug import ug_tabs
+
+    ug_server.delay = 0.1
+    urls = [ug_server.add_tab("Artist", f"Song {i}") for i in range(8)]
+    assert len(list(ug_tabs(urls, max_workers=4))) == 8
+    assert 1 < ug_server.peak_in_flight <= 4
+
+
+def test_prefetch_tabs_warms_the_cache(ug_server):
+    from src import ug
+
+    urls = [ug_server.add_tab("Artist", f"Song {i}") for i in range(3)]
+    for future in ug.prefetch_tabs(urls):
+        future.result()
+    assert ug_server.count("tab/") == 3
+    ug.ug_tab(urls[0])
+    assert ug_server.count("tab/") == 3